@@ -1,10 +1,12 @@
 from fastapi import APIRouter
 
-from app.api.endpoints import users, auth, trademarks, payments, search
+from app.api.endpoints import users, auth, trademarks, payments, search, monitoring, documents
 
 api_router = APIRouter()
 api_router.include_router(auth.router, prefix="/auth", tags=["authentication"])
 api_router.include_router(users.router, prefix="/users", tags=["users"])
 api_router.include_router(trademarks.router, prefix="/trademarks", tags=["trademarks"])
 api_router.include_router(payments.router, prefix="/payments", tags=["payments"])
-api_router.include_router(search.router, prefix="/search", tags=["search"])
\ No newline at end of file
+api_router.include_router(documents.router, prefix="/documents", tags=["documents"])
+api_router.include_router(search.router, prefix="/search", tags=["search"])
+api_router.include_router(monitoring.router, prefix="/monitoring", tags=["monitoring"])
\ No newline at end of file
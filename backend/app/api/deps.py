@@ -1,15 +1,17 @@
-from typing import Generator
+from typing import AsyncGenerator, Generator, Optional
 
-from fastapi import Depends, HTTPException, status
+from fastapi import Depends, HTTPException, Response, status
 from fastapi.security import OAuth2PasswordBearer
 from jose import jwt
 from pydantic import ValidationError
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.core import security
 from app.core.config import settings
-from app.db.session import SessionLocal
+from app.core.principal import Principal, principal_cache
+from app.db.session import AsyncSessionLocal, LazySession
 
 reusable_oauth2 = OAuth2PasswordBearer(
     tokenUrl=f"{settings.API_V1_STR}/auth/login/access-token"
@@ -17,16 +19,31 @@ reusable_oauth2 = OAuth2PasswordBearer(
 
 
 def get_db() -> Generator:
+    """
+    Session of a request, opened on first use. Depend on it with
+    scope="function" so its connection goes back to the pool as soon as the
+    endpoint returns, before the response is serialized and sent.
+    """
+    db = LazySession()
     try:
-        db = SessionLocal()
         yield db
     finally:
         db.close()
 
 
-def get_current_user(
-    db: Session = Depends(get_db), token: str = Depends(reusable_oauth2)
-) -> models.User:
+async def get_async_db() -> AsyncGenerator[AsyncSession, None]:
+    """AsyncSession of a request; like get_db, depend on it with scope="function" """
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def set_next_cursor(response: Response, cursor: Optional[str]) -> None:
+    """Return the cursor of the next page of a list endpoint, if any"""
+    if cursor:
+        response.headers["X-Next-Cursor"] = cursor
+
+
+def _token_user_id(token: str) -> str:
     try:
         payload = jwt.decode(
             token, settings.SECRET_KEY, algorithms=[security.ALGORITHM]
@@ -37,7 +54,13 @@ def get_current_user(
             status_code=status.HTTP_403_FORBIDDEN,
             detail="Could not validate credentials",
         )
-    user = crud.user.get(db, id=token_data.sub)
+    return token_data.sub
+
+
+def get_current_user(
+    db: Session = Depends(get_db, scope="function"), token: str = Depends(reusable_oauth2)
+) -> models.User:
+    user = crud.user.get(db, id=_token_user_id(token))
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     return user
@@ -54,6 +77,42 @@ def get_current_active_user(
 def get_current_active_superuser(
     current_user: models.User = Depends(get_current_user),
 ) -> models.User:
+    if not crud.user.is_superuser(current_user):
+        raise HTTPException(
+            status_code=400, detail="The user doesn't have enough privileges"
+        )
+    return current_user
+
+
+async def get_current_principal(token: str = Depends(reusable_oauth2)) -> Principal:
+    """
+    Identity and role of the current user. Active users are served from
+    principal_cache; a session is only opened on a miss.
+    """
+    user_id = _token_user_id(token)
+    principal = principal_cache.get(user_id)
+    if principal is not None:
+        return principal
+    async with AsyncSessionLocal() as db:
+        user = await db.get(models.User, user_id)
+    if not user:
+        raise HTTPException(status_code=404, detail="User not found")
+    principal = Principal.from_user(user)
+    principal_cache.set(principal)
+    return principal
+
+
+async def get_current_active_principal(
+    current_user: Principal = Depends(get_current_principal),
+) -> Principal:
+    if not crud.user.is_active(current_user):
+        raise HTTPException(status_code=400, detail="Inactive user")
+    return current_user
+
+
+async def get_current_active_superprincipal(
+    current_user: Principal = Depends(get_current_active_principal),
+) -> Principal:
     if not crud.user.is_superuser(current_user):
         raise HTTPException(
             status_code=400, detail="The user doesn't have enough privileges"
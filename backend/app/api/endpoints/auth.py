@@ -3,26 +3,36 @@ from typing import Any
 
 from fastapi import APIRouter, Depends, HTTPException
 from fastapi.security import OAuth2PasswordRequestForm
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
 from app.core import security
 from app.core.config import settings
+from app.core.passwords import PasswordHasherBusyError, password_hasher
+from app.core.principal import Principal
 
 router = APIRouter()
 
 
 @router.post("/login/access-token", response_model=schemas.Token)
-def login_access_token(
-    db: Session = Depends(deps.get_db), form_data: OAuth2PasswordRequestForm = Depends()
+async def login_access_token(
+    db: AsyncSession = Depends(deps.get_async_db, scope="function"), form_data: OAuth2PasswordRequestForm = Depends()
 ) -> Any:
     """
     OAuth2 compatible token login, get an access token for future requests
     """
-    user = crud.user.authenticate(
-        db, email=form_data.username, password=form_data.password
-    )
+    try:
+        user = await crud.async_user.authenticate(
+            db, email=form_data.username, password=form_data.password
+        )
+    except PasswordHasherBusyError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(int(e.retry_after), 1))},
+        )
     if not user:
         raise HTTPException(status_code=400, detail="Incorrect email or password")
     elif not crud.user.is_active(user):
@@ -39,7 +49,7 @@ def login_access_token(
 @router.post("/register", response_model=schemas.User)
 def register_user(
     *,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_db, scope="function"),
     user_in: schemas.UserCreate,
 ) -> Any:
     """
@@ -51,5 +61,23 @@ def register_user(
             status_code=400,
             detail="The user with this email already exists in the system",
         )
-    user = crud.user.create(db, obj_in=user_in)
-    return user
\ No newline at end of file
+    try:
+        user = crud.user.create(db, obj_in=user_in)
+    except PasswordHasherBusyError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(int(e.retry_after), 1))},
+        )
+    return user
+
+
+@router.get("/password-hashing/stats")
+def password_hashing_stats(
+    current_user: Principal = Depends(deps.get_current_active_superprincipal),
+) -> Any:
+    """
+    Load of the password hashing pool: running and queued hashes, and how
+    many were rejected because the queue was full.
+    """
+    return password_hasher.stats()
\ No newline at end of file
@@ -0,0 +1,96 @@
+from typing import Any, Optional
+import asyncio
+import mimetypes
+import os
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Response
+from fastapi.responses import FileResponse
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app import crud
+from app.api import deps
+from app.core.config import settings
+from app.core.principal import Principal
+from app.services.document_service import document_path
+from app.services.image_service import thumbnail_path
+
+router = APIRouter()
+
+
+def _etag_matches(if_none_match: str, etag: str) -> bool:
+    """If-None-Match uses the weak comparison: W/"x" matches "x" """
+    if if_none_match.strip() == "*":
+        return True
+    return any(
+        candidate.strip().removeprefix("W/") == etag
+        for candidate in if_none_match.split(",")
+    )
+
+
+@router.api_route("/{id}/download", methods=["GET", "HEAD"])
+async def download_document(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db, scope="function"),
+    id: str,
+    if_none_match: Optional[str] = Header(None),
+    current_user: Principal = Depends(deps.get_current_active_principal),
+) -> Any:
+    """
+    Download the content of a document. The file is sent from disk as it is
+    read (with sendfile where the server supports it), with Range requests
+    for partial downloads. The ETag is the content hash, so a client holding
+    the content gets 304 Not Modified for If-None-Match.
+    """
+    document = await crud.async_document.get(db, id=id)
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    if not crud.user.is_superuser(current_user) and (document.user_id != current_user.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+
+    path = document_path(document)
+    try:
+        stat_result = await asyncio.to_thread(os.stat, path)
+    except FileNotFoundError:
+        raise HTTPException(status_code=404, detail="Document content not found")
+
+    # Content-addressed documents change hash exactly when their bytes
+    # change; older ones get FileResponse's ETag from mtime and size
+    headers = {"ETag": f'"{document.content_hash}"'} if document.content_hash else None
+    media_type = document.file_type or mimetypes.guess_type(document.file_name)[0] or "application/octet-stream"
+    response = FileResponse(
+        path,
+        media_type=media_type,
+        filename=document.file_name,
+        headers=headers,
+        stat_result=stat_result,
+    )
+    etag = response.headers["etag"]
+    if if_none_match and _etag_matches(if_none_match, etag):
+        return Response(status_code=304, headers={"ETag": etag})
+    return response
+
+
+@router.get("/{id}/thumbnail")
+async def download_thumbnail(
+    *,
+    db: AsyncSession = Depends(deps.get_async_db, scope="function"),
+    id: str,
+    size: int = Query(..., description="Longest side in pixels, one of THUMBNAIL_SIZES"),
+    current_user: Principal = Depends(deps.get_current_active_principal),
+) -> Any:
+    """
+    Download a PNG thumbnail of an image document. Thumbnails are rendered
+    shortly after upload; until then, or without Pillow, this returns 404.
+    """
+    if size not in settings.THUMBNAIL_SIZES:
+        raise HTTPException(status_code=400, detail=f"Thumbnail sizes are {settings.THUMBNAIL_SIZES}")
+    document = await crud.async_document.get(db, id=id)
+    if not document:
+        raise HTTPException(status_code=404, detail="Document not found")
+    if not crud.user.is_superuser(current_user) and (document.user_id != current_user.id):
+        raise HTTPException(status_code=400, detail="Not enough permissions")
+
+    path = thumbnail_path(document.content_hash, size) if document.content_hash else None
+    if path is None or not await asyncio.to_thread(path.is_file):
+        raise HTTPException(status_code=404, detail="Thumbnail not available")
+    return FileResponse(path, media_type="image/png")
@@ -0,0 +1,56 @@
+from typing import Any
+
+from fastapi import APIRouter, Depends
+
+from app.api import deps
+from app.core.principal import Principal
+from app.db.pool_metrics import pool_metrics
+from app.services.image_service import thumbnailer
+from app.services.payment_gateway import payment_gateway
+from app.services.stripe_webhook_service import payment_events
+
+router = APIRouter()
+
+
+@router.get("/db-pool")
+def db_pool_stats(
+    current_user: Principal = Depends(deps.get_current_active_superprincipal),
+) -> Any:
+    """
+    Connection pool usage of the sync and async engines: connections checked
+    out, time spent waiting for and holding a connection, and pool timeouts.
+    """
+    return {name: metrics.stats() for name, metrics in pool_metrics.items()}
+
+
+@router.get("/payment-gateway")
+def payment_gateway_stats(
+    current_user: Principal = Depends(deps.get_current_active_superprincipal),
+) -> Any:
+    """
+    Usage of the Stripe call pool (running and queued calls, calls turned
+    away) and the latency, errors and timeouts of each kind of call.
+    """
+    return payment_gateway.stats()
+
+
+@router.get("/stripe-webhooks")
+def stripe_webhook_stats(
+    current_user: Principal = Depends(deps.get_current_active_superprincipal),
+) -> Any:
+    """
+    Stripe webhook events queued, received and turned away, and what the
+    payment worker made of them.
+    """
+    return payment_events.stats()
+
+
+@router.get("/thumbnails")
+def thumbnail_stats(
+    current_user: Principal = Depends(deps.get_current_active_superprincipal),
+) -> Any:
+    """
+    Images waiting for or being rendered by the thumbnail processes, and the
+    renders completed, failed and skipped because the queue was full.
+    """
+    return thumbnailer.stats()
\ No newline at end of file
@@ -1,46 +1,83 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
+import stripe
 
-from app import crud, models, schemas
+from app import crud, schemas
 from app.api import deps
-from app.services.stripe_service import create_payment_intent, confirm_payment_intent
+from app.core.principal import Principal
+from app.crud.pagination import MAX_PAGE_SIZE, InvalidCursorError, next_cursor
+from app.services.payment_gateway import (
+    PaymentGatewayBusyError,
+    PaymentGatewayTimeoutError,
+    payment_gateway,
+)
+from app.services.stripe_service import payment_intent_idempotency_key
+from app.services.stripe_webhook_service import (
+    WebhookQueueFullError,
+    parse_webhook_event,
+    payment_events,
+)
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[schemas.Payment])
 def read_payments(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    response: Response,
+    db: Session = Depends(deps.get_db, scope="function"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    current_user: Principal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
-    Retrieve payments.
+    Retrieve payments, newest first. The cursor of the next page is
+    returned in the X-Next-Cursor header.
     """
-    if crud.user.is_superuser(current_user):
-        payments = crud.payment.get_multi(db, skip=skip, limit=limit)
-    else:
-        payments = crud.payment.get_multi_by_user(
-            db=db, user_id=current_user.id, skip=skip, limit=limit
-        )
+    try:
+        if crud.user.is_superuser(current_user):
+            payments = crud.payment.get_multi(db, cursor=cursor, limit=limit)
+        else:
+            payments = crud.payment.get_multi_by_user(
+                db=db, user_id=current_user.id, cursor=cursor, limit=limit
+            )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    deps.set_next_cursor(response, next_cursor(payments, limit))
     return payments
 
 
+# Failures of a Stripe call; anything else is a server error
+_GATEWAY_ERRORS = (stripe.StripeError, PaymentGatewayBusyError, PaymentGatewayTimeoutError)
+
+
+def _gateway_error(e: Exception) -> HTTPException:
+    if isinstance(e, PaymentGatewayBusyError):
+        return HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(int(e.retry_after), 1))},
+        )
+    if isinstance(e, PaymentGatewayTimeoutError):
+        return HTTPException(status_code=504, detail=str(e))
+    return HTTPException(status_code=400, detail=str(e))
+
+
 @router.post("/create-intent", response_model=schemas.PaymentIntentResponse)
-def create_payment_intent_endpoint(
+async def create_payment_intent_endpoint(
     *,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_db, scope="function"),
     payment_intent_in: schemas.PaymentIntentCreate,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
-    Create a payment intent with Stripe.
+    Create a payment intent with Stripe. The Stripe call runs on the payment
+    gateway's own threads and database work on the threadpool.
     """
     # Check if the trademark exists and belongs to the user
-    trademark = crud.trademark.get(db=db, id=payment_intent_in.trademark_id)
+    trademark = await run_in_threadpool(crud.trademark.get, db=db, id=payment_intent_in.trademark_id)
     if not trademark:
         raise HTTPException(status_code=404, detail="Trademark not found")
     if trademark.owner_id != current_user.id:
@@ -48,7 +85,7 @@ def create_payment_intent_endpoint(
     
     # Create payment intent with Stripe
     try:
-        payment_intent = create_payment_intent(
+        payment_intent = await payment_gateway.create_payment_intent(
             amount=payment_intent_in.amount,
             currency=payment_intent_in.currency,
             payment_method_types=["card"],
@@ -56,41 +93,59 @@ def create_payment_intent_endpoint(
                 "trademark_id": payment_intent_in.trademark_id,
                 "user_id": current_user.id,
                 "payment_type": payment_intent_in.type
-            }
-        )
-        
-        # Create payment record in database
-        payment_in = schemas.PaymentCreate(
-            user_id=current_user.id,
-            trademark_id=payment_intent_in.trademark_id,
-            amount=payment_intent_in.amount,
-            currency=payment_intent_in.currency,
-            type=payment_intent_in.type,
-            stripe_payment_intent_id=payment_intent.id,
-            description=payment_intent_in.description
+            },
+            # A retry after a timeout gets the intent Stripe may already have created
+            idempotency_key=payment_intent_idempotency_key(
+                trademark_id=payment_intent_in.trademark_id,
+                user_id=current_user.id,
+                type=payment_intent_in.type,
+                amount=payment_intent_in.amount,
+                currency=payment_intent_in.currency,
+            ),
         )
-        payment = crud.payment.create(db=db, obj_in=payment_in)
-        
+    except _GATEWAY_ERRORS as e:
+        raise _gateway_error(e)
+
+    # The same intent returned again: its payment is already recorded
+    payment = await run_in_threadpool(
+        crud.payment.get_by_stripe_payment_intent_id, db=db, payment_intent_id=payment_intent.id
+    )
+    if payment is not None:
         return {
             "client_secret": payment_intent.client_secret,
             "payment_id": payment.id
         }
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
+
+    # Create payment record in database
+    payment_in = schemas.PaymentCreate(
+        user_id=current_user.id,
+        trademark_id=payment_intent_in.trademark_id,
+        amount=payment_intent_in.amount,
+        currency=payment_intent_in.currency,
+        type=payment_intent_in.type,
+        stripe_payment_intent_id=payment_intent.id,
+        description=payment_intent_in.description
+    )
+    payment = await run_in_threadpool(crud.payment.create, db=db, obj_in=payment_in)
+
+    return {
+        "client_secret": payment_intent.client_secret,
+        "payment_id": payment.id
+    }
 
 
 @router.post("/confirm/{payment_id}", response_model=schemas.Payment)
-def confirm_payment(
+async def confirm_payment(
     *,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_db, scope="function"),
     payment_id: str,
     payment_confirm: schemas.PaymentConfirm,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
     Confirm a payment after client-side confirmation.
     """
-    payment = crud.payment.get(db=db, id=payment_id)
+    payment = await run_in_threadpool(crud.payment.get, db=db, id=payment_id)
     if not payment:
         raise HTTPException(status_code=404, detail="Payment not found")
     if payment.user_id != current_user.id:
@@ -98,18 +153,43 @@ def confirm_payment(
     
     try:
         # Confirm payment with Stripe
-        confirm_payment_intent(
+        await payment_gateway.confirm_payment_intent(
             payment_intent_id=payment.stripe_payment_intent_id,
             payment_method_id=payment_confirm.payment_method_id
         )
-        
-        # Update payment status in database
-        payment_in = schemas.PaymentUpdate(
-            status="completed",
-            stripe_payment_method_id=payment_confirm.payment_method_id
+    except _GATEWAY_ERRORS as e:
+        raise _gateway_error(e)
+
+    # Update payment status in database
+    payment_in = schemas.PaymentUpdate(
+        status="completed",
+        stripe_payment_method_id=payment_confirm.payment_method_id
+    )
+    payment = await run_in_threadpool(crud.payment.update, db=db, db_obj=payment, obj_in=payment_in)
+
+    return payment
+
+
+@router.post("/webhook")
+async def stripe_webhook(
+    request: Request,
+    stripe_signature: Optional[str] = Header(None),
+) -> Any:
+    """
+    Receive a Stripe webhook event. The event is verified and queued, and
+    the payment it concerns is updated shortly after by the payment worker.
+    """
+    payload = await request.body()
+    try:
+        event = parse_webhook_event(payload, stripe_signature)
+    except (ValueError, stripe.SignatureVerificationError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid webhook event: {e}")
+    try:
+        payment_events.enqueue(event)
+    except WebhookQueueFullError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(int(e.retry_after), 1))},
         )
-        payment = crud.payment.update(db=db, db_obj=payment, obj_in=payment_in)
-        
-        return payment
-    except Exception as e:
-        raise HTTPException(status_code=400, detail=str(e))
\ No newline at end of file
+    return {"received": True}
\ No newline at end of file
@@ -1,12 +1,21 @@
 from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app import models, schemas, crud
+from app import schemas, crud
 from app.api import deps
+from app.core.principal import Principal
+from app.core.cache import search_cache
+from app.core.resilience import UpstreamUnavailableError, office_guards
+from app.crud.pagination import MAX_PAGE_SIZE, InvalidCursorError
+from app.services.federated_search_service import federated_search
+from app.services.search_adapter_service import ADAPTERS, adapt_local, merge_results
+from app.services.similarity_service import score_results
 from app.services.tmview_service import search_tmview
-from app.schemas.trademark import TrademarkSearchQuery, TrademarkSearchResponse
+from app.schemas.trademark import (
+    FederatedSearchResponse, NiceClass, NiceClassMatch, TrademarkSearchMode, TrademarkSearchQuery, TrademarkSearchResponse
+)
 
 router = APIRouter()
 
@@ -16,8 +25,8 @@ async def search_tmview_endpoint(
     *,
     query: str = Query(..., description="Search query for trademark"),
     jurisdiction: Optional[str] = Query(None, description="Jurisdiction code (country)"),
-    nice_classes: Optional[List[int]] = Query(None, description="Nice classification classes"),
-    current_user: models.User = Depends(deps.get_current_active_user),
+    nice_classes: Optional[List[NiceClass]] = Query(None, description="Nice classification classes, 1-45"),
+    current_user: Principal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
     Search for trademarks in TMview database.
@@ -29,50 +38,51 @@ async def search_tmview_endpoint(
             nice_classes=nice_classes
         )
         return results
+    except UpstreamUnavailableError as e:
+        raise HTTPException(
+            status_code=503,
+            detail=str(e),
+            headers={"Retry-After": str(max(int(e.retry_after), 1))},
+        )
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
 @router.get("/local", response_model=TrademarkSearchResponse)
-def search_local_endpoint(
+async def search_local_endpoint(
     *,
+    response: Response,
     query: str = Query(..., description="Search query for trademark"),
     jurisdiction: Optional[str] = Query(None, description="Jurisdiction code (country)"),
-    nice_classes: Optional[List[int]] = Query(None, description="Nice classification classes"),
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_active_user),
+    nice_classes: Optional[List[NiceClass]] = Query(None, description="Nice classification classes, 1-45"),
+    nice_class_match: NiceClassMatch = Query(NiceClassMatch.ANY, description="Match any or all of the Nice classes"),
+    mode: TrademarkSearchMode = Query(TrademarkSearchMode.SUBSTRING, description="Name matching mode"),
+    similarity_threshold: Optional[float] = Query(None, ge=0, le=1, description="Minimum trigram similarity"),
+    cursor: Optional[str] = Query(None, description="X-Next-Cursor of the previous page"),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    db: AsyncSession = Depends(deps.get_async_db, scope="function"),
+    current_user: Principal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
-    Search for trademarks in local database.
+    Search for trademarks in local database, one page at a time. The cursor
+    of the next page is returned in the X-Next-Cursor header.
     """
     try:
         search_query = TrademarkSearchQuery(
             query=query,
             jurisdiction=jurisdiction,
-            nice_classes=nice_classes
+            nice_classes=nice_classes,
+            nice_class_match=nice_class_match,
+            mode=mode,
+            similarity_threshold=similarity_threshold
         )
         
-        results = crud.trademark.search_local(db=db, search_query=search_query)
-        
-        # Convert database results to search response format
-        search_results = []
-        for tm in results:
-            search_results.append(schemas.TrademarkSearchResult(
-                id=tm.id,
-                name=tm.name,
-                description=tm.description,
-                type=tm.type,
-                status=tm.status,
-                jurisdiction=tm.jurisdiction,
-                nice_classes=tm.nice_classes,
-                goods_services=tm.goods_services,
-                application_number=tm.application_number,
-                registration_number=tm.registration_number,
-                filing_date=tm.filing_date,
-                registration_date=tm.registration_date,
-                similarity_score=1.0,  # Would calculate actual similarity
-                source="Local"
-            ))
+        results, next_cursor = await crud.async_trademark.search_local(
+            db=db, search_query=search_query, cursor=cursor, limit=limit
+        )
+        # Scored but left in the order of the keyset, so pages never overlap
+        search_results = score_results(query, adapt_local(results), nice_classes=nice_classes)
+        deps.set_next_cursor(response, next_cursor)
         
         return TrademarkSearchResponse(
             results=search_results,
@@ -81,71 +91,72 @@ def search_local_endpoint(
             jurisdiction=jurisdiction,
             nice_classes=nice_classes
         )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
 
-@router.get("/combined", response_model=dict)
+@router.get("/cache/stats")
+def search_cache_stats_endpoint(
+    current_user: Principal = Depends(deps.get_current_active_superprincipal),
+) -> Any:
+    """
+    Hit and miss counters of the external search cache, per source.
+    """
+    return search_cache.stats()
+
+
+@router.get("/sources/health")
+def search_sources_health_endpoint(
+    current_user: Principal = Depends(deps.get_current_active_superprincipal),
+) -> Any:
+    """
+    Circuit breaker state of every external office called so far.
+    """
+    return office_guards.status()
+
+
+@router.get("/combined", response_model=FederatedSearchResponse)
 async def search_combined_endpoint(
     *,
     query: str = Query(..., description="Search query for trademark"),
     jurisdiction: Optional[str] = Query(None, description="Jurisdiction code (country)"),
-    nice_classes: Optional[List[int]] = Query(None, description="Nice classification classes"),
-    db: Session = Depends(deps.get_db),
-    current_user: models.User = Depends(deps.get_current_active_user),
+    nice_classes: Optional[List[NiceClass]] = Query(None, description="Nice classification classes, 1-45"),
+    nice_class_match: NiceClassMatch = Query(NiceClassMatch.ANY, description="Match any or all of the Nice classes"),
+    mode: TrademarkSearchMode = Query(TrademarkSearchMode.SUBSTRING, description="Name matching mode"),
+    similarity_threshold: Optional[float] = Query(None, ge=0, le=1, description="Minimum trigram similarity"),
+    current_user: Principal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
-    Search for trademarks in multiple databases (local and TMview).
+    Search for trademarks in all databases at once (local, TMview, EUIPO, WIPO and OBI).
+    The same mark reported by several offices is returned once, and all results are
+    ranked together by similarity. Sources that miss the deadline are reported in
+    "sources" and the response is marked partial.
     """
     try:
-        # Search in local database
         search_query = TrademarkSearchQuery(
             query=query,
             jurisdiction=jurisdiction,
-            nice_classes=nice_classes
+            nice_classes=nice_classes,
+            nice_class_match=nice_class_match,
+            mode=mode,
+            similarity_threshold=similarity_threshold
         )
+        federated = await federated_search(search_query)
+        results = merge_results(query, {
+            source: ADAPTERS[source](payload)
+            for source, payload in federated.payloads.items()
+        }, nice_classes=nice_classes, nice_class_match=nice_class_match)
         
-        local_results = crud.trademark.search_local(db=db, search_query=search_query)
-        local_search_results = []
-        for tm in local_results:
-            local_search_results.append(schemas.TrademarkSearchResult(
-                id=tm.id,
-                name=tm.name,
-                description=tm.description,
-                type=tm.type,
-                status=tm.status,
-                jurisdiction=tm.jurisdiction,
-                nice_classes=tm.nice_classes,
-                goods_services=tm.goods_services,
-                application_number=tm.application_number,
-                registration_number=tm.registration_number,
-                filing_date=tm.filing_date,
-                registration_date=tm.registration_date,
-                similarity_score=1.0,
-                source="Local"
-            ))
-        
-        # Search in TMview
-        tmview_results = await search_tmview(
+        return FederatedSearchResponse(
+            results=results,
+            total_results=len(results),
             query=query,
             jurisdiction=jurisdiction,
-            nice_classes=nice_classes
+            nice_classes=nice_classes,
+            sources=federated.statuses,
+            partial=federated.partial
         )
-        
-        return {
-            "local_results": TrademarkSearchResponse(
-                results=local_search_results,
-                total_results=len(local_search_results),
-                query=query,
-                jurisdiction=jurisdiction,
-                nice_classes=nice_classes
-            ),
-            "tmview_results": tmview_results,
-            "summary": {
-                "total_local": len(local_search_results),
-                "total_tmview": tmview_results.total_results,
-                "total_combined": len(local_search_results) + tmview_results.total_results
-            }
-        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
@@ -1,39 +1,61 @@
-from typing import Any, List
+from typing import Any, List, Optional
+import asyncio
 
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, Response, UploadFile, File
+from fastapi.responses import StreamingResponse
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app import crud, models, schemas
+from app import crud, schemas
 from app.api import deps
+from app.core.blob_store import document_store
+from app.core.config import settings
+from app.core.principal import Principal
+from app.crud.pagination import MAX_PAGE_SIZE, InvalidCursorError, next_cursor
+from app.models.document import DocumentType
+from app.services.export_service import EXPORT_MEDIA_TYPES, export_trademarks
+from app.services.image_service import (
+    ImageTooLargeError,
+    InvalidImageError,
+    spool_image,
+    thumbnailer,
+)
+from app.services.import_service import import_trademarks
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[schemas.Trademark])
 def read_trademarks(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    response: Response,
+    db: Session = Depends(deps.get_db, scope="function"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    current_user: Principal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
-    Retrieve trademarks.
+    Retrieve trademarks, newest first. The cursor of the next page is
+    returned in the X-Next-Cursor header.
     """
-    if crud.user.is_superuser(current_user):
-        trademarks = crud.trademark.get_multi(db, skip=skip, limit=limit)
-    else:
-        trademarks = crud.trademark.get_by_owner(
-            db=db, owner_id=current_user.id, skip=skip, limit=limit
-        )
+    try:
+        if crud.user.is_superuser(current_user):
+            trademarks = crud.trademark.get_multi(db, cursor=cursor, limit=limit)
+        else:
+            trademarks = crud.trademark.get_by_owner(
+                db=db, owner_id=current_user.id, cursor=cursor, limit=limit
+            )
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    deps.set_next_cursor(response, next_cursor(trademarks, limit))
     return trademarks
 
 
 @router.post("/", response_model=schemas.Trademark)
 def create_trademark(
     *,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_db, scope="function"),
     trademark_in: schemas.TrademarkCreate,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
     Create new trademark.
@@ -44,12 +66,45 @@ def create_trademark(
     return trademark
 
 
+@router.get("/export")
+def export_trademarks_file(
+    format: schemas.PortfolioFormat = schemas.PortfolioFormat.NDJSON,
+    current_user: Principal = Depends(deps.get_current_active_principal),
+) -> Any:
+    """
+    Stream all trademarks of the current user (every trademark for a
+    superuser) as NDJSON or CSV, without loading them into memory.
+    """
+    owner_id = None if crud.user.is_superuser(current_user) else current_user.id
+    return StreamingResponse(
+        export_trademarks(owner_id, format.value),
+        media_type=EXPORT_MEDIA_TYPES[format.value],
+        headers={"Content-Disposition": f'attachment; filename="trademarks.{format.value}"'},
+    )
+
+
+@router.post("/import", response_model=schemas.TrademarkImportResult)
+def import_trademarks_file(
+    *,
+    db: Session = Depends(deps.get_db, scope="function"),
+    format: schemas.PortfolioFormat = schemas.PortfolioFormat.NDJSON,
+    file: UploadFile = File(...),
+    current_user: Principal = Depends(deps.get_current_active_principal),
+) -> Any:
+    """
+    Create or update trademarks of the current user from an NDJSON or CSV
+    file. Rows with the application number of an existing trademark update
+    it; invalid rows are reported and skipped.
+    """
+    return import_trademarks(db, file.file, format.value, owner_id=current_user.id)
+
+
 @router.get("/{id}", response_model=schemas.Trademark)
 def read_trademark(
     *,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_db, scope="function"),
     id: str,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
     Get trademark by ID.
@@ -65,10 +120,10 @@ def read_trademark(
 @router.put("/{id}", response_model=schemas.Trademark)
 def update_trademark(
     *,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_db, scope="function"),
     id: str,
     trademark_in: schemas.TrademarkUpdate,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
     Update a trademark.
@@ -85,9 +140,9 @@ def update_trademark(
 @router.delete("/{id}", response_model=schemas.Trademark)
 def delete_trademark(
     *,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_db, scope="function"),
     id: str,
-    current_user: models.User = Depends(deps.get_current_active_user),
+    current_user: Principal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
     Delete a trademark.
@@ -102,26 +157,48 @@ def delete_trademark(
 
 
 @router.post("/{id}/upload-image", response_model=schemas.Trademark)
-def upload_trademark_image(
+async def upload_trademark_image(
     *,
-    db: Session = Depends(deps.get_db),
+    db: AsyncSession = Depends(deps.get_async_db, scope="function"),
     id: str,
     file: UploadFile = File(...),
-    current_user: models.User = Depends(deps.get_current_active_user),
+    background_tasks: BackgroundTasks,
+    current_user: Principal = Depends(deps.get_current_active_principal),
 ) -> Any:
     """
-    Upload an image for a figurative trademark.
+    Upload an image for a figurative trademark (PNG, JPEG, GIF or WebP).
+    The image is stored as a document of the trademark and image_url points
+    to its download; thumbnails are rendered once the response is sent.
     """
-    trademark = crud.trademark.get(db=db, id=id)
+    trademark = await crud.async_trademark.get(db, id=id)
     if not trademark:
         raise HTTPException(status_code=404, detail="Trademark not found")
     if not crud.user.is_superuser(current_user) and (trademark.owner_id != current_user.id):
         raise HTTPException(status_code=400, detail="Not enough permissions")
     
-    # Handle file upload logic here
-    # This is a placeholder for actual file upload implementation
-    image_url = f"/static/trademarks/{id}/{file.filename}"
+    try:
+        blob, media_type = await asyncio.to_thread(spool_image, file.file)
+    except ImageTooLargeError as e:
+        raise HTTPException(status_code=413, detail=str(e))
+    except InvalidImageError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    trademark_in = schemas.TrademarkUpdate(image_url=image_url)
-    trademark = crud.trademark.update(db=db, db_obj=trademark, obj_in=trademark_in)
+    document = await crud.async_document.create(db, obj_in=schemas.DocumentCreate(
+        type=DocumentType.IMAGE,
+        title=f"Image of {trademark.name}",
+        trademark_id=trademark.id,
+        user_id=trademark.owner_id,
+        file_path=document_store.relative_path(blob.content_hash),
+        file_name=file.filename or "image",
+        file_size=str(blob.size),
+        file_type=media_type,
+        content_hash=blob.content_hash,
+    ))
+    # Checks the disk for existing thumbnails, so it runs on the threadpool
+    background_tasks.add_task(thumbnailer.schedule, blob.content_hash)
+    
+    trademark_in = schemas.TrademarkUpdate(
+        image_url=f"{settings.API_V1_STR}/documents/{document.id}/download"
+    )
+    trademark = await crud.async_trademark.update(db, db_obj=trademark, obj_in=trademark_in)
     return trademark
\ No newline at end of file
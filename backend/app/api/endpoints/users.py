@@ -1,34 +1,42 @@
-from typing import Any, List
+from typing import Any, List, Optional
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
 
 from app import crud, models, schemas
 from app.api import deps
+from app.core.principal import Principal
+from app.crud.pagination import MAX_PAGE_SIZE, InvalidCursorError, next_cursor
 
 router = APIRouter()
 
 
 @router.get("/", response_model=List[schemas.User])
 def read_users(
-    db: Session = Depends(deps.get_db),
-    skip: int = 0,
-    limit: int = 100,
-    current_user: models.User = Depends(deps.get_current_active_superuser),
+    response: Response,
+    db: Session = Depends(deps.get_db, scope="function"),
+    cursor: Optional[str] = None,
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE),
+    current_user: Principal = Depends(deps.get_current_active_superprincipal),
 ) -> Any:
     """
-    Retrieve users.
+    Retrieve users, newest first. The cursor of the next page is returned
+    in the X-Next-Cursor header.
     """
-    users = crud.user.get_multi(db, skip=skip, limit=limit)
+    try:
+        users = crud.user.get_multi(db, cursor=cursor, limit=limit)
+    except InvalidCursorError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    deps.set_next_cursor(response, next_cursor(users, limit))
     return users
 
 
 @router.post("/", response_model=schemas.User)
 def create_user(
     *,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_db, scope="function"),
     user_in: schemas.UserCreate,
-    current_user: models.User = Depends(deps.get_current_active_superuser),
+    current_user: Principal = Depends(deps.get_current_active_superprincipal),
 ) -> Any:
     """
     Create new user.
@@ -45,7 +53,7 @@ def create_user(
 
 @router.get("/me", response_model=schemas.User)
 def read_user_me(
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_db, scope="function"),
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
     """
@@ -57,7 +65,7 @@ def read_user_me(
 @router.put("/me", response_model=schemas.User)
 def update_user_me(
     *,
-    db: Session = Depends(deps.get_db),
+    db: Session = Depends(deps.get_db, scope="function"),
     user_in: schemas.UserUpdate,
     current_user: models.User = Depends(deps.get_current_active_user),
 ) -> Any:
@@ -71,14 +79,14 @@ def update_user_me(
 @router.get("/{user_id}", response_model=schemas.User)
 def read_user_by_id(
     user_id: str,
-    current_user: models.User = Depends(deps.get_current_active_user),
-    db: Session = Depends(deps.get_db),
+    current_user: Principal = Depends(deps.get_current_active_principal),
+    db: Session = Depends(deps.get_db, scope="function"),
 ) -> Any:
     """
     Get a specific user by id.
     """
     user = crud.user.get(db, id=user_id)
-    if user == current_user:
+    if user is not None and user.id == current_user.id:
         return user
     if not crud.user.is_superuser(current_user):
         raise HTTPException(
@@ -0,0 +1,118 @@
+from typing import BinaryIO, Optional
+from dataclasses import dataclass
+from pathlib import Path
+import hashlib
+import os
+import re
+import tempfile
+
+from app.core.config import settings
+
+_CONTENT_HASH = re.compile(r"^[0-9a-f]{64}$")
+
+
+@dataclass(frozen=True)
+class StoredBlob:
+    content_hash: str  # SHA-256 of the content, hex
+    size: int
+    path: Path
+    created: bool  # False when identical content was already stored
+
+
+class BlobWriter:
+    """
+    Streams one blob into the store: every chunk is hashed as it is written
+    to a temporary file, which commit() moves to the blob's content address.
+    A writer left without commit() removes its temporary file.
+    """
+
+    def __init__(self, store: "ContentAddressedStore") -> None:
+        self._store = store
+        self._digest = hashlib.sha256()
+        self.size = 0
+        store.tmp_dir.mkdir(parents=True, exist_ok=True)
+        fd, self._tmp_path = tempfile.mkstemp(dir=store.tmp_dir)
+        self._file: Optional[BinaryIO] = os.fdopen(fd, "wb")
+
+    def write(self, chunk: bytes) -> None:
+        self._digest.update(chunk)
+        self._file.write(chunk)
+        self.size += len(chunk)
+
+    def staged_path(self) -> str:
+        """Temporary file holding what was written so far, to inspect it before commit()"""
+        self._file.flush()
+        return self._tmp_path
+
+    def commit(self) -> StoredBlob:
+        self._file.flush()
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        content_hash = self._digest.hexdigest()
+        path = self._store.path(content_hash)
+        if path.exists():
+            os.unlink(self._tmp_path)
+            return StoredBlob(content_hash, self.size, path, created=False)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Atomic; two writers of the same content leave the same bytes
+        os.replace(self._tmp_path, path)
+        return StoredBlob(content_hash, self.size, path, created=True)
+
+    def abort(self) -> None:
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+            os.unlink(self._tmp_path)
+
+    def __enter__(self) -> "BlobWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.abort()
+
+
+class ContentAddressedStore:
+    """
+    Blobs on disk under the SHA-256 of their content, sharded two levels deep
+    (ab/cd/abcd...) so no directory grows too large. Identical content is
+    stored once; blobs are never modified once written.
+    """
+
+    def __init__(self, root: str, chunk_size: int) -> None:
+        self.root = Path(root)
+        self.tmp_dir = self.root / "tmp"
+        self.chunk_size = chunk_size
+
+    def relative_path(self, content_hash: str) -> str:
+        if not _CONTENT_HASH.match(content_hash):
+            raise ValueError(f"Invalid content hash: {content_hash!r}")
+        return f"{content_hash[:2]}/{content_hash[2:4]}/{content_hash}"
+
+    def path(self, content_hash: str) -> Path:
+        return self.root / self.relative_path(content_hash)
+
+    def exists(self, content_hash: str) -> bool:
+        return self.path(content_hash).is_file()
+
+    def writer(self) -> BlobWriter:
+        return BlobWriter(self)
+
+    def put(self, source: BinaryIO) -> StoredBlob:
+        """Store the content of a file object, read `chunk_size` bytes at a time"""
+        with self.writer() as writer:
+            while True:
+                chunk = source.read(self.chunk_size)
+                if not chunk:
+                    break
+                writer.write(chunk)
+            return writer.commit()
+
+    def open(self, content_hash: str) -> BinaryIO:
+        return open(self.path(content_hash), "rb")
+
+
+document_store = ContentAddressedStore(
+    root=settings.DOCUMENT_STORAGE_DIR,
+    chunk_size=settings.DOCUMENT_STORAGE_CHUNK_SIZE,
+)
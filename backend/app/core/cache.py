@@ -0,0 +1,358 @@
+from typing import Any, Awaitable, Callable, Dict, Optional, Protocol, Set, Tuple, get_type_hints
+from collections import OrderedDict
+import asyncio
+import functools
+import hashlib
+import inspect
+import json
+import logging
+import os
+import struct
+import time
+
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+from app.core.singleflight import SingleFlight
+
+logger = logging.getLogger(__name__)
+
+# Expiry time in front of the value in a DiskCache file
+_EXPIRY = struct.Struct("!d")
+
+# Shared tier entry: the time it was stored and the value
+_ANY_ENTRY = TypeAdapter(Tuple[float, Any])
+
+
+class CacheEntry:
+    """A cached value and the time it was loaded"""
+
+    __slots__ = ("value", "stored_at")
+
+    def __init__(self, value: Any, stored_at: float) -> None:
+        self.value = value
+        self.stored_at = stored_at
+
+    def age(self) -> float:
+        return time.time() - self.stored_at
+
+
+class LRUCache:
+    """In-process tier: the most recently used entries, bounded in number"""
+
+    def __init__(self, max_entries: int) -> None:
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[CacheEntry]:
+        entry = self._entries.get(key)
+        if entry is not None:
+            self._entries.move_to_end(key)
+        return entry
+
+    def set(self, key: str, entry: CacheEntry) -> None:
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SharedCache(Protocol):
+    """Tier shared between workers; stores bytes that expire after ttl seconds"""
+
+    async def get(self, key: str) -> Optional[bytes]:
+        ...
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        ...
+
+
+class RedisCache:
+    """Shared tier on any server speaking the Redis protocol"""
+
+    def __init__(self, url: str) -> None:
+        try:
+            import redis.asyncio as redis
+        except ImportError:
+            raise RuntimeError(
+                "SEARCH_CACHE_BACKEND=redis needs the redis package (pip install 'redis>=5')"
+            )
+
+        self._client = redis.from_url(url)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await self._client.get(key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await self._client.set(key, value, px=max(int(ttl * 1000), 1))
+
+
+class DiskCache:
+    """
+    Shared tier in a local directory, for workers on the same host.
+
+    Each key is one file named by its hash; the expiry time is stored as a
+    binary float in front of the value and checked on read.
+    """
+
+    def __init__(self, directory: str) -> None:
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, hashlib.sha256(key.encode()).hexdigest())
+
+    def _read(self, key: str) -> Optional[bytes]:
+        try:
+            with open(self._path(key), "rb") as f:
+                header, value = f.read(_EXPIRY.size), f.read()
+        except OSError:
+            return None
+        if len(header) < _EXPIRY.size:
+            return None
+        (expires_at,) = _EXPIRY.unpack(header)
+        return value if expires_at > time.time() else None
+
+    def _write(self, key: str, value: bytes, ttl: float) -> None:
+        path = self._path(key)
+        temporary = f"{path}.{os.getpid()}.tmp"
+        with open(temporary, "wb") as f:
+            f.write(_EXPIRY.pack(time.time() + ttl))
+            f.write(value)
+        os.replace(temporary, path)
+
+    async def get(self, key: str) -> Optional[bytes]:
+        return await asyncio.to_thread(self._read, key)
+
+    async def set(self, key: str, value: bytes, ttl: float) -> None:
+        await asyncio.to_thread(self._write, key, value, ttl)
+
+
+class CacheStats:
+    __slots__ = ("hits", "stale_hits", "shared_hits", "misses", "coalesced", "refreshes", "errors")
+
+    def __init__(self) -> None:
+        for name in self.__slots__:
+            setattr(self, name, 0)
+
+    def as_dict(self) -> Dict[str, int]:
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+def _normalize(value: Any) -> Any:
+    if isinstance(value, str):
+        return " ".join(value.casefold().split())
+    if isinstance(value, (list, tuple, set)):
+        items = {_normalize(item) for item in value}
+        try:
+            return sorted(items)
+        except TypeError:
+            return sorted(items, key=str)
+    return value
+
+
+def cache_key(source: str, **params: Any) -> str:
+    """
+    Key of one search: text is casefolded with whitespace collapsed and
+    lists are sorted, so "Nike", " nike " with classes [42, 9] and [9, 42]
+    share an entry. Missing parameters are left out.
+    """
+    normalized = {
+        name: _normalize(value)
+        for name, value in params.items()
+        if value is not None and value != []
+    }
+    return f"search:{source}:{json.dumps(normalized, sort_keys=True, ensure_ascii=False)}"
+
+
+class TieredCache:
+    """
+    Two-tier cache for external search results.
+
+    Lookups go to the in-process LRU first, then to the optional shared tier.
+    Every source has its own TTL. An entry past its TTL but within the stale
+    window is still returned, and a single background refresh reloads it
+    (stale-while-revalidate). Loader errors are never cached.
+
+    Loads are single-flight: concurrent misses for the same key share one
+    upstream call, counted as "coalesced".
+
+    The shared tier holds JSON, never pickles: another worker, or anyone
+    with write access to Redis or the cache directory, must not be able to
+    run code in this one. Values are validated back into the return type of
+    the function passed to cached(), or left as plain JSON for get_or_load().
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        ttls: Dict[str, float],
+        stale_ttl: float,
+        shared: Optional[SharedCache] = None
+    ) -> None:
+        self.local = LRUCache(max_entries)
+        self.shared = shared
+        self.ttls = ttls
+        self.stale_ttl = stale_ttl
+        self._stats: Dict[str, CacheStats] = {}
+        self._entry_types: Dict[str, TypeAdapter] = {}
+        self.flights = SingleFlight()
+        self._refreshing: Set[str] = set()
+        self._tasks: Set["asyncio.Task[Any]"] = set()
+
+    def _ttl(self, source: str) -> float:
+        return self.ttls.get(source, self.ttls.get("default", 0.0))
+
+    def _source_stats(self, source: str) -> CacheStats:
+        return self._stats.setdefault(source, CacheStats())
+
+    def _entry_type(self, source: str) -> TypeAdapter:
+        return self._entry_types.get(source, _ANY_ENTRY)
+
+    async def _get_shared(self, source: str, key: str) -> Optional[CacheEntry]:
+        if self.shared is None:
+            return None
+        try:
+            data = await self.shared.get(key)
+        except Exception as e:
+            logger.warning("Shared cache read failed: %s", e)
+            return None
+        if data is None:
+            return None
+        try:
+            stored_at, value = self._entry_type(source).validate_json(data)
+        except Exception as e:
+            # Corrupt, or written by a version with other result classes
+            logger.warning("Ignoring unreadable shared cache entry %s: %s", key, e)
+            return None
+        return CacheEntry(value, stored_at)
+
+    async def _store(self, source: str, key: str, value: Any) -> None:
+        entry = CacheEntry(value, time.time())
+        self.local.set(key, entry)
+        if self.shared is None:
+            return
+        try:
+            await self.shared.set(
+                key,
+                self._entry_type(source).dump_json((entry.stored_at, value)),
+                self._ttl(source) + self.stale_ttl
+            )
+        except Exception as e:
+            logger.warning("Shared cache write failed: %s", e)
+
+    async def _load(self, source: str, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        value = await loader()
+        if self._ttl(source) > 0:
+            await self._store(source, key, value)
+        return value
+
+    async def _load_once(self, source: str, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        if self.flights.in_flight(key):
+            self._source_stats(source).coalesced += 1
+        return await self.flights.do(key, lambda: self._load(source, key, loader))
+
+    async def _refresh(self, source: str, key: str, loader: Callable[[], Awaitable[Any]]) -> None:
+        try:
+            await self.flights.do(key, lambda: self._load(source, key, loader))
+            self._source_stats(source).refreshes += 1
+        except Exception as e:
+            self._source_stats(source).errors += 1
+            logger.warning("Background refresh of %s failed: %s", key, e)
+        finally:
+            self._refreshing.discard(key)
+
+    def _schedule_refresh(self, source: str, key: str, loader: Callable[[], Awaitable[Any]]) -> None:
+        if key in self._refreshing:
+            return
+        self._refreshing.add(key)
+        task = asyncio.ensure_future(self._refresh(source, key, loader))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def get_or_load(self, source: str, key: str, loader: Callable[[], Awaitable[Any]]) -> Any:
+        ttl = self._ttl(source)
+        stats = self._source_stats(source)
+        if ttl <= 0:
+            stats.misses += 1
+            return await self._load_once(source, key, loader)
+
+        entry = self.local.get(key)
+        if entry is None or entry.age() >= ttl + self.stale_ttl:
+            entry = await self._get_shared(source, key)
+            if entry is not None and entry.age() < ttl + self.stale_ttl:
+                stats.shared_hits += 1
+                self.local.set(key, entry)
+            else:
+                entry = None
+
+        if entry is None:
+            stats.misses += 1
+            return await self._load_once(source, key, loader)
+
+        if entry.age() < ttl:
+            stats.hits += 1
+        else:
+            stats.stale_hits += 1
+            self._schedule_refresh(source, key, loader)
+        return entry.value
+
+    def cached(self, source: str) -> Callable:
+        """
+        Decorate an async search function so its results are cached under
+        cache_key(source, **arguments). Entries of the shared tier are read
+        back as the function's return annotation.
+        """
+        def decorator(func: Callable[..., Awaitable[Any]]) -> Callable[..., Awaitable[Any]]:
+            signature = inspect.signature(func)
+            self._entry_types[source] = TypeAdapter(
+                Tuple[float, get_type_hints(func).get("return", Any)]
+            )
+
+            @functools.wraps(func)
+            async def wrapper(*args: Any, **kwargs: Any) -> Any:
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                key = cache_key(source, **bound.arguments)
+                return await self.get_or_load(source, key, lambda: func(*args, **kwargs))
+
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self.local),
+            "max_entries": self.local.max_entries,
+            "shared": type(self.shared).__name__ if self.shared is not None else None,
+            "sources": {source: stats.as_dict() for source, stats in self._stats.items()},
+        }
+
+    def clear(self) -> None:
+        self.local.clear()
+        self._stats.clear()
+
+
+def _shared_tier() -> Optional[SharedCache]:
+    if settings.SEARCH_CACHE_BACKEND == "redis":
+        return RedisCache(settings.SEARCH_CACHE_REDIS_URL)
+    if settings.SEARCH_CACHE_BACKEND == "disk":
+        return DiskCache(settings.SEARCH_CACHE_DIR)
+    return None
+
+
+search_cache = TieredCache(
+    max_entries=settings.SEARCH_CACHE_MAX_ENTRIES,
+    ttls=settings.SEARCH_CACHE_TTLS,
+    stale_ttl=settings.SEARCH_CACHE_STALE_TTL,
+    shared=_shared_tier(),
+)
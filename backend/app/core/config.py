@@ -42,14 +42,155 @@ class Settings(BaseSettings):
             path=f"/{values.get('POSTGRES_DB') or ''}",
         )
 
+    # Same database through asyncpg, for the AsyncSession engine
+    ASYNC_SQLALCHEMY_DATABASE_URI: Optional[str] = None
+
+    @validator("ASYNC_SQLALCHEMY_DATABASE_URI", pre=True)
+    def assemble_async_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
+        if isinstance(v, str):
+            return v
+        uri = str(values.get("SQLALCHEMY_DATABASE_URI"))
+        scheme, _, rest = uri.partition("://")
+        if scheme.split("+")[0] in ("postgres", "postgresql"):
+            return f"postgresql+asyncpg://{rest}"
+        return uri
+
+    # Read replicas for listings and searches, in the same form as
+    # SQLALCHEMY_DATABASE_URI. A replica more than DB_REPLICA_MAX_LAG seconds
+    # behind is skipped; lag is checked every DB_REPLICA_LAG_CHECK_INTERVAL seconds
+    SQLALCHEMY_REPLICA_URIS: List[str] = []
+    ASYNC_SQLALCHEMY_REPLICA_URIS: List[str] = []
+
+    @validator("ASYNC_SQLALCHEMY_REPLICA_URIS", pre=True)
+    def assemble_async_replica_connections(cls, v: List[str], values: Dict[str, Any]) -> Any:
+        if v:
+            return v
+        uris = []
+        for uri in values.get("SQLALCHEMY_REPLICA_URIS") or []:
+            scheme, _, rest = uri.partition("://")
+            if scheme.split("+")[0] in ("postgres", "postgresql"):
+                uri = f"postgresql+asyncpg://{rest}"
+            uris.append(uri)
+        return uris
+
+    DB_REPLICA_MAX_LAG: float = 5.0
+    DB_REPLICA_LAG_CHECK_INTERVAL: float = 5.0
+
+    # Connection pool of all engines; recycle and timeout in seconds
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_PRE_PING: bool = True
+    DB_POOL_RECYCLE: int = 1800
+    DB_POOL_TIMEOUT: float = 30.0
+
+    # Authenticated users are looked up once per PRINCIPAL_CACHE_TTL seconds
+    PRINCIPAL_CACHE_MAX_ENTRIES: int = 10000
+    PRINCIPAL_CACHE_TTL: float = 60.0
+
+    # Password hashing: bcrypt cost and the pool running it. Beyond
+    # PASSWORD_HASH_MAX_QUEUE waiting hashes, logins are answered with 503
+    PASSWORD_BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 4
+    PASSWORD_HASH_MAX_QUEUE: int = 64
+
     # Stripe
     STRIPE_API_KEY: str = ""
     STRIPE_WEBHOOK_SECRET: str = ""
+    # API host, e.g. http://localhost:12111 for stripe-mock; empty for Stripe's
+    STRIPE_API_BASE: str = ""
+    # Stripe calls run on their own pool of STRIPE_WORKERS threads; beyond
+    # STRIPE_MAX_QUEUE waiting calls, payment requests are answered with 503.
+    # STRIPE_TIMEOUT bounds each HTTP request and STRIPE_DEADLINE a whole
+    # call, retries and queueing included
+    STRIPE_WORKERS: int = 8
+    STRIPE_MAX_QUEUE: int = 64
+    STRIPE_TIMEOUT: float = 10.0
+    STRIPE_DEADLINE: float = 30.0
+    STRIPE_MAX_NETWORK_RETRIES: int = 2
+    # Verified webhook events wait in a queue of STRIPE_WEBHOOK_QUEUE_SIZE and
+    # are applied in batches of up to STRIPE_WEBHOOK_BATCH_SIZE, collected for
+    # at most STRIPE_WEBHOOK_BATCH_WAIT seconds
+    STRIPE_WEBHOOK_QUEUE_SIZE: int = 10000
+    STRIPE_WEBHOOK_BATCH_SIZE: int = 200
+    STRIPE_WEBHOOK_BATCH_WAIT: float = 0.5
+
+    # Documents are stored once per content, under their SHA-256, and
+    # written in chunks of DOCUMENT_STORAGE_CHUNK_SIZE bytes
+    DOCUMENT_STORAGE_DIR: str = "/tmp/trademark-documents"
+    DOCUMENT_STORAGE_CHUNK_SIZE: int = 1024 * 1024
+
+    # Trademark images: upload limits, and the thumbnails (longest side in
+    # pixels) rendered by THUMBNAIL_WORKERS processes. Beyond
+    # THUMBNAIL_MAX_QUEUE waiting images, thumbnails are skipped.
+    # Dimension checks and thumbnails need Pillow
+    TRADEMARK_IMAGE_MAX_BYTES: int = 10 * 1024 * 1024
+    TRADEMARK_IMAGE_MAX_PIXELS: int = 40_000_000
+    THUMBNAIL_SIZES: List[int] = [128, 512]
+    THUMBNAIL_WORKERS: int = 2
+    THUMBNAIL_MAX_QUEUE: int = 64
     
     # External APIs
     TMVIEW_API_URL: str = ""
     EUIPO_API_URL: str = ""
     WIPO_API_URL: str = ""
+    OBI_API_URL: str = ""
+
+    # Shared HTTP client pool for the external APIs, timeouts in seconds
+    HTTP_MAX_CONNECTIONS: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 30.0
+    HTTP_TIMEOUT: float = 10.0
+    HTTP_CONNECT_TIMEOUT: float = 3.0
+    HTTP2_ENABLED: bool = True
+
+    # Per-office protection: token bucket rate limits (requests per second,
+    # bursts of OFFICE_RATE_BURST) and a circuit breaker that opens after
+    # CIRCUIT_FAILURE_THRESHOLD consecutive failures or responses slower than
+    # the office's CIRCUIT_LATENCY_SLO, and retries after CIRCUIT_RECOVERY_TIMEOUT.
+    # Submissions are guarded separately, as "<office>:submit"
+    OFFICE_RATE_LIMIT_DEFAULT: float = 5.0
+    OFFICE_RATE_LIMITS: Dict[str, float] = {
+        "tmview": 5.0,
+        "euipo": 5.0,
+        "wipo": 2.0,
+        "obi": 2.0,
+        "memex": 10.0,
+    }
+    OFFICE_RATE_BURST: int = 10
+    OFFICE_RATE_LIMIT_MAX_WAIT: float = 2.0
+    CIRCUIT_FAILURE_THRESHOLD: int = 5
+    CIRCUIT_RECOVERY_TIMEOUT: float = 30.0
+    CIRCUIT_LATENCY_SLO: Dict[str, float] = {
+        "tmview": 5.0,
+        "euipo": 5.0,
+        "wipo": 5.0,
+        "obi": 5.0,
+    }
+
+    # External search cache: in-process LRU plus an optional shared tier
+    # ("redis" or "disk"). TTLs are per source in seconds; an expired entry is
+    # still served for SEARCH_CACHE_STALE_TTL seconds while it is refreshed.
+    SEARCH_CACHE_MAX_ENTRIES: int = 1024
+    SEARCH_CACHE_TTLS: Dict[str, float] = {
+        "tmview": 3600.0,
+        "euipo": 3600.0,
+        "wipo": 3600.0,
+        "obi": 1800.0,
+    }
+    SEARCH_CACHE_STALE_TTL: float = 600.0
+    SEARCH_CACHE_BACKEND: str = ""
+    SEARCH_CACHE_REDIS_URL: str = "redis://localhost:6379/0"
+    SEARCH_CACHE_DIR: str = "/tmp/trademark-search-cache"
+
+    # Federated search: per-source timeouts and the overall deadline, in seconds
+    FEDERATED_SEARCH_DEADLINE: float = 8.0
+    FEDERATED_SEARCH_TIMEOUTS: Dict[str, float] = {
+        "local": 3.0,
+        "tmview": 6.0,
+        "euipo": 6.0,
+        "wipo": 6.0,
+        "obi": 6.0,
+    }
     
     # Memex MCP Server
     MEMEX_MCP_URL: str = ""
@@ -0,0 +1,103 @@
+from typing import Any, Dict, Optional
+
+import httpx
+
+from app.core.config import settings
+from app.core.resilience import office_guards
+
+
+class HTTPClientRegistry:
+    """
+    Application-scoped httpx clients, one per upstream origin.
+
+    Every office integration shares these clients, so connections (and TLS
+    sessions) are pooled and kept alive across searches instead of being
+    re-established per call. Pool limits, keep-alive and HTTP/2 come from
+    Settings. Pass a transport (e.g. httpx.MockTransport) to route every
+    client through it in tests.
+
+    Like the other application-scoped services, the registry is created
+    empty at import and started in the FastAPI lifespan, which opens the
+    clients of the configured offices; a client for any other origin is
+    opened on first use.
+    """
+
+    def __init__(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._transport = transport
+
+    def _new_client(self) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            http2=settings.HTTP2_ENABLED,
+            limits=httpx.Limits(
+                max_connections=settings.HTTP_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.HTTP_MAX_KEEPALIVE_CONNECTIONS,
+                keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY,
+            ),
+            timeout=httpx.Timeout(
+                settings.HTTP_TIMEOUT, connect=settings.HTTP_CONNECT_TIMEOUT
+            ),
+            transport=self._transport,
+        )
+
+    def start(self) -> None:
+        """Open the clients of every configured office"""
+        for url in (
+            settings.TMVIEW_API_URL,
+            settings.EUIPO_API_URL,
+            settings.WIPO_API_URL,
+            settings.OBI_API_URL,
+            settings.MEMEX_MCP_URL,
+        ):
+            if url:
+                self.get(url)
+
+    def get(self, url: str) -> httpx.AsyncClient:
+        """Return the pooled client for the origin of the given URL"""
+        parsed = httpx.URL(url)
+        origin = f"{parsed.scheme}://{parsed.netloc.decode('ascii')}"
+        client = self._clients.get(origin)
+        if client is None or client.is_closed:
+            client = self._clients[origin] = self._new_client()
+        return client
+
+    async def reset(self, transport: Optional[httpx.AsyncBaseTransport] = None) -> None:
+        """Close every client; new ones use the given transport"""
+        await self.aclose()
+        self._transport = transport
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+
+http_clients = HTTPClientRegistry()
+
+# Requests that are safe to repeat; the others submit something to the office
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE"})
+
+
+def guard_name(source: str, method: str) -> str:
+    """
+    Name of the guard a request goes through: submissions get one of their
+    own per office, so failing or slow searches cannot block them and a
+    submission is never held to the searches' latency SLO.
+    """
+    return source if method.upper() in IDEMPOTENT_METHODS else f"{source}:submit"
+
+
+async def request_json(source: str, method: str, url: str, **kwargs: Any) -> Any:
+    """
+    Send a request to an external office through the pooled client and
+    return the JSON body. Every request to the same source and guard_name()
+    shares its rate limiter and circuit breaker, which raise
+    UpstreamUnavailableError.
+    """
+    async def send() -> Any:
+        response = await http_clients.get(url).request(method, url, **kwargs)
+        response.raise_for_status()
+        return response.json()
+
+    return await office_guards[guard_name(source, method)].call(send)
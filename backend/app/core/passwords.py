@@ -0,0 +1,101 @@
+from typing import Any, Callable, Dict, Optional, Tuple
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import threading
+
+from app.core import security
+from app.core.config import settings
+
+
+class PasswordHasherBusyError(Exception):
+    """Too many password hashes are already waiting for a worker"""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("Too many logins at once, please retry")
+        self.retry_after = retry_after
+
+
+class PasswordHasher:
+    """
+    Runs bcrypt hashing and verification on a bounded pool of threads.
+
+    bcrypt releases the GIL, so `max_workers` hashes run in parallel without
+    holding up the event loop or the request threadpool. At most `max_queue`
+    more wait for a worker; beyond that calls fail fast with
+    PasswordHasherBusyError instead of piling up behind a login burst.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0  # Submitted and not finished: running plus queued
+        self.completed = 0
+        self.rejected = 0
+        self.max_queue_depth = 0
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            self.completed += 1
+
+    def submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PasswordHasherBusyError(retry_after=1.0)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="password-hasher"
+                )
+            self._pending += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth())
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    def queue_depth(self) -> int:
+        """Hashes waiting for a free worker"""
+        return max(self._pending - self.max_workers, 0)
+
+    async def hash(self, password: str) -> str:
+        return await asyncio.wrap_future(self.submit(security.get_password_hash, password))
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        return await asyncio.wrap_future(
+            self.submit(security.verify_and_update_password, password, hashed_password)
+        )
+
+    def hash_sync(self, password: str) -> str:
+        """Blocking variant for code already running in a worker thread"""
+        return self.submit(security.get_password_hash, password).result()
+
+    def verify_and_update_sync(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """Blocking variant for code already running in a worker thread"""
+        return self.submit(
+            security.verify_and_update_password, password, hashed_password
+        ).result()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "running": min(self._pending, self.max_workers),
+                "queue_depth": self.queue_depth(),
+                "max_queue": self.max_queue,
+                "max_queue_depth": self.max_queue_depth,
+                "completed": self.completed,
+                "rejected": self.rejected,
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+password_hasher = PasswordHasher(
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    max_queue=settings.PASSWORD_HASH_MAX_QUEUE,
+)
@@ -0,0 +1,72 @@
+from typing import Any, Optional
+from dataclasses import dataclass
+import threading
+import time
+
+from app.core.cache import CacheEntry, LRUCache
+from app.core.config import settings
+
+
+@dataclass(frozen=True)
+class Principal:
+    """Identity and role of an authenticated user, without a database session"""
+
+    id: str
+    email: str
+    is_active: bool
+    is_superuser: bool
+
+    @classmethod
+    def from_user(cls, user: Any) -> "Principal":
+        return cls(
+            id=user.id,
+            email=user.email,
+            is_active=bool(user.is_active),
+            is_superuser=bool(user.is_superuser),
+        )
+
+
+class PrincipalCache:
+    """
+    Principals of active users by user id, bounded in number and kept for
+    `ttl` seconds.
+
+    crud.user invalidates a user's entry when it is updated or removed. The
+    cache is per process, so on other workers a change shows up within `ttl`.
+    Used from the event loop and from threadpool endpoints alike, hence the lock.
+    """
+
+    def __init__(self, max_entries: int, ttl: float) -> None:
+        self.ttl = ttl
+        self._entries = LRUCache(max_entries)
+        self._lock = threading.Lock()
+
+    def get(self, user_id: str) -> Optional[Principal]:
+        with self._lock:
+            entry = self._entries.get(user_id)
+            if entry is None:
+                return None
+            if entry.age() >= self.ttl:
+                self._entries.delete(user_id)
+                return None
+            return entry.value
+
+    def set(self, principal: Principal) -> None:
+        if self.ttl <= 0 or not principal.is_active:
+            return
+        with self._lock:
+            self._entries.set(principal.id, CacheEntry(principal, time.time()))
+
+    def invalidate(self, user_id: str) -> None:
+        with self._lock:
+            self._entries.delete(user_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+
+principal_cache = PrincipalCache(
+    max_entries=settings.PRINCIPAL_CACHE_MAX_ENTRIES,
+    ttl=settings.PRINCIPAL_CACHE_TTL,
+)
@@ -0,0 +1,216 @@
+from typing import Any, Awaitable, Callable, Dict, Optional
+import asyncio
+import enum
+import logging
+import time
+
+import httpx
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+
+class UpstreamUnavailableError(Exception):
+    """An external office was not called, so the caller can fail fast"""
+
+    def __init__(self, source: str, message: str, retry_after: float) -> None:
+        super().__init__(message)
+        self.source = source
+        self.retry_after = retry_after
+
+
+class CircuitOpenError(UpstreamUnavailableError):
+    def __init__(self, source: str, retry_after: float) -> None:
+        super().__init__(
+            source, f"{source} is unavailable, retry in {retry_after:.0f}s", retry_after
+        )
+
+
+class RateLimitedError(UpstreamUnavailableError):
+    def __init__(self, source: str, retry_after: float) -> None:
+        super().__init__(
+            source, f"{source} rate limit reached, retry in {retry_after:.1f}s", retry_after
+        )
+
+
+class TokenBucket:
+    """
+    Token bucket allowing `rate` calls per second on average and bursts of
+    up to `burst` calls.
+    """
+
+    def __init__(self, rate: float, burst: int) -> None:
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self) -> float:
+        """Take a token and return how long to wait before using it"""
+        self._refill()
+        self._tokens -= 1
+        return 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+
+    def cancel(self) -> None:
+        """Give back a reserved token that will not be used"""
+        self._tokens = min(self.burst, self._tokens + 1)
+
+
+class CircuitState(str, enum.Enum):
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"  # One trial call decides whether to close again
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures, where a call slower
+    than `latency_slo` seconds counts as a failure. While open, calls fail
+    immediately; after `recovery_timeout` seconds one trial call is let through.
+    """
+
+    def __init__(self, failure_threshold: int, recovery_timeout: float, latency_slo: Optional[float]) -> None:
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.latency_slo = latency_slo
+        self.state = CircuitState.CLOSED
+        self.failures = 0
+        self._opened_at = 0.0
+        self._trial_running = False
+
+    def retry_after(self) -> float:
+        return max(self._opened_at + self.recovery_timeout - time.monotonic(), 0.0)
+
+    def allow(self) -> bool:
+        if self.state == CircuitState.OPEN and self.retry_after() <= 0:
+            self.state = CircuitState.HALF_OPEN
+        if self.state == CircuitState.CLOSED:
+            return True
+        if self.state == CircuitState.HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def release(self) -> None:
+        """Forget a call that was allowed but never reached the office"""
+        self._trial_running = False
+
+    def record(self, success: bool, elapsed: float) -> None:
+        self._trial_running = False
+        if success and (self.latency_slo is None or elapsed <= self.latency_slo):
+            self.state = CircuitState.CLOSED
+            self.failures = 0
+            return
+        self.failures += 1
+        if self.state == CircuitState.HALF_OPEN or self.failures >= self.failure_threshold:
+            self.state = CircuitState.OPEN
+            self._opened_at = time.monotonic()
+
+
+def _is_upstream_failure(error: Exception) -> bool:
+    # A 4xx answer is the caller's fault and says nothing about the office
+    if isinstance(error, httpx.HTTPStatusError):
+        status_code = error.response.status_code
+        return status_code >= 500 or status_code == 429
+    return True
+
+
+class SourceGuard:
+    """Rate limiter and circuit breaker in front of one external office"""
+
+    def __init__(
+        self,
+        source: str,
+        limiter: TokenBucket,
+        breaker: CircuitBreaker,
+        max_wait: float
+    ) -> None:
+        self.source = source
+        self.limiter = limiter
+        self.breaker = breaker
+        self.max_wait = max_wait
+
+    async def call(self, func: Callable[[], Awaitable[Any]]) -> Any:
+        if not self.breaker.allow():
+            raise CircuitOpenError(self.source, self.breaker.retry_after())
+
+        wait = self.limiter.reserve()
+        if wait > self.max_wait:
+            self.limiter.cancel()
+            self.breaker.release()
+            raise RateLimitedError(self.source, wait)
+        if wait:
+            try:
+                await asyncio.sleep(wait)
+            except asyncio.CancelledError:
+                self.breaker.release()
+                raise
+
+        started = time.monotonic()
+        try:
+            result = await func()
+        except asyncio.CancelledError:
+            # Cancelled by the caller's timeout: only a breach of the SLO counts
+            elapsed = time.monotonic() - started
+            if self.breaker.latency_slo is not None and elapsed > self.breaker.latency_slo:
+                self.breaker.record(success=False, elapsed=elapsed)
+            else:
+                self.breaker.release()
+            raise
+        except Exception as e:
+            self.breaker.record(success=not _is_upstream_failure(e), elapsed=time.monotonic() - started)
+            if self.breaker.state == CircuitState.OPEN:
+                logger.warning("Circuit for %s opened", self.source)
+            raise
+        self.breaker.record(success=True, elapsed=time.monotonic() - started)
+        if self.breaker.state == CircuitState.OPEN:
+            logger.warning("Circuit for %s opened after slow responses", self.source)
+        return result
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "state": self.breaker.state.value,
+            "failures": self.breaker.failures,
+            "retry_after": round(self.breaker.retry_after(), 1)
+            if self.breaker.state == CircuitState.OPEN else 0.0,
+        }
+
+
+class SourceGuards:
+    """One shared guard per office, created on first use from Settings"""
+
+    def __init__(self) -> None:
+        self._guards: Dict[str, SourceGuard] = {}
+
+    def __getitem__(self, source: str) -> SourceGuard:
+        guard = self._guards.get(source)
+        if guard is None:
+            guard = self._guards[source] = SourceGuard(
+                source,
+                limiter=TokenBucket(
+                    rate=settings.OFFICE_RATE_LIMITS.get(source, settings.OFFICE_RATE_LIMIT_DEFAULT),
+                    burst=settings.OFFICE_RATE_BURST,
+                ),
+                breaker=CircuitBreaker(
+                    failure_threshold=settings.CIRCUIT_FAILURE_THRESHOLD,
+                    recovery_timeout=settings.CIRCUIT_RECOVERY_TIMEOUT,
+                    latency_slo=settings.CIRCUIT_LATENCY_SLO.get(source),
+                ),
+                max_wait=settings.OFFICE_RATE_LIMIT_MAX_WAIT,
+            )
+        return guard
+
+    def status(self) -> Dict[str, Dict[str, Any]]:
+        return {source: guard.status() for source, guard in self._guards.items()}
+
+    def reset(self) -> None:
+        self._guards.clear()
+
+
+office_guards = SourceGuards()
@@ -0,0 +1,35 @@
+from typing import Any, Awaitable, Callable, Dict
+import asyncio
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls with the same key into one.
+
+    The first caller starts the call as a task; callers arriving while it is
+    in flight await the same task instead of starting their own. The task is
+    shielded, so a caller that is cancelled (e.g. at a search deadline) does
+    not cancel it for the others. Once it finishes the key is released and
+    the next call starts afresh.
+    """
+
+    def __init__(self) -> None:
+        self._calls: Dict[str, "asyncio.Task[Any]"] = {}
+
+    def in_flight(self, key: str) -> bool:
+        return key in self._calls
+
+    def _release(self, key: str, task: "asyncio.Task[Any]") -> None:
+        if self._calls.get(key) is task:
+            del self._calls[key]
+        if not task.cancelled():
+            # Mark the exception retrieved when every caller has given up
+            task.exception()
+
+    async def do(self, key: str, call: Callable[[], Awaitable[Any]]) -> Any:
+        task = self._calls.get(key)
+        if task is None:
+            task = asyncio.ensure_future(call())
+            self._calls[key] = task
+            task.add_done_callback(lambda done: self._release(key, done))
+        return await asyncio.shield(task)
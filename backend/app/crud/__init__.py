@@ -1,2 +1,4 @@
-from .user import user
-from .trademark import trademark
+from .user import user, async_user
+from .trademark import trademark, async_trademark
+from .payment import payment
+from .document import document, async_document
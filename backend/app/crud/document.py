@@ -0,0 +1,41 @@
+from typing import Optional
+import uuid
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.crud.base import AsyncCRUDBase, CRUDBase
+from app.models.document import Document
+from app.schemas.document import DocumentCreate, DocumentUpdate
+
+
+class CRUDDocument(CRUDBase[Document, DocumentCreate, DocumentUpdate]):
+    def create(self, db: Session, *, obj_in: DocumentCreate) -> Document:
+        db_obj = self.model(id=str(uuid.uuid4()), **obj_in.model_dump())
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+    def get_by_content_hash(self, db: Session, *, content_hash: str) -> Optional[Document]:
+        return db.query(self.model).filter(Document.content_hash == content_hash).first()
+
+
+class AsyncCRUDDocument(AsyncCRUDBase[Document, DocumentCreate, DocumentUpdate]):
+    async def create(self, db: AsyncSession, *, obj_in: DocumentCreate) -> Document:
+        db_obj = self.model(id=str(uuid.uuid4()), **obj_in.model_dump())
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def get_by_content_hash(self, db: AsyncSession, *, content_hash: str) -> Optional[Document]:
+        result = await db.execute(
+            select(self.model).where(Document.content_hash == content_hash).limit(1)
+        )
+        return result.scalars().first()
+
+
+document = CRUDDocument(Document)
+async_document = AsyncCRUDDocument(Document)
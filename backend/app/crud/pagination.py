@@ -0,0 +1,62 @@
+from typing import Any, List, Optional, Sequence, TypeVar
+from datetime import datetime
+import base64
+import json
+
+from sqlalchemy import literal, tuple_
+
+Statement = TypeVar("Statement")
+
+# Largest `limit` a paginated endpoint accepts
+MAX_PAGE_SIZE = 500
+
+
+class InvalidCursorError(ValueError):
+    pass
+
+
+def encode_cursor(*values: Any) -> str:
+    """Opaque, URL-safe token holding the sort key of the last row of a page"""
+    payload = json.dumps([
+        value.isoformat() if isinstance(value, datetime) else value for value in values
+    ])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except ValueError:
+        raise InvalidCursorError("Invalid cursor")
+    if not isinstance(values, list) or len(values) != size:
+        raise InvalidCursorError("Invalid cursor")
+    return values
+
+
+def paginate(statement: Statement, model: Any, *, cursor: Optional[str], limit: int) -> Statement:
+    """
+    Newest first, one page of `limit` rows after the cursor.
+
+    Pages are seeked on (created_at, id) rather than skipped with OFFSET, so
+    every page costs the same and rows inserted meanwhile never shift a page.
+    Works on both Query and Select.
+    """
+    if cursor:
+        created_at, id = decode_cursor(cursor, 2)
+        try:
+            created_at = datetime.fromisoformat(created_at)
+        except (TypeError, ValueError):
+            raise InvalidCursorError("Invalid cursor")
+        statement = statement.filter(
+            tuple_(model.created_at, model.id) < tuple_(literal(created_at), literal(id))
+        )
+    return statement.order_by(model.created_at.desc(), model.id.desc()).limit(limit)
+
+
+def next_cursor(items: Sequence[Any], limit: int) -> Optional[str]:
+    """Cursor of the page after a full page from paginate, None after the last"""
+    if not items or len(items) < limit:
+        return None
+    last = items[-1]
+    return encode_cursor(last.created_at, last.id)
@@ -0,0 +1,101 @@
+from typing import Any, Dict, List, Optional, Sequence
+import uuid
+
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from app.crud.base import CRUDBase
+from app.crud.pagination import paginate
+from app.db.routing import replica_read
+from app.models.payment import Payment, PaymentStatus, StripeEvent
+from app.schemas.payment import PaymentCreate, PaymentUpdate, PaymentWebhookEvent
+
+# Payment status after each Stripe event type; other events are only recorded
+WEBHOOK_STATUSES = {
+    "payment_intent.succeeded": PaymentStatus.COMPLETED,
+    "payment_intent.payment_failed": PaymentStatus.FAILED,
+    "payment_intent.canceled": PaymentStatus.FAILED,
+    "charge.refunded": PaymentStatus.REFUNDED,
+}
+
+
+def _record_events_statement(dialect: str, rows: List[Dict[str, Any]]) -> Any:
+    """Multi-row INSERT of events returning only those not recorded before"""
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    return (
+        insert(StripeEvent)
+        .values(rows)
+        .on_conflict_do_nothing(index_elements=[StripeEvent.id])
+        .returning(StripeEvent.id)
+    )
+
+
+class CRUDPayment(CRUDBase[Payment, PaymentCreate, PaymentUpdate]):
+    def create(self, db: Session, *, obj_in: PaymentCreate) -> Payment:
+        db_obj = self.model(id=str(uuid.uuid4()), **obj_in.model_dump())
+        db.add(db_obj)
+        db.commit()
+        db.refresh(db_obj)
+        return db_obj
+
+    @replica_read
+    def get_multi_by_user(
+        self, db: Session, *, user_id: str, cursor: Optional[str] = None, limit: int = 100
+    ) -> List[Payment]:
+        query = db.query(self.model).filter(Payment.user_id == user_id)
+        return paginate(query, self.model, cursor=cursor, limit=limit).all()
+
+    def get_by_stripe_payment_intent_id(self, db: Session, *, payment_intent_id: str) -> Optional[Payment]:
+        return db.query(self.model).filter(Payment.stripe_payment_intent_id == payment_intent_id).first()
+
+    def apply_webhook_events(self, db: Session, *, events: Sequence[PaymentWebhookEvent]) -> Dict[str, int]:
+        """
+        Record a batch of Stripe events and apply the payment status changes
+        of those not seen before, in one transaction.
+
+        Events are applied in the order Stripe created them: the newest event
+        of a payment intent decides its status, unless the payment already
+        holds the status of a newer event from an earlier batch (a retried
+        delivery arriving late), in which case the event is counted as
+        stale. Returns the number of new, duplicate and stale events and of
+        payments updated.
+        """
+        unique = {event.id: event for event in events}
+        if not unique:
+            return {"new": 0, "duplicates": 0, "stale": 0, "updated": 0}
+        rows = [{"id": event.id, "type": event.type} for event in unique.values()]
+        statement = _record_events_statement(db.get_bind().dialect.name, rows)
+        new_ids = set(db.execute(statement).scalars())
+
+        # Newest status-changing event of each payment intent
+        latest: Dict[str, PaymentWebhookEvent] = {}
+        for event in sorted(unique.values(), key=lambda event: event.created):
+            if event.id in new_ids and event.type in WEBHOOK_STATUSES and event.payment_intent_id:
+                latest[event.payment_intent_id] = event
+        payments = []
+        if latest:
+            payments = (
+                db.query(self.model)
+                .filter(Payment.stripe_payment_intent_id.in_(list(latest)))
+                .all()
+            )
+        updated = stale = 0
+        for payment in payments:
+            event = latest[payment.stripe_payment_intent_id]
+            # Events created in the same second apply in the order received
+            if payment.stripe_event_created is not None and event.created < payment.stripe_event_created:
+                stale += 1
+                continue
+            payment.status = WEBHOOK_STATUSES[event.type]
+            payment.stripe_event_created = event.created
+            updated += 1
+        db.commit()
+        return {
+            "new": len(new_ids),
+            "duplicates": len(events) - len(new_ids),
+            "stale": stale,
+            "updated": updated,
+        }
+
+
+payment = CRUDPayment(Payment)
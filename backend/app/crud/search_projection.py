@@ -0,0 +1,64 @@
+from typing import Any, Dict, Iterable, List
+from itertools import chain
+
+from sqlalchemy import delete, event, insert, select
+from sqlalchemy.engine import Connection
+from sqlalchemy.orm import Session
+
+from app.models.trademark import Trademark, TrademarkSearchProjection
+
+_REFRESH_BATCH_SIZE = 500
+
+
+def _projection_rows(connection: Connection, ids: List[str]) -> List[Dict[str, Any]]:
+    rows = connection.execute(
+        select(
+            Trademark.id,
+            Trademark.phonetic_key,
+            Trademark.nice_class_mask,
+            Trademark.jurisdiction,
+            Trademark.status,
+            Trademark.type,
+            Trademark.created_at,
+        ).where(Trademark.id.in_(ids))
+    )
+    return [
+        {
+            "id": row.id,
+            "phonetic_key": row.phonetic_key,
+            "nice_class_mask": row.nice_class_mask or 0,
+            "jurisdiction": row.jurisdiction,
+            "status": row.status,
+            "type": row.type,
+            "created_at": row.created_at,
+        }
+        for row in rows
+    ]
+
+
+def refresh_search_projection(connection: Connection, ids: Iterable[str]) -> None:
+    """
+    Rebuild the projection rows of the given trademarks from their current
+    state; rows of trademarks that no longer exist are dropped.
+    """
+    ids = sorted(set(ids))
+    for start in range(0, len(ids), _REFRESH_BATCH_SIZE):
+        batch = ids[start:start + _REFRESH_BATCH_SIZE]
+        rows = _projection_rows(connection, batch)
+        connection.execute(
+            delete(TrademarkSearchProjection).where(TrademarkSearchProjection.id.in_(batch))
+        )
+        if rows:
+            connection.execute(insert(TrademarkSearchProjection), rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _refresh_after_flush(session: Session, flush_context: Any) -> None:
+    # Every ORM write of a trademark, sync or async, in the same transaction
+    ids = {
+        obj.id
+        for obj in chain(session.new, session.dirty, session.deleted)
+        if isinstance(obj, Trademark) and obj.id is not None
+    }
+    if ids:
+        refresh_search_projection(session.connection(bind_arguments={"mapper": Trademark}), ids)
@@ -1,39 +1,334 @@
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
 import uuid
 
+from sqlalchemy import Select, and_, or_, cast, func, literal, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.dialects.postgresql import JSONB, JSONPATH
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, or_
 
-from app.crud.base import CRUDBase
-from app.models.trademark import Trademark, TrademarkStatus, TrademarkType
-from app.schemas.trademark import TrademarkCreate, TrademarkUpdate, TrademarkSearchQuery
+from app.crud.base import AsyncCRUDBase, CRUDBase
+from app.crud.pagination import InvalidCursorError, decode_cursor, encode_cursor, next_cursor, paginate
+from app.crud.search_projection import refresh_search_projection
+from app.db.routing import replica_read
+from app.models.trademark import Trademark, TrademarkSearchProjection, TrademarkStatus, TrademarkType
+from app.schemas.trademark import (
+    NiceClassMatch, TrademarkCreate, TrademarkImport, TrademarkUpdate, TrademarkSearchMode,
+    TrademarkSearchQuery
+)
+from app.services.nice_class_service import nice_class_mask
+from app.services.phonetic_service import phonetic_key
+from app.services.trigram_service import DEFAULT_SIMILARITY_THRESHOLD, TrigramIndex
+
+
+def _with_search_keys(obj_data: Dict[str, Any]) -> Dict[str, Any]:
+    """Add the precomputed search keys derived from the given fields"""
+    if obj_data.get("name"):
+        obj_data = {**obj_data, "phonetic_key": phonetic_key(obj_data["name"])}
+    if "nice_classes" in obj_data:
+        obj_data = {**obj_data, "nice_class_mask": nice_class_mask(obj_data["nice_classes"])}
+    return obj_data
+
+
+def _nice_class_filter(nice_classes: List[int], match: NiceClassMatch) -> Any:
+    """
+    One predicate over the nice_classes JSONB array, answered by the
+    ix_trademark_nice_classes GIN index whatever the number of classes
+    """
+    classes = sorted(set(nice_classes))
+    if match == NiceClassMatch.ALL:
+        return Trademark.nice_classes.op("@>")(literal(classes, JSONB))
+    path = "$[*] ? (" + " || ".join(f"@ == {int(nice_class)}" for nice_class in classes) + ")"
+    return Trademark.nice_classes.op("@?")(cast(path, JSONPATH))
+
+
+def _has_nice_classes(
+    trademark_classes: Optional[List[int]], nice_classes: List[int], match: NiceClassMatch
+) -> bool:
+    """_nice_class_filter evaluated in Python, for binds without JSONB"""
+    if match == NiceClassMatch.ALL:
+        return set(nice_classes) <= set(trademark_classes or [])
+    return not set(nice_classes).isdisjoint(trademark_classes or [])
+
+
+def _filter_search(
+    statement: Select, search_query: TrademarkSearchQuery, *, nice_classes: bool = True
+) -> Select:
+    """Apply the non-name search filters; `nice_classes=False` leaves out the JSONB one"""
+    # Filter by jurisdiction
+    if search_query.jurisdiction:
+        statement = statement.filter(Trademark.jurisdiction == search_query.jurisdiction)
+    
+    # Filter by Nice classes
+    if search_query.nice_classes and nice_classes:
+        statement = statement.filter(
+            _nice_class_filter(search_query.nice_classes, search_query.nice_class_match)
+        )
+    
+    # Filter by trademark type
+    if search_query.trademark_type:
+        statement = statement.filter(Trademark.type == search_query.trademark_type)
+    
+    # Filter by status
+    if search_query.status:
+        statement = statement.filter(Trademark.status == search_query.status)
+
+    return statement
+
+
+def _projection_applies(search_query: TrademarkSearchQuery) -> bool:
+    """
+    Jurisdiction searches by substring or sound are answered from the search
+    projection; trigram ranking needs the name itself
+    """
+    return bool(search_query.jurisdiction) and search_query.mode != TrademarkSearchMode.TRIGRAM
+
+
+def _projection_statement(
+    search_query: TrademarkSearchQuery, *, cursor: Optional[str], limit: int
+) -> Optional[Select]:
+    """
+    Page of a search on the projection: candidates of one jurisdiction in
+    creation order, their classes tested with one AND on the class mask.
+    Matches exactly what the same search on the trademark table does.
+    """
+    projection = TrademarkSearchProjection
+    statement = (
+        select(Trademark)
+        .join(projection, projection.id == Trademark.id)
+        .filter(projection.jurisdiction == search_query.jurisdiction)
+    )
+    if search_query.nice_classes:
+        mask = nice_class_mask(search_query.nice_classes)
+        shared = projection.nice_class_mask.bitwise_and(mask)
+        if search_query.nice_class_match == NiceClassMatch.ALL:
+            statement = statement.filter(shared == mask)
+        else:
+            statement = statement.filter(shared != 0)
+    if search_query.trademark_type:
+        statement = statement.filter(projection.type == search_query.trademark_type)
+    if search_query.status:
+        statement = statement.filter(projection.status == search_query.status)
+
+    if search_query.query and search_query.mode == TrademarkSearchMode.PHONETIC:
+        key = phonetic_key(search_query.query)
+        if not key:
+            return None
+        statement = statement.filter(projection.phonetic_key == key)
+    elif search_query.query:
+        # Same case-insensitive partial match as _search_statement
+        statement = statement.filter(Trademark.name.ilike(f"%{search_query.query}%"))
+    return paginate(statement, projection, cursor=cursor, limit=limit)
+
+
+def _trigram_threshold(search_query: TrademarkSearchQuery) -> Select:
+    """Set the transaction-local threshold honoured by the `%` operator"""
+    threshold = search_query.similarity_threshold
+    if threshold is None:
+        threshold = DEFAULT_SIMILARITY_THRESHOLD
+    return select(func.set_config("pg_trgm.similarity_threshold", str(threshold), True))
+
+
+def _trigram_cursor(cursor: str) -> Tuple[float, str]:
+    score, id = decode_cursor(cursor, 2)
+    try:
+        return float(score), str(id)
+    except (TypeError, ValueError):
+        raise InvalidCursorError("Invalid cursor")
+
+
+def _search_statement(
+    search_query: TrademarkSearchQuery, *, cursor: Optional[str], limit: int
+) -> Optional[Select]:
+    """
+    Statement for one page of the search, or None when nothing can match.
+
+    Trigram mode ranks by similarity and seeks on (similarity, id), returning
+    the similarity as a second column; it needs pg_trgm and _trigram_threshold
+    executed first. The other modes are paginated newest first.
+    """
+    if _projection_applies(search_query):
+        return _projection_statement(search_query, cursor=cursor, limit=limit)
+
+    statement = _filter_search(select(Trademark), search_query)
+
+    # Sounds-alike match answered by the phonetic_key index
+    if search_query.query and search_query.mode == TrademarkSearchMode.PHONETIC:
+        key = phonetic_key(search_query.query)
+        if not key:
+            return None
+        statement = statement.filter(Trademark.phonetic_key == key)
+
+    # Fuzzy name match ranked by trigram similarity, answered by
+    # ix_trademark_name_trgm
+    elif search_query.query and search_query.mode == TrademarkSearchMode.TRIGRAM:
+        similarity = func.similarity(Trademark.name, search_query.query)
+        statement = (
+            statement.add_columns(similarity.label("similarity"))
+            .filter(Trademark.name.op("%")(search_query.query))
+        )
+        if cursor:
+            score, id = _trigram_cursor(cursor)
+            statement = statement.filter(
+                tuple_(similarity, Trademark.id) < tuple_(literal(score), literal(id))
+            )
+        return statement.order_by(similarity.desc(), Trademark.id.desc()).limit(limit)
+
+    # Filter by name (case-insensitive partial match)
+    elif search_query.query:
+        statement = statement.filter(Trademark.name.ilike(f"%{search_query.query}%"))
+
+    return paginate(statement, Trademark, cursor=cursor, limit=limit)
+
+
+def _search_page(
+    rows: Sequence[Any], search_query: TrademarkSearchQuery, limit: int
+) -> Tuple[List[Trademark], Optional[str]]:
+    """Trademarks of a page from _search_statement and the next cursor"""
+    trademarks = [row[0] for row in rows]
+    if search_query.query and search_query.mode == TrademarkSearchMode.TRIGRAM:
+        if len(rows) < limit:
+            return trademarks, None
+        return trademarks, encode_cursor(rows[-1].similarity, trademarks[-1].id)
+    return trademarks, next_cursor(trademarks, limit)
+
+
+def _search_trigram_in_process(
+    db: Session, search_query: TrademarkSearchQuery, *, cursor: Optional[str], limit: int
+) -> Tuple[List[Trademark], Optional[str]]:
+    """
+    Without pg_trgm, rank the filtered candidates with an in-process index.
+    Runs on any bind, so the Nice classes are matched in Python.
+    """
+    threshold = search_query.similarity_threshold
+    if threshold is None:
+        threshold = DEFAULT_SIMILARITY_THRESHOLD
+
+    index = TrigramIndex()
+    candidates = _filter_search(
+        select(Trademark.id, Trademark.name, Trademark.nice_classes), search_query, nice_classes=False
+    )
+    for trademark_id, name, trademark_classes in db.execute(candidates):
+        if search_query.nice_classes and not _has_nice_classes(
+            trademark_classes, search_query.nice_classes, search_query.nice_class_match
+        ):
+            continue
+        index.add(trademark_id, name)
+    # Same order and cursor as the pg_trgm statement: (similarity, id) descending
+    matches = sorted(
+        ((score, trademark_id) for trademark_id, score in
+         index.search(search_query.query, threshold=threshold)),
+        reverse=True,
+    )
+    if cursor:
+        after = _trigram_cursor(cursor)
+        matches = [match for match in matches if match < after]
+    matches = matches[:limit]
+    if not matches:
+        return [], None
+    ids = [trademark_id for _, trademark_id in matches]
+    rows = {
+        tm.id: tm
+        for tm in db.execute(select(Trademark).filter(Trademark.id.in_(ids))).scalars()
+    }
+    trademarks = [rows[trademark_id] for trademark_id in ids]
+    if len(matches) < limit:
+        return trademarks, None
+    return trademarks, encode_cursor(*matches[-1])
+
+
+def _upsert_statement(dialect: str, rows: List[Dict[str, Any]], owner_id: str) -> Any:
+    """
+    Multi-row INSERT of `rows` that updates the trademark already holding an
+    application number instead, as long as it belongs to the same owner
+    """
+    insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+    statement = insert(Trademark).values(rows)
+    updated_columns = set(rows[0]) - {"id", "owner_id"}
+    return statement.on_conflict_do_update(
+        index_elements=[Trademark.application_number],
+        set_={
+            **{name: statement.excluded[name] for name in updated_columns},
+            "updated_at": func.now(),
+        },
+        where=Trademark.owner_id == owner_id,
+    ).returning(Trademark.id, Trademark.application_number)
 
 
 class CRUDTrademark(CRUDBase[Trademark, TrademarkCreate, TrademarkUpdate]):
     def create_with_owner(
         self, db: Session, *, obj_in: TrademarkCreate, owner_id: str
     ) -> Trademark:
-        obj_in_data = obj_in.dict()
+        obj_in_data = obj_in.model_dump()
         db_obj = self.model(
             id=str(uuid.uuid4()),
             owner_id=owner_id,
-            **obj_in_data,
+            **_with_search_keys(obj_in_data),
         )
         db.add(db_obj)
         db.commit()
         db.refresh(db_obj)
         return db_obj
 
+    def update(
+        self,
+        db: Session,
+        *,
+        db_obj: Trademark,
+        obj_in: Union[TrademarkUpdate, Dict[str, Any]]
+    ) -> Trademark:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        return super().update(db, db_obj=db_obj, obj_in=_with_search_keys(update_data))
+
+    def import_batch(
+        self, db: Session, *, objs_in: Sequence[TrademarkImport], owner_id: str
+    ) -> List[Optional[bool]]:
+        """
+        Insert or update a batch of trademarks in one statement and commit.
+
+        Returns, for each trademark, True if it was created, False if the one
+        with its application number was updated and None if that one belongs
+        to another owner. Application numbers must be unique within a batch.
+        """
+        if not objs_in:
+            return []
+        rows = [
+            {"id": str(uuid.uuid4()), "owner_id": owner_id, **_with_search_keys(obj_in.model_dump())}
+            for obj_in in objs_in
+        ]
+        # Every row of a multi-row INSERT needs the same columns
+        if any("phonetic_key" in row for row in rows):
+            for row in rows:
+                row.setdefault("phonetic_key", None)
+        statement = _upsert_statement(db.get_bind().dialect.name, rows, owner_id)
+        returned = db.execute(statement).all()
+        # Core statements skip the flush that maintains the projection
+        refresh_search_projection(db.connection(), [id for id, _ in returned])
+        db.commit()
+
+        # A created row keeps the generated id, an updated one its existing id,
+        # and a row left alone by the WHERE of the update is not returned
+        ids = {id for id, _ in returned}
+        updated = {application_number for _, application_number in returned}
+        return [
+            True if row["id"] in ids else
+            False if row["application_number"] in updated else
+            None
+            for row in rows
+        ]
+
+    @replica_read
     def get_by_owner(
-        self, db: Session, *, owner_id: str, skip: int = 0, limit: int = 100
+        self, db: Session, *, owner_id: str, cursor: Optional[str] = None, limit: int = 100
     ) -> List[Trademark]:
-        return (
+        query = (
             db.query(self.model)
             .filter(Trademark.owner_id == owner_id)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return paginate(query, self.model, cursor=cursor, limit=limit).all()
 
     def get_by_application_number(
         self, db: Session, *, application_number: str
@@ -53,70 +348,50 @@ class CRUDTrademark(CRUDBase[Trademark, TrademarkCreate, TrademarkUpdate]):
             .first()
         )
 
+    @replica_read
     def search_local(
-        self, db: Session, *, search_query: TrademarkSearchQuery, skip: int = 0, limit: int = 100
-    ) -> List[Trademark]:
-        """Search local trademark database"""
-        query = db.query(self.model)
-        
-        # Filter by name (case-insensitive partial match)
-        if search_query.query:
-            query = query.filter(
-                Trademark.name.ilike(f"%{search_query.query}%")
-            )
-        
-        # Filter by jurisdiction
-        if search_query.jurisdiction:
-            query = query.filter(Trademark.jurisdiction == search_query.jurisdiction)
-        
-        # Filter by Nice classes
-        if search_query.nice_classes:
-            # Check if any of the requested classes are in the trademark's nice_classes JSON array
-            for nice_class in search_query.nice_classes:
-                query = query.filter(
-                    Trademark.nice_classes.op('?')(str(nice_class))
-                )
-        
-        # Filter by trademark type
-        if search_query.trademark_type:
-            query = query.filter(Trademark.type == search_query.trademark_type)
-        
-        # Filter by status
-        if search_query.status:
-            query = query.filter(Trademark.status == search_query.status)
-        
-        return query.offset(skip).limit(limit).all()
+        self, db: Session, *, search_query: TrademarkSearchQuery, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Trademark], Optional[str]]:
+        """Search local trademark database; returns a page and the next cursor"""
+        if search_query.query and search_query.mode == TrademarkSearchMode.TRIGRAM:
+            if db.get_bind().dialect.name != "postgresql":
+                return _search_trigram_in_process(db, search_query, cursor=cursor, limit=limit)
+            db.execute(_trigram_threshold(search_query))
 
+        statement = _search_statement(search_query, cursor=cursor, limit=limit)
+        if statement is None:
+            return [], None
+        return _search_page(db.execute(statement).all(), search_query, limit)
+
+    @replica_read
     def get_by_status(
-        self, db: Session, *, status: TrademarkStatus, skip: int = 0, limit: int = 100
+        self, db: Session, *, status: TrademarkStatus, cursor: Optional[str] = None, limit: int = 100
     ) -> List[Trademark]:
-        return (
+        query = (
             db.query(self.model)
             .filter(Trademark.status == status)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return paginate(query, self.model, cursor=cursor, limit=limit).all()
 
+    @replica_read
     def get_by_jurisdiction(
-        self, db: Session, *, jurisdiction: str, skip: int = 0, limit: int = 100
+        self, db: Session, *, jurisdiction: str, cursor: Optional[str] = None, limit: int = 100
     ) -> List[Trademark]:
-        return (
+        query = (
             db.query(self.model)
             .filter(Trademark.jurisdiction == jurisdiction)
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return paginate(query, self.model, cursor=cursor, limit=limit).all()
 
+    @replica_read
     def get_expiring_soon(
-        self, db: Session, *, days: int = 90, skip: int = 0, limit: int = 100
+        self, db: Session, *, days: int = 90, cursor: Optional[str] = None, limit: int = 100
     ) -> List[Trademark]:
         """Get trademarks expiring within specified number of days"""
         from datetime import datetime, timedelta
         expiration_threshold = datetime.utcnow() + timedelta(days=days)
         
-        return (
+        query = (
             db.query(self.model)
             .filter(
                 and_(
@@ -125,10 +400,8 @@ class CRUDTrademark(CRUDBase[Trademark, TrademarkCreate, TrademarkUpdate]):
                     Trademark.status == TrademarkStatus.REGISTERED
                 )
             )
-            .offset(skip)
-            .limit(limit)
-            .all()
         )
+        return paginate(query, self.model, cursor=cursor, limit=limit).all()
 
     def update_status(
         self, db: Session, *, db_obj: Trademark, status: TrademarkStatus
@@ -143,4 +416,134 @@ class CRUDTrademark(CRUDBase[Trademark, TrademarkCreate, TrademarkUpdate]):
         return db_obj
 
 
-trademark = CRUDTrademark(Trademark)
\ No newline at end of file
+class AsyncCRUDTrademark(AsyncCRUDBase[Trademark, TrademarkCreate, TrademarkUpdate]):
+    async def create_with_owner(
+        self, db: AsyncSession, *, obj_in: TrademarkCreate, owner_id: str
+    ) -> Trademark:
+        obj_in_data = obj_in.model_dump()
+        db_obj = self.model(
+            id=str(uuid.uuid4()),
+            owner_id=owner_id,
+            **_with_search_keys(obj_in_data),
+        )
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update(
+        self,
+        db: AsyncSession,
+        *,
+        db_obj: Trademark,
+        obj_in: Union[TrademarkUpdate, Dict[str, Any]]
+    ) -> Trademark:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        return await super().update(db, db_obj=db_obj, obj_in=_with_search_keys(update_data))
+
+    @replica_read
+    async def get_by_owner(
+        self, db: AsyncSession, *, owner_id: str, cursor: Optional[str] = None, limit: int = 100
+    ) -> List[Trademark]:
+        statement = (
+            select(self.model)
+            .filter(Trademark.owner_id == owner_id)
+        )
+        result = await db.execute(paginate(statement, self.model, cursor=cursor, limit=limit))
+        return list(result.scalars())
+
+    async def get_by_application_number(
+        self, db: AsyncSession, *, application_number: str
+    ) -> Optional[Trademark]:
+        result = await db.execute(
+            select(self.model).filter(Trademark.application_number == application_number)
+        )
+        return result.scalars().first()
+
+    async def get_by_registration_number(
+        self, db: AsyncSession, *, registration_number: str
+    ) -> Optional[Trademark]:
+        result = await db.execute(
+            select(self.model).filter(Trademark.registration_number == registration_number)
+        )
+        return result.scalars().first()
+
+    @replica_read
+    async def search_local(
+        self, db: AsyncSession, *, search_query: TrademarkSearchQuery, cursor: Optional[str] = None, limit: int = 100
+    ) -> Tuple[List[Trademark], Optional[str]]:
+        """Search local trademark database; returns a page and the next cursor"""
+        if search_query.query and search_query.mode == TrademarkSearchMode.TRIGRAM:
+            if db.bind.dialect.name != "postgresql":
+                return await db.run_sync(
+                    _search_trigram_in_process, search_query, cursor=cursor, limit=limit
+                )
+            await db.execute(_trigram_threshold(search_query))
+
+        statement = _search_statement(search_query, cursor=cursor, limit=limit)
+        if statement is None:
+            return [], None
+        result = await db.execute(statement)
+        return _search_page(result.all(), search_query, limit)
+
+    @replica_read
+    async def get_by_status(
+        self, db: AsyncSession, *, status: TrademarkStatus, cursor: Optional[str] = None, limit: int = 100
+    ) -> List[Trademark]:
+        statement = (
+            select(self.model)
+            .filter(Trademark.status == status)
+        )
+        result = await db.execute(paginate(statement, self.model, cursor=cursor, limit=limit))
+        return list(result.scalars())
+
+    @replica_read
+    async def get_by_jurisdiction(
+        self, db: AsyncSession, *, jurisdiction: str, cursor: Optional[str] = None, limit: int = 100
+    ) -> List[Trademark]:
+        statement = (
+            select(self.model)
+            .filter(Trademark.jurisdiction == jurisdiction)
+        )
+        result = await db.execute(paginate(statement, self.model, cursor=cursor, limit=limit))
+        return list(result.scalars())
+
+    @replica_read
+    async def get_expiring_soon(
+        self, db: AsyncSession, *, days: int = 90, cursor: Optional[str] = None, limit: int = 100
+    ) -> List[Trademark]:
+        """Get trademarks expiring within specified number of days"""
+        from datetime import datetime, timedelta
+        expiration_threshold = datetime.utcnow() + timedelta(days=days)
+
+        statement = (
+            select(self.model)
+            .filter(
+                and_(
+                    Trademark.expiration_date.is_not(None),
+                    Trademark.expiration_date <= expiration_threshold,
+                    Trademark.status == TrademarkStatus.REGISTERED
+                )
+            )
+        )
+        result = await db.execute(paginate(statement, self.model, cursor=cursor, limit=limit))
+        return list(result.scalars())
+
+    async def update_status(
+        self, db: AsyncSession, *, db_obj: Trademark, status: TrademarkStatus
+    ) -> Trademark:
+        db_obj.status = status
+        if status == TrademarkStatus.REGISTERED:
+            from datetime import datetime
+            db_obj.registration_date = datetime.utcnow()
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+
+trademark = CRUDTrademark(Trademark)
+async_trademark = AsyncCRUDTrademark(Trademark)
\ No newline at end of file
@@ -1,12 +1,15 @@
 from typing import Any, Dict, Optional, Union
 import uuid
 
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 
-from app.crud.base import CRUDBase
+from app.crud.base import AsyncCRUDBase, CRUDBase
 from app.models.user import User
 from app.schemas.user import UserCreate, UserUpdate
-from app.core.security import get_password_hash, verify_password
+from app.core.passwords import password_hasher
+from app.core.principal import principal_cache
 
 
 class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
@@ -17,7 +20,7 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         db_obj = User(
             id=str(uuid.uuid4()),
             email=obj_in.email,
-            hashed_password=get_password_hash(obj_in.password),
+            hashed_password=password_hasher.hash_sync(obj_in.password),
             full_name=obj_in.full_name,
             is_active=True,
             is_superuser=False,
@@ -35,17 +38,30 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         else:
             update_data = obj_in.dict(exclude_unset=True)
         if "password" in update_data:
-            hashed_password = get_password_hash(update_data["password"])
+            hashed_password = password_hasher.hash_sync(update_data["password"])
             del update_data["password"]
             update_data["hashed_password"] = hashed_password
-        return super().update(db, db_obj=db_obj, obj_in=update_data)
+        db_obj = super().update(db, db_obj=db_obj, obj_in=update_data)
+        principal_cache.invalidate(db_obj.id)
+        return db_obj
+
+    def deactivate(self, db: Session, *, db_obj: User) -> User:
+        return self.update(db, db_obj=db_obj, obj_in={"is_active": False})
+
+    def remove(self, db: Session, *, id: str) -> User:
+        db_obj = super().remove(db, id=id)
+        principal_cache.invalidate(id)
+        return db_obj
 
     def authenticate(self, db: Session, *, email: str, password: str) -> Optional[User]:
         user = self.get_by_email(db, email=email)
         if not user:
             return None
-        if not verify_password(password, user.hashed_password):
+        valid, new_hash = password_hasher.verify_and_update_sync(password, user.hashed_password)
+        if not valid:
             return None
+        if new_hash:
+            user = self.update(db, db_obj=user, obj_in={"hashed_password": new_hash})
         return user
 
     def is_active(self, user: User) -> bool:
@@ -55,4 +71,42 @@ class CRUDUser(CRUDBase[User, UserCreate, UserUpdate]):
         return user.is_superuser
 
 
+class AsyncCRUDUser(AsyncCRUDBase[User, UserCreate, UserUpdate]):
+    async def get_by_email(self, db: AsyncSession, *, email: str) -> Optional[User]:
+        result = await db.execute(select(User).filter(User.email == email))
+        return result.scalars().first()
+
+    async def update(
+        self, db: AsyncSession, *, db_obj: User, obj_in: Union[UserUpdate, Dict[str, Any]]
+    ) -> User:
+        if isinstance(obj_in, dict):
+            update_data = obj_in
+        else:
+            update_data = obj_in.model_dump(exclude_unset=True)
+        if "password" in update_data:
+            hashed_password = await password_hasher.hash(update_data["password"])
+            del update_data["password"]
+            update_data["hashed_password"] = hashed_password
+        db_obj = await super().update(db, db_obj=db_obj, obj_in=update_data)
+        principal_cache.invalidate(db_obj.id)
+        return db_obj
+
+    async def remove(self, db: AsyncSession, *, id: str) -> User:
+        db_obj = await super().remove(db, id=id)
+        principal_cache.invalidate(id)
+        return db_obj
+
+    async def authenticate(self, db: AsyncSession, *, email: str, password: str) -> Optional[User]:
+        user = await self.get_by_email(db, email=email)
+        if not user:
+            return None
+        valid, new_hash = await password_hasher.verify_and_update(password, user.hashed_password)
+        if not valid:
+            return None
+        if new_hash:
+            user = await self.update(db, db_obj=user, obj_in={"hashed_password": new_hash})
+        return user
+
+
 user = CRUDUser(User)
+async_user = AsyncCRUDUser(User)
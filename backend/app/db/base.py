@@ -2,6 +2,6 @@
 # imported by Alembic
 from app.db.base_class import Base  # noqa
 from app.models.user import User  # noqa
-from app.models.trademark import Trademark  # noqa
-from app.models.payment import Payment  # noqa
+from app.models.trademark import Trademark, TrademarkSearchProjection  # noqa
+from app.models.payment import Payment, StripeEvent  # noqa
 from app.models.document import Document  # noqa
\ No newline at end of file
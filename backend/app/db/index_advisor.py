@@ -0,0 +1,166 @@
+"""
+Report which CRUDTrademark queries cannot be answered by an index.
+
+Runs every read query of crud.trademark inside a transaction that is rolled
+back, captures the SQL it sends and EXPLAINs it. By default sequential scans
+are disabled for the EXPLAIN, so a development database with a handful of
+rows still shows whether an index *can* serve the query; a plan that keeps a
+Seq Scan then has no usable index. A query that sends no SELECT at all (for
+instance one returning an unexecuted Query) is reported as such.
+
+    python -m app.db.index_advisor [--allow-seqscan]
+"""
+from typing import Any, Callable, Dict, Iterator, List, Tuple
+from contextlib import contextmanager
+from datetime import datetime, timezone
+import argparse
+import json
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.crud.pagination import encode_cursor
+from app.db.session import SessionLocal
+from app.models.trademark import TrademarkStatus
+from app.schemas.trademark import NiceClassMatch, TrademarkSearchMode, TrademarkSearchQuery
+
+SAMPLE_OWNER_ID = "index-advisor"
+SAMPLE_CURSOR = encode_cursor(datetime(2000, 1, 1, tzinfo=timezone.utc), "x")
+
+# Every read query of CRUDTrademark, with representative arguments
+QUERIES: Dict[str, Callable[[Session], Any]] = {
+    "get": lambda db: crud.trademark.get(db, id="x"),
+    "get_multi": lambda db: crud.trademark.get_multi(db, cursor=SAMPLE_CURSOR),
+    "get_by_owner": lambda db: crud.trademark.get_by_owner(db, owner_id=SAMPLE_OWNER_ID),
+    "get_by_application_number": lambda db: crud.trademark.get_by_application_number(
+        db, application_number="x"
+    ),
+    "get_by_registration_number": lambda db: crud.trademark.get_by_registration_number(
+        db, registration_number="x"
+    ),
+    "get_by_status": lambda db: crud.trademark.get_by_status(db, status=TrademarkStatus.REGISTERED),
+    "get_by_jurisdiction": lambda db: crud.trademark.get_by_jurisdiction(db, jurisdiction="GR"),
+    "get_expiring_soon": lambda db: crud.trademark.get_expiring_soon(db),
+    "search_local[substring]": lambda db: crud.trademark.search_local(
+        db, search_query=TrademarkSearchQuery(query="nike")
+    ),
+    "search_local[trigram]": lambda db: crud.trademark.search_local(
+        db, search_query=TrademarkSearchQuery(query="nike", mode=TrademarkSearchMode.TRIGRAM)
+    ),
+    "search_local[phonetic]": lambda db: crud.trademark.search_local(
+        db, search_query=TrademarkSearchQuery(query="nike", mode=TrademarkSearchMode.PHONETIC)
+    ),
+    "search_local[classes any]": lambda db: crud.trademark.search_local(
+        db, search_query=TrademarkSearchQuery(query="", nice_classes=[9, 42])
+    ),
+    "search_local[classes all]": lambda db: crud.trademark.search_local(
+        db,
+        search_query=TrademarkSearchQuery(
+            query="", nice_classes=[9, 42], nice_class_match=NiceClassMatch.ALL
+        ),
+    ),
+    "search_local[projection]": lambda db: crud.trademark.search_local(
+        db, search_query=TrademarkSearchQuery(query="nike", jurisdiction="GR", nice_classes=[9, 42])
+    ),
+}
+
+
+@contextmanager
+def _captured_statements(db: Session) -> Iterator[List[Tuple[str, Any]]]:
+    statements: List[Tuple[str, Any]] = []
+    connection = db.connection()
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(connection, "before_cursor_execute", capture)
+    try:
+        yield statements
+    finally:
+        event.remove(connection, "before_cursor_execute", capture)
+
+
+def _seq_scans(plan: Dict[str, Any]) -> List[str]:
+    """Relations read by a Seq Scan anywhere in the plan tree"""
+    scans = []
+    if plan.get("Node Type") == "Seq Scan":
+        scans.append(plan.get("Relation Name", "?"))
+    for child in plan.get("Plans", []):
+        scans.extend(_seq_scans(child))
+    return scans
+
+
+def explain(db: Session, statement: str, parameters: Any) -> Dict[str, Any]:
+    result = db.connection().exec_driver_sql(f"EXPLAIN (FORMAT JSON) {statement}", parameters)
+    plan = result.scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return plan[0]["Plan"]
+
+
+def advise(db: Session, allow_seqscan: bool = False) -> List[Dict[str, Any]]:
+    """
+    EXPLAIN every query in QUERIES and list the sequential scans of each; a
+    query that ran no SQL gets one entry with `statement` None
+    """
+    if db.get_bind().dialect.name != "postgresql":
+        raise RuntimeError("The index advisor needs PostgreSQL")
+
+    report = []
+    try:
+        if not allow_seqscan:
+            db.connection().exec_driver_sql("SET LOCAL enable_seqscan = off")
+        for name, query in QUERIES.items():
+            with _captured_statements(db) as statements:
+                query(db)
+            statements = [(s, p) for s, p in statements if "set_config" not in s]
+            if not statements:
+                report.append({"query": name, "seq_scans": [], "total_cost": None, "statement": None})
+            for statement, parameters in statements:
+                plan = explain(db, statement, parameters)
+                report.append({
+                    "query": name,
+                    "seq_scans": _seq_scans(plan),
+                    "total_cost": plan.get("Total Cost"),
+                    "statement": " ".join(statement.split()),
+                })
+    finally:
+        db.rollback()
+    return report
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--allow-seqscan",
+        action="store_true",
+        help="Explain with the planner's real choice instead of disabling sequential scans",
+    )
+    parser.add_argument("--verbose", action="store_true", help="Print the SQL of every query")
+    args = parser.parse_args()
+
+    # The primary only, where the captured statements are explained
+    db = SessionLocal(replicas=None)
+    try:
+        report = advise(db, allow_seqscan=args.allow_seqscan)
+    finally:
+        db.close()
+
+    for entry in report:
+        if entry["statement"] is None:
+            verdict = "NO SQL (query never executed)"
+        elif entry["seq_scans"]:
+            verdict = "SEQ SCAN on " + ", ".join(entry["seq_scans"])
+        else:
+            verdict = "indexed"
+        print(f"{entry['query']:<32} {verdict:<40} cost={entry['total_cost']}")
+        if args.verbose:
+            print(f"    {entry['statement']}")
+    if any(entry["seq_scans"] or entry["statement"] is None for entry in report):
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+from typing import Any, Dict, Type
+import threading
+import time
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.pool import Pool
+
+
+class PoolMetrics:
+    """
+    Checkout counters of one connection pool: how long requests waited for a
+    connection, how long they held it, and how many gave up after the pool
+    timeout.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self.pool: Any = None
+        self.checkouts = 0
+        self.timeouts = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.hold_total = 0.0
+        self.hold_max = 0.0
+        self.checkins = 0
+
+    def record_wait(self, elapsed: float, timed_out: bool) -> None:
+        with self._lock:
+            if timed_out:
+                self.timeouts += 1
+                return
+            self.checkouts += 1
+            self.wait_total += elapsed
+            self.wait_max = max(self.wait_max, elapsed)
+
+    def record_hold(self, elapsed: float) -> None:
+        with self._lock:
+            self.checkins += 1
+            self.hold_total += elapsed
+            self.hold_max = max(self.hold_max, elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats: Dict[str, Any] = {
+                "checkouts": self.checkouts,
+                "timeouts": self.timeouts,
+                "wait_ms_avg": round(1000 * self.wait_total / self.checkouts, 2) if self.checkouts else 0.0,
+                "wait_ms_max": round(1000 * self.wait_max, 2),
+                "hold_ms_avg": round(1000 * self.hold_total / self.checkins, 2) if self.checkins else 0.0,
+                "hold_ms_max": round(1000 * self.hold_max, 2),
+            }
+        pool = self.pool
+        if pool is not None and hasattr(pool, "checkedout"):
+            stats.update(size=pool.size(), checked_out=pool.checkedout(), overflow=pool.overflow())
+        return stats
+
+
+def timed_pool_class(pool_class: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """
+    Subclass of `pool_class` timing every checkout into `metrics`. The
+    subclass survives Engine.dispose(), which recreates the pool from its class.
+    """
+
+    def connect(self: Pool) -> Any:
+        metrics.pool = self
+        started = time.perf_counter()
+        try:
+            connection = pool_class.connect(self)
+        except PoolTimeoutError:
+            metrics.record_wait(time.perf_counter() - started, timed_out=True)
+            raise
+        metrics.record_wait(time.perf_counter() - started, timed_out=False)
+        return connection
+
+    return type(f"Timed{pool_class.__name__}", (pool_class,), {"connect": connect})
+
+
+def track_hold_time(engine: Engine, metrics: PoolMetrics) -> None:
+    """Record how long each checked out connection is kept"""
+
+    @event.listens_for(engine, "checkout")
+    def on_checkout(dbapi_connection, connection_record, connection_proxy) -> None:
+        connection_record.info["checked_out_at"] = time.perf_counter()
+
+    @event.listens_for(engine, "checkin")
+    def on_checkin(dbapi_connection, connection_record) -> None:
+        checked_out_at = connection_record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            metrics.record_hold(time.perf_counter() - checked_out_at)
+
+
+# Metrics of the engines in app.db.session, by engine
+pool_metrics: Dict[str, PoolMetrics] = {
+    "sync": PoolMetrics(),
+    "async": PoolMetrics(),
+}
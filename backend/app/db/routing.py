@@ -0,0 +1,155 @@
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+from contextlib import contextmanager
+import functools
+import inspect
+import itertools
+import logging
+import threading
+import time
+
+from sqlalchemy import event, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import ORMExecuteState, Session
+
+logger = logging.getLogger(__name__)
+
+Method = TypeVar("Method", bound=Callable[..., Any])
+
+# Seconds a PostgreSQL standby is behind its primary; 0 on the primary itself
+_LAG_QUERY = text(
+    "SELECT CASE WHEN pg_is_in_recovery() "
+    "THEN COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+    "ELSE 0 END"
+)
+
+
+class ReplicaSet:
+    """
+    Read replicas of one primary, used in turn.
+
+    A replica whose replication lag exceeds `max_lag` seconds, or whose lag
+    cannot be measured, is skipped until its next check, `check_interval`
+    seconds later. With no usable replica, reads go to the primary.
+    """
+
+    def __init__(self, engines: List[Engine], max_lag: float, check_interval: float) -> None:
+        self.engines = engines
+        self.max_lag = max_lag
+        self.check_interval = check_interval
+        self._turn = itertools.cycle(range(len(engines))) if engines else None
+        self._lags: Dict[int, float] = {}
+        self._checked_at: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def lag(self, engine: Engine) -> float:
+        """Replication lag of a replica in seconds"""
+        if engine.dialect.name != "postgresql":
+            return 0.0
+        with engine.connect() as connection:
+            return float(connection.execute(_LAG_QUERY).scalar() or 0.0)
+
+    def _current_lag(self, index: int) -> float:
+        now = time.monotonic()
+        with self._lock:
+            if now - self._checked_at.get(index, float("-inf")) < self.check_interval:
+                return self._lags[index]
+            # Claim the check so concurrent sessions keep using the last value
+            self._checked_at[index] = now
+            self._lags.setdefault(index, 0.0)
+        try:
+            lag = self.lag(self.engines[index])
+        except Exception as e:
+            logger.warning("Replica %s is unreachable: %s", index, e)
+            lag = float("inf")
+        with self._lock:
+            self._lags[index] = lag
+        return lag
+
+    def choose(self) -> Optional[Engine]:
+        if self._turn is None:
+            return None
+        for _ in range(len(self.engines)):
+            with self._lock:
+                index = next(self._turn)
+            if self._current_lag(index) <= self.max_lag:
+                return self.engines[index]
+        return None
+
+    def status(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            return [
+                {"replica": index, "lag": self._lags.get(index), "usable": self._lags.get(index, 0.0) <= self.max_lag}
+                for index in range(len(self.engines))
+            ]
+
+
+class RoutingSession(Session):
+    """
+    Session sending the reads of read_only blocks to a replica and everything
+    else to the primary.
+
+    The replica is chosen once and kept for the life of the session, so
+    transaction-local settings (e.g. the pg_trgm threshold) apply to the
+    queries that follow them. Once the session has written, it reads from the
+    primary too, so a request always sees its own writes.
+    """
+
+    def __init__(self, *, replicas: Optional[ReplicaSet] = None, **kwargs: Any) -> None:
+        super().__init__(**kwargs)
+        self.replicas = replicas
+        self._replica: Optional[Engine] = None
+        self._replica_chosen = False
+
+    def get_bind(self, mapper: Any = None, clause: Any = None, **kwargs: Any) -> Any:
+        if (
+            self.replicas is not None
+            and self.info.get("read_only")
+            and not self.info.get("wrote")
+            and not self._flushing
+        ):
+            if not self._replica_chosen:
+                self._replica = self.replicas.choose()
+                self._replica_chosen = True
+            if self._replica is not None:
+                return self._replica
+        return super().get_bind(mapper=mapper, clause=clause, **kwargs)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _wrote_on_flush(session: Session, flush_context: Any) -> None:
+    session.info["wrote"] = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _wrote_on_execute(orm_execute_state: ORMExecuteState) -> None:
+    if not orm_execute_state.is_select:
+        orm_execute_state.session.info["wrote"] = True
+
+
+@contextmanager
+def read_only(db: Any) -> Iterator[None]:
+    """Let the queries of the block go to a replica"""
+    previous = db.info.get("read_only", False)
+    db.info["read_only"] = True
+    try:
+        yield
+    finally:
+        db.info["read_only"] = previous
+
+
+def replica_read(method: Method) -> Method:
+    """Run a CRUD method taking the session as first argument in read_only"""
+    if inspect.iscoroutinefunction(method):
+        @functools.wraps(method)
+        async def async_wrapper(self: Any, db: Any, *args: Any, **kwargs: Any) -> Any:
+            with read_only(db):
+                return await method(self, db, *args, **kwargs)
+
+        return async_wrapper  # type: ignore[return-value]
+
+    @functools.wraps(method)
+    def wrapper(self: Any, db: Any, *args: Any, **kwargs: Any) -> Any:
+        with read_only(db):
+            return method(self, db, *args, **kwargs)
+
+    return wrapper  # type: ignore[return-value]
@@ -1,11 +1,99 @@
+from typing import Any, Callable, List, Optional
+
 from sqlalchemy import create_engine
+from sqlalchemy.engine import Engine
+from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, QueuePool
 
 from app.core.config import settings
+from app.db.pool_metrics import PoolMetrics, pool_metrics, timed_pool_class, track_hold_time
+from app.db.routing import ReplicaSet, RoutingSession
+
+_pool_settings = dict(
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_pre_ping=settings.DB_POOL_PRE_PING,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+)
+
+
+def _create_engine(uri: str, metrics: PoolMetrics) -> Engine:
+    engine = create_engine(uri, poolclass=timed_pool_class(QueuePool, metrics), **_pool_settings)
+    track_hold_time(engine, metrics)
+    return engine
+
+
+def _create_async_engine(uri: str, metrics: PoolMetrics) -> AsyncEngine:
+    engine = create_async_engine(
+        uri, poolclass=timed_pool_class(AsyncAdaptedQueuePool, metrics), **_pool_settings
+    )
+    track_hold_time(engine.sync_engine, metrics)
+    return engine
+
+
+def _replica_set(engines: List[Engine]) -> ReplicaSet:
+    return ReplicaSet(
+        engines,
+        max_lag=settings.DB_REPLICA_MAX_LAG,
+        check_interval=settings.DB_REPLICA_LAG_CHECK_INTERVAL,
+    )
+
+
+engine = _create_engine(str(settings.SQLALCHEMY_DATABASE_URI), pool_metrics["sync"])
+replica_engines = [
+    _create_engine(uri, pool_metrics.setdefault(f"sync_replica_{index}", PoolMetrics()))
+    for index, uri in enumerate(settings.SQLALCHEMY_REPLICA_URIS)
+]
+# Reads inside app.db.routing.read_only go to a replica when one is configured
+replicas = _replica_set(replica_engines)
+SessionLocal = sessionmaker(
+    class_=RoutingSession, replicas=replicas, autocommit=False, autoflush=False, bind=engine
+)
+
+# Async engine for the async endpoints, so queries never block the event loop.
+# Objects stay usable after commit, as there is no lazy loading on AsyncSession.
+async_engine = _create_async_engine(settings.ASYNC_SQLALCHEMY_DATABASE_URI, pool_metrics["async"])
+async_replica_engines = [
+    _create_async_engine(uri, pool_metrics.setdefault(f"async_replica_{index}", PoolMetrics()))
+    for index, uri in enumerate(settings.ASYNC_SQLALCHEMY_REPLICA_URIS)
+]
+async_replicas = _replica_set([replica.sync_engine for replica in async_replica_engines])
+AsyncSessionLocal = async_sessionmaker(
+    async_engine,
+    sync_session_class=RoutingSession,
+    replicas=async_replicas,
+    autoflush=False,
+    expire_on_commit=False,
+)
+
+
+class LazySession:
+    """
+    Stands in for a Session that is only created on first use, so a request
+    that never queries never touches the pool. Like any Session, it checks
+    out a connection at its first statement and returns it on close().
+    """
+
+    def __init__(self, factory: Callable[[], Session] = SessionLocal) -> None:
+        self._factory = factory
+        self._session: Optional[Session] = None
+
+    @property
+    def started(self) -> bool:
+        return self._session is not None
+
+    def __getattr__(self, name: str) -> Any:
+        if self._session is None:
+            self._session = self._factory()
+        return getattr(self._session, name)
 
-engine = create_engine(str(settings.SQLALCHEMY_DATABASE_URI))
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    def close(self) -> None:
+        if self._session is not None:
+            self._session.close()
+            self._session = None
 
 Base = declarative_base()
 
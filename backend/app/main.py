@@ -1,8 +1,33 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.api.api import api_router
 from app.core.config import settings
+from app.core.http_client import http_clients
+from app.core.passwords import password_hasher
+from app.services.image_service import thumbnailer
+from app.services.payment_gateway import payment_gateway
+from app.services.stripe_webhook_service import payment_events
+from app.db.session import async_engine
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # One pooled HTTP client per external API for the lifetime of the app
+    http_clients.start()
+    app.state.http_clients = http_clients
+    payment_events.start()
+    thumbnailer.start()
+    yield
+    await payment_events.stop()
+    await http_clients.aclose()
+    await async_engine.dispose()
+    password_hasher.shutdown()
+    payment_gateway.shutdown()
+    thumbnailer.shutdown()
+
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
@@ -11,6 +36,7 @@ app = FastAPI(
     openapi_url=f"{settings.API_V1_STR}/openapi.json",
     docs_url="/docs",
     redoc_url="/redoc",
+    lifespan=lifespan,
 )
 
 # Set up CORS
@@ -20,6 +46,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor"],
 )
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
@@ -1,4 +1,4 @@
 from .user import User
-from .trademark import Trademark
-from .payment import Payment
+from .trademark import Trademark, TrademarkSearchProjection
+from .payment import Payment, StripeEvent
 from .document import Document
\ No newline at end of file
@@ -13,6 +13,7 @@ class DocumentType(str, enum.Enum):
     RESPONSE = "response"
     RENEWAL = "renewal"
     ASSIGNMENT = "assignment"
+    IMAGE = "image"
     OTHER = "other"
 
 
@@ -27,6 +28,7 @@ class Document(Base):
     file_name = Column(String, nullable=False)
     file_size = Column(String)
     file_type = Column(String)
+    content_hash = Column(String(64), index=True)  # SHA-256 of the content, its address in the document store
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Float, Enum, Text
+from sqlalchemy import Column, String, DateTime, ForeignKey, Float, Enum, Text, Index, Integer
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -21,19 +21,36 @@ class PaymentType(str, enum.Enum):
 
 
 class Payment(Base):
+    __table_args__ = (
+        # Keyset pagination, newest first, overall and per user
+        Index("ix_payment_created_at_id", "created_at", "id"),
+        Index("ix_payment_user_id_created_at_id", "user_id", "created_at", "id"),
+    )
+
     id = Column(String, primary_key=True, index=True)
     user_id = Column(String, ForeignKey("user.id"), nullable=False)
-    trademark_id = Column(String, ForeignKey("trademark.id"), nullable=False)
+    trademark_id = Column(String, ForeignKey("trademark.id"), nullable=False, index=True)
     amount = Column(Float, nullable=False)
     currency = Column(String, default="USD")
     status = Column(Enum(PaymentStatus), default=PaymentStatus.PENDING)
     type = Column(Enum(PaymentType), nullable=False)
-    stripe_payment_intent_id = Column(String)
+    stripe_payment_intent_id = Column(String, index=True)
     stripe_payment_method_id = Column(String)
+    # Creation time (Unix) of the last webhook event applied to the status
+    stripe_event_created = Column(Integer)
     description = Column(Text)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
     updated_at = Column(DateTime(timezone=True), onupdate=func.now())
     
     # Relationships
     user = relationship("User", back_populates="payments")
-    trademark = relationship("Trademark", back_populates="payments")
\ No newline at end of file
+    trademark = relationship("Trademark", back_populates="payments")
+
+
+class StripeEvent(Base):
+    """Stripe webhook events already applied, so a redelivery is ignored"""
+    __tablename__ = "stripe_event"
+
+    id = Column(String, primary_key=True)  # Stripe event id, evt_...
+    type = Column(String, nullable=False)
+    processed_at = Column(DateTime(timezone=True), server_default=func.now())
\ No newline at end of file
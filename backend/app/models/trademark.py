@@ -1,4 +1,5 @@
-from sqlalchemy import Column, String, DateTime, ForeignKey, Text, Enum, JSON
+from sqlalchemy import BigInteger, Column, String, DateTime, ForeignKey, Text, Enum, JSON, Index, text
+from sqlalchemy.dialects.postgresql import JSONB
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 import enum
@@ -28,18 +29,48 @@ class TrademarkType(str, enum.Enum):
 
 
 class Trademark(Base):
+    __table_args__ = (
+        # Serves fuzzy name search (`name % :query`); requires pg_trgm
+        Index(
+            "ix_trademark_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        # Serves Nice class containment (`@>`) and jsonpath (`@?`) filters
+        Index(
+            "ix_trademark_nice_classes",
+            "nice_classes",
+            postgresql_using="gin",
+            postgresql_ops={"nice_classes": "jsonb_path_ops"},
+        ),
+        # Keyset pagination, newest first, overall and per listing filter
+        Index("ix_trademark_created_at_id", "created_at", "id"),
+        Index("ix_trademark_owner_id_created_at_id", "owner_id", "created_at", "id"),
+        Index("ix_trademark_status_created_at_id", "status", "created_at", "id"),
+        Index("ix_trademark_jurisdiction_created_at_id", "jurisdiction", "created_at", "id"),
+        # Serves get_expiring_soon; only registered marks can expire
+        Index(
+            "ix_trademark_expiration_date_registered",
+            "expiration_date",
+            postgresql_where=text("status = 'REGISTERED' AND expiration_date IS NOT NULL"),
+        ),
+    )
+
     id = Column(String, primary_key=True, index=True)
     name = Column(String, index=True, nullable=False)
+    phonetic_key = Column(String, index=True)  # Transliterated Metaphone key of name
     description = Column(Text)
     type = Column(Enum(TrademarkType), nullable=False)
     status = Column(Enum(TrademarkStatus), default=TrademarkStatus.DRAFT)
     owner_id = Column(String, ForeignKey("user.id"), nullable=False)
-    application_number = Column(String, index=True)
+    application_number = Column(String, index=True, unique=True)  # Key of idempotent imports
     registration_number = Column(String, index=True)
     filing_date = Column(DateTime(timezone=True))
     registration_date = Column(DateTime(timezone=True))
     expiration_date = Column(DateTime(timezone=True))
-    nice_classes = Column(JSON)  # Store selected Nice classification classes
+    nice_classes = Column(JSON().with_variant(JSONB, "postgresql"))  # Store selected Nice classification classes
+    nice_class_mask = Column(BigInteger, nullable=False, default=0, server_default=text("0"))  # Bit n - 1 set for class n
     goods_services = Column(Text)  # Description of goods and services
     jurisdiction = Column(String, nullable=False)  # Country or region code
     image_url = Column(String)  # For figurative marks
@@ -49,4 +80,31 @@ class Trademark(Base):
     # Relationships
     owner = relationship("User", back_populates="trademarks")
     payments = relationship("Payment", back_populates="trademark")
-    documents = relationship("Document", back_populates="trademark")
\ No newline at end of file
+    documents = relationship("Document", back_populates="trademark")
+
+
+class TrademarkSearchProjection(Base):
+    """
+    Denormalized search keys of a trademark, one row per trademark, kept up
+    to date by app.crud.search_projection. Narrow rows in jurisdiction and
+    creation order let a jurisdiction search test the class mask of each
+    candidate from the index alone.
+    """
+    __tablename__ = "trademark_search_projection"
+    __table_args__ = (
+        Index(
+            "ix_trademark_search_projection_jurisdiction_created_at_id",
+            "jurisdiction",
+            "created_at",
+            "id",
+            postgresql_include=["nice_class_mask"],
+        ),
+    )
+
+    id = Column(String, ForeignKey("trademark.id", ondelete="CASCADE"), primary_key=True)
+    phonetic_key = Column(String, index=True)
+    nice_class_mask = Column(BigInteger, nullable=False, default=0)
+    jurisdiction = Column(String, nullable=False)
+    status = Column(Enum(TrademarkStatus))
+    type = Column(Enum(TrademarkType), nullable=False)
+    created_at = Column(DateTime(timezone=True))
@@ -1,4 +1,4 @@
-from sqlalchemy import Boolean, Column, String, DateTime
+from sqlalchemy import Boolean, Column, String, DateTime, Index
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 
@@ -6,6 +6,11 @@ from app.db.base_class import Base
 
 
 class User(Base):
+    __table_args__ = (
+        # Keyset pagination, newest first
+        Index("ix_user_created_at_id", "created_at", "id"),
+    )
+
     id = Column(String, primary_key=True, index=True)
     email = Column(String, unique=True, index=True, nullable=False)
     hashed_password = Column(String, nullable=False)
@@ -1,3 +1,5 @@
 from .user import User, UserCreate, UserUpdate, UserInDB
 from .token import Token, TokenPayload
-from .trademark import Trademark, TrademarkCreate, TrademarkUpdate, TrademarkSearchQuery, TrademarkSearchResult, TrademarkSearchResponse
\ No newline at end of file
+from .payment import Payment, PaymentCreate, PaymentUpdate, PaymentInDB, PaymentIntentCreate, PaymentIntentResponse, PaymentConfirm, PaymentWebhookEvent
+from .document import Document, DocumentCreate, DocumentUpdate, DocumentInDB
+from .trademark import Trademark, TrademarkCreate, TrademarkUpdate, PortfolioFormat, TrademarkImport, TrademarkImportError, TrademarkImportResult, NiceClassMatch, TrademarkSearchMode, TrademarkSearchQuery, TrademarkSearchResult, TrademarkSearchResponse, FederatedSearchResponse, SearchSourceStatus
\ No newline at end of file
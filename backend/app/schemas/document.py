@@ -0,0 +1,50 @@
+from typing import Optional
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.document import DocumentType
+
+
+class DocumentBase(BaseModel):
+    type: DocumentType
+    title: str
+    description: Optional[str] = None
+    trademark_id: Optional[str] = None
+
+
+class DocumentCreate(DocumentBase):
+    user_id: str
+    file_path: str
+    file_name: str
+    file_size: Optional[str] = None
+    file_type: Optional[str] = None
+    content_hash: Optional[str] = None
+
+
+class DocumentUpdate(BaseModel):
+    type: Optional[DocumentType] = None
+    title: Optional[str] = None
+    description: Optional[str] = None
+    trademark_id: Optional[str] = None
+
+
+class DocumentInDBBase(DocumentBase):
+    id: str
+    user_id: str
+    file_name: str
+    file_size: Optional[str] = None
+    file_type: Optional[str] = None
+    content_hash: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class Document(DocumentInDBBase):
+    pass
+
+
+class DocumentInDB(DocumentInDBBase):
+    file_path: str
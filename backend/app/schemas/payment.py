@@ -0,0 +1,72 @@
+from typing import Optional
+from datetime import datetime
+
+from pydantic import BaseModel, ConfigDict
+
+from app.models.payment import PaymentStatus, PaymentType
+
+
+class PaymentBase(BaseModel):
+    amount: float
+    currency: str = "usd"
+    type: PaymentType
+    description: Optional[str] = None
+
+
+class PaymentCreate(PaymentBase):
+    user_id: str
+    trademark_id: str
+    stripe_payment_intent_id: Optional[str] = None
+
+
+class PaymentUpdate(BaseModel):
+    status: Optional[PaymentStatus] = None
+    stripe_payment_method_id: Optional[str] = None
+    description: Optional[str] = None
+
+
+class PaymentInDBBase(PaymentBase):
+    id: str
+    user_id: str
+    trademark_id: str
+    status: PaymentStatus
+    stripe_payment_intent_id: Optional[str] = None
+    stripe_payment_method_id: Optional[str] = None
+    created_at: datetime
+    updated_at: Optional[datetime] = None
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class Payment(PaymentInDBBase):
+    pass
+
+
+class PaymentInDB(PaymentInDBBase):
+    pass
+
+
+# Stripe payment flow
+class PaymentIntentCreate(BaseModel):
+    trademark_id: str
+    amount: float
+    currency: str = "usd"
+    type: PaymentType
+    description: Optional[str] = None
+
+
+class PaymentIntentResponse(BaseModel):
+    client_secret: str
+    payment_id: str
+
+
+class PaymentConfirm(BaseModel):
+    payment_method_id: str
+
+
+class PaymentWebhookEvent(BaseModel):
+    """The parts of a verified Stripe event the payment worker needs"""
+    id: str
+    type: str
+    created: int  # Unix time at Stripe
+    payment_intent_id: Optional[str] = None
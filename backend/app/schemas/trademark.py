@@ -1,8 +1,14 @@
-from typing import Optional, List
+from typing import Annotated, Optional, List
 from datetime import datetime
-from pydantic import BaseModel
+import enum
+
+from pydantic import BaseModel, Field
 
 from app.models.trademark import TrademarkStatus, TrademarkType
+from app.services.nice_class_service import NICE_CLASS_COUNT
+
+# A Nice class a search can filter on; others have no bit in the class mask
+NiceClass = Annotated[int, Field(ge=1, le=NICE_CLASS_COUNT)]
 
 
 class TrademarkBase(BaseModel):
@@ -54,13 +60,56 @@ class TrademarkInDB(TrademarkInDBBase):
     pass
 
 
+# Bulk import related schemas
+class TrademarkImport(TrademarkCreate):
+    """One imported trademark; an existing one with the same application number is updated"""
+    status: TrademarkStatus = TrademarkStatus.DRAFT
+    application_number: Optional[str] = None
+    registration_number: Optional[str] = None
+    filing_date: Optional[datetime] = None
+    registration_date: Optional[datetime] = None
+    expiration_date: Optional[datetime] = None
+
+
+class TrademarkImportError(BaseModel):
+    row: int  # Line number in the uploaded file
+    errors: List[str]
+
+
+class TrademarkImportResult(BaseModel):
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    errors: List[TrademarkImportError] = []  # The first IMPORT_MAX_ERRORS failures
+
+
 # Search related schemas
+class TrademarkSearchMode(str, enum.Enum):
+    SUBSTRING = "substring"  # Case-insensitive partial match
+    TRIGRAM = "trigram"  # pg_trgm similarity, ranked best first
+    PHONETIC = "phonetic"  # Same phonetic key, across Greek and Latin scripts
+
+
+class NiceClassMatch(str, enum.Enum):
+    ANY = "any"  # Shares at least one of the requested classes
+    ALL = "all"  # Covers every requested class
+
+
+class PortfolioFormat(str, enum.Enum):
+    """File format of a trademark export or import"""
+    NDJSON = "ndjson"
+    CSV = "csv"
+
+
 class TrademarkSearchQuery(BaseModel):
     query: str
     jurisdiction: Optional[str] = None
-    nice_classes: Optional[List[int]] = None
+    nice_classes: Optional[List[NiceClass]] = None
+    nice_class_match: NiceClassMatch = NiceClassMatch.ANY
     trademark_type: Optional[TrademarkType] = None
     status: Optional[TrademarkStatus] = None
+    mode: TrademarkSearchMode = TrademarkSearchMode.SUBSTRING
+    similarity_threshold: Optional[float] = None  # Trigram mode only
 
 
 class TrademarkSearchResult(BaseModel):
@@ -78,11 +127,33 @@ class TrademarkSearchResult(BaseModel):
     registration_date: Optional[datetime] = None
     similarity_score: Optional[float] = None  # For search relevance
     source: str  # e.g., "TMview", "EUIPO", "Local"
+    also_reported_by: Optional[List[str]] = None  # Other sources holding the same mark
+    nice_class_mask: Optional[int] = Field(default=None, exclude=True)  # Set by the adapters, not returned
     
 
+class SearchSourceState(str, enum.Enum):
+    OK = "ok"
+    TIMEOUT = "timeout"  # Did not answer in time, results are partial
+    UNAVAILABLE = "unavailable"  # Not called: circuit open or rate limited
+    ERROR = "error"
+
+
+class SearchSourceStatus(BaseModel):
+    source: str  # e.g., "tmview", "euipo", "local"
+    status: SearchSourceState
+    elapsed_ms: float
+    total_results: int = 0
+    error: Optional[str] = None
+
+
 class TrademarkSearchResponse(BaseModel):
     results: List[TrademarkSearchResult]
     total_results: int
     query: str
     jurisdiction: Optional[str] = None
-    nice_classes: Optional[List[int]] = None
\ No newline at end of file
+    nice_classes: Optional[List[int]] = None
+
+
+class FederatedSearchResponse(TrademarkSearchResponse):
+    sources: List[SearchSourceStatus]
+    partial: bool = False  # True when a source timed out or failed
\ No newline at end of file
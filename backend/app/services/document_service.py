@@ -1,17 +1,22 @@
-from typing import Dict, List, Optional, Any, BinaryIO
+from typing import Dict, List, Optional, Any, BinaryIO, Union
+import asyncio
 import io
 import json
 from datetime import datetime
-import os
 from pathlib import Path
-import tempfile
+
+from sqlalchemy.ext.asyncio import AsyncSession
 
 # Placeholder for actual PDF generation library
 # In a real implementation, this would use a library like ReportLab, WeasyPrint, or PyPDF2
 # from reportlab.pdfgen import canvas
 # from reportlab.lib.pagesizes import letter
 
+from app import crud
+from app.core.blob_store import document_store
 from app.core.config import settings
+from app.models.document import DocumentType
+from app.schemas.document import DocumentCreate
 
 
 async def generate_application_summary(
@@ -327,65 +332,108 @@ async def generate_application_form(
 
 
 async def store_document(
-    document: bytes,
+    db: AsyncSession,
+    content: Union[bytes, BinaryIO],
     filename: str,
-    document_type: str,
-    metadata: Optional[Dict[str, Any]] = None
+    document_type: DocumentType,
+    user_id: str,
+    title: Optional[str] = None,
+    trademark_id: Optional[str] = None,
+    description: Optional[str] = None,
+    file_type: Optional[str] = None
 ) -> Dict[str, Any]:
     """
     Store a document in the document storage system.
     
+    The content is streamed into the content-addressed store in chunks while
+    it is hashed, so identical uploads share one blob; every upload gets its
+    own Document record.
+    
     Args:
-        document: The document content as bytes
+        db: Database session the Document record is written with
+        content: The document content, as bytes or a binary file object
         filename: The filename
         document_type: The type of document
-        metadata: Additional metadata
+        user_id: The ID of the user the document belongs to
+        title: The document title, the filename by default
+        trademark_id: The ID of the trademark the document concerns
+        description: A description of the document
+        file_type: The MIME type of the document
     
     Returns:
         Dictionary with document details
     """
-    # This is a placeholder implementation
-    # In a real implementation, this would store the document in a file system, S3, or database
-    
-    # Create a unique document ID
-    document_id = f"doc-{datetime.now().strftime('%Y%m%d%H%M%S')}"
+    source = io.BytesIO(content) if isinstance(content, bytes) else content
+    # Disk writes and hashing stay off the event loop
+    blob = await asyncio.to_thread(document_store.put, source)
     
-    # Create a temporary file to simulate storage
-    # In a real implementation, this would use a proper storage system
-    temp_dir = Path(tempfile.gettempdir()) / "trademark_documents"
-    os.makedirs(temp_dir, exist_ok=True)
+    document = await crud.async_document.create(db, obj_in=DocumentCreate(
+        type=document_type,
+        title=title or filename,
+        description=description,
+        trademark_id=trademark_id,
+        user_id=user_id,
+        file_path=document_store.relative_path(blob.content_hash),
+        file_name=filename,
+        file_size=str(blob.size),
+        file_type=file_type,
+        content_hash=blob.content_hash,
+    ))
     
-    file_path = temp_dir / filename
-    with open(file_path, 'wb') as f:
-        f.write(document)
-    
-    # Return document details
     return {
-        "document_id": document_id,
-        "filename": filename,
-        "document_type": document_type,
-        "size_bytes": len(document),
-        "created_at": datetime.now().isoformat(),
-        "metadata": metadata or {},
-        "storage_path": str(file_path)
+        **_document_details(document),
+        "deduplicated": not blob.created,
+        "storage_path": str(blob.path),
+    }
+
+
+def _document_details(document: Any) -> Dict[str, Any]:
+    return {
+        "document_id": document.id,
+        "filename": document.file_name,
+        "document_type": document.type,
+        "title": document.title,
+        "size_bytes": int(document.file_size) if document.file_size else None,
+        "file_type": document.file_type,
+        "content_hash": document.content_hash,
+        "created_at": document.created_at.isoformat() if document.created_at else None,
     }
 
 
+def document_path(document: Any) -> Path:
+    """Location of a document's content on disk"""
+    if document.content_hash:
+        return document_store.path(document.content_hash)
+    # Documents stored before the content-addressed store
+    return Path(document.file_path)
+
+
 async def retrieve_document(
+    db: AsyncSession,
     document_id: str
 ) -> Optional[Dict[str, Any]]:
     """
     Retrieve a document from the document storage system.
     
     Args:
+        db: Database session the Document record is read with
         document_id: The document ID
     
     Returns:
         Dictionary with document details and content, or None if not found
     """
-    # This is a placeholder implementation
-    # In a real implementation, this would retrieve the document from a file system, S3, or database
+    document = await crud.async_document.get(db, id=document_id)
+    if document is None:
+        return None
+    
+    path = document_path(document)
+    try:
+        content = await asyncio.to_thread(path.read_bytes)
+    except FileNotFoundError:
+        return None
     
-    # For now, return None to indicate document not found
-    # In a real implementation, this would check if the document exists and return it
-    return None
\ No newline at end of file
+    return {
+        **_document_details(document),
+        "storage_path": str(path),
+        "content": content,
+    }
\ No newline at end of file
@@ -1,9 +1,11 @@
 from typing import Dict, List, Optional, Any
-import httpx
 
+from app.core.cache import search_cache
 from app.core.config import settings
+from app.core.http_client import request_json
 
 
+@search_cache.cached("euipo")
 async def search_euipo(
     query: str,
     nice_classes: Optional[List[int]] = None
@@ -11,12 +13,8 @@ async def search_euipo(
     """
     Search for trademarks in EUIPO database.
     
-    This is a placeholder implementation that will be replaced with actual
-    EUIPO API integration when available.
+    Returns mock data when EUIPO_API_URL is not configured.
     """
-    # Placeholder for actual EUIPO API call
-    # In a real implementation, this would make an HTTP request to the EUIPO API
-    
     # Construct the API URL
     url = f"{settings.EUIPO_API_URL}/search"
     
@@ -28,14 +26,11 @@ async def search_euipo(
     if nice_classes:
         params["classes"] = ",".join(map(str, nice_classes))
     
-    # Make the API request
-    # In a real implementation, this would be:
-    # async with httpx.AsyncClient() as client:
-    #     response = await client.get(url, params=params)
-    #     response.raise_for_status()
-    #     return response.json()
+    # Make the API request through the shared connection pool
+    if settings.EUIPO_API_URL:
+        return await request_json("euipo", "GET", url, params=params)
     
-    # For now, return mock data
+    # Return mock data when no API URL is configured
     return {
         "total_results": 3,
         "results": [
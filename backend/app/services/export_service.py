@@ -0,0 +1,118 @@
+from typing import Any, Iterator, Optional, Sequence
+from datetime import datetime
+import csv
+import enum
+import io
+import json
+
+from sqlalchemy import select
+
+from app.db.routing import read_only
+from app.db.session import SessionLocal
+from app.models.trademark import Trademark
+
+# Columns of an exported trademark, in CSV column order
+EXPORT_COLUMNS = [
+    "id",
+    "name",
+    "type",
+    "status",
+    "jurisdiction",
+    "application_number",
+    "registration_number",
+    "filing_date",
+    "registration_date",
+    "expiration_date",
+    "nice_classes",
+    "goods_services",
+    "description",
+    "image_url",
+    "created_at",
+]
+
+EXPORT_BATCH_SIZE = 1000
+
+EXPORT_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "csv": "text/csv",
+}
+
+
+def _plain(value: Any) -> Any:
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(value, datetime):
+        return value.isoformat()
+    return value
+
+
+def _export_statement(owner_id: Optional[str]):
+    table = Trademark.__table__
+    statement = select(*(table.c[name] for name in EXPORT_COLUMNS))
+    if owner_id is not None:
+        statement = statement.where(table.c.owner_id == owner_id)
+    return statement.order_by(table.c.created_at, table.c.id).execution_options(
+        yield_per=EXPORT_BATCH_SIZE
+    )
+
+
+def _batches(owner_id: Optional[str]) -> Iterator[Sequence[Sequence[Any]]]:
+    """
+    Rows of the export, EXPORT_BATCH_SIZE at a time.
+
+    yield_per fetches through a server-side cursor, so only one batch of
+    plain rows is held at a time. The session is opened here rather than
+    taken from the request, as the response body is produced after the
+    endpoint has returned.
+    """
+    db = SessionLocal()
+    try:
+        with read_only(db):
+            result = db.execute(_export_statement(owner_id))
+            for partition in result.partitions():
+                yield partition
+    finally:
+        db.close()
+
+
+def _ndjson_chunk(rows: Sequence[Sequence[Any]]) -> str:
+    return "".join(
+        json.dumps(
+            {name: _plain(value) for name, value in zip(EXPORT_COLUMNS, row)},
+            ensure_ascii=False,
+        ) + "\n"
+        for row in rows
+    )
+
+
+def _csv_chunk(rows: Sequence[Sequence[Any]]) -> str:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    for row in rows:
+        writer.writerow([
+            ";".join(str(c) for c in value) if isinstance(value, list) else _plain(value)
+            for value in row
+        ])
+    return buffer.getvalue()
+
+
+def export_trademarks(owner_id: Optional[str], export_format: str) -> Iterator[str]:
+    """
+    Stream trademarks as NDJSON or CSV, oldest first.
+
+    Args:
+        owner_id: Only export this owner's trademarks; None exports all
+        export_format: "ndjson" or "csv"
+
+    Yields:
+        One chunk of text per batch of rows (CSV starts with a header line)
+    """
+    if export_format == "csv":
+        buffer = io.StringIO()
+        csv.writer(buffer).writerow(EXPORT_COLUMNS)
+        yield buffer.getvalue()
+        serialize = _csv_chunk
+    else:
+        serialize = _ndjson_chunk
+    for rows in _batches(owner_id):
+        yield serialize(rows)
@@ -0,0 +1,145 @@
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple
+import asyncio
+import logging
+import time
+
+from app import crud
+from app.core.config import settings
+from app.core.resilience import UpstreamUnavailableError
+from app.db.session import AsyncSessionLocal
+from app.schemas.trademark import (
+    SearchSourceState, SearchSourceStatus, TrademarkSearchQuery, TrademarkSearchResponse
+)
+from app.services.euipo_service import search_euipo
+from app.services.obi_service import search_obi
+from app.services.tmview_service import search_tmview
+from app.services.wipo_service import search_wipo
+
+logger = logging.getLogger(__name__)
+
+SOURCES = ("local", "tmview", "euipo", "wipo", "obi")
+
+
+class FederatedSearchResult:
+    """
+    Raw payloads of the sources that answered, keyed by source name, and the
+    status of every requested source.
+    """
+
+    def __init__(self, payloads: Dict[str, Any], statuses: List[SearchSourceStatus]):
+        self.payloads = payloads
+        self.statuses = statuses
+
+    @property
+    def partial(self) -> bool:
+        return any(status.status != SearchSourceState.OK for status in self.statuses)
+
+
+async def _search_local(search_query: TrademarkSearchQuery) -> List[Any]:
+    # Own session, so a timed-out search never shares a session with the
+    # request that gave up on it
+    async with AsyncSessionLocal() as db:
+        results, _ = await crud.async_trademark.search_local(db=db, search_query=search_query)
+        return results
+
+
+def _source_calls(
+    search_query: TrademarkSearchQuery
+) -> Dict[str, Callable[[], Awaitable[Any]]]:
+    query = search_query.query
+    nice_classes = search_query.nice_classes
+    jurisdiction = search_query.jurisdiction
+    return {
+        "local": lambda: _search_local(search_query),
+        "tmview": lambda: search_tmview(
+            query=query, jurisdiction=jurisdiction, nice_classes=nice_classes
+        ),
+        "euipo": lambda: search_euipo(query=query, nice_classes=nice_classes),
+        "wipo": lambda: search_wipo(
+            query=query,
+            nice_classes=nice_classes,
+            designated_countries=[jurisdiction] if jurisdiction else None,
+        ),
+        "obi": lambda: search_obi(query=query, nice_classes=nice_classes),
+    }
+
+
+def _count(payload: Any) -> int:
+    if isinstance(payload, TrademarkSearchResponse):
+        return payload.total_results
+    if isinstance(payload, dict):
+        return len(payload.get("results", []))
+    return len(payload)
+
+
+async def _run_source(
+    source: str, call: Callable[[], Awaitable[Any]], timeout: Optional[float]
+) -> Tuple[SearchSourceStatus, Any]:
+    started = time.perf_counter()
+    payload = None
+    error = None
+    try:
+        payload = await asyncio.wait_for(call(), timeout)
+        state = SearchSourceState.OK
+    except asyncio.TimeoutError:
+        state = SearchSourceState.TIMEOUT
+    except UpstreamUnavailableError as e:
+        state = SearchSourceState.UNAVAILABLE
+        error = str(e)
+    except Exception as e:
+        logger.warning("Federated search source %s failed: %s", source, e)
+        state = SearchSourceState.ERROR
+        error = str(e)
+    status = SearchSourceStatus(
+        source=source,
+        status=state,
+        elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+        total_results=_count(payload) if payload is not None else 0,
+        error=error,
+    )
+    return status, payload
+
+
+async def federated_search(
+    search_query: TrademarkSearchQuery,
+    sources: Optional[Sequence[str]] = None,
+    timeouts: Optional[Dict[str, float]] = None,
+    deadline: Optional[float] = None
+) -> FederatedSearchResult:
+    """
+    Query every source concurrently and return what arrived by the deadline.
+
+    Each source gets its own timeout; sources still running at the global
+    deadline are cancelled and reported as timed out, so the overall latency
+    is bounded by the deadline rather than the sum of all sources.
+    """
+    sources = sources or SOURCES
+    timeouts = {**settings.FEDERATED_SEARCH_TIMEOUTS, **(timeouts or {})}
+    if deadline is None:
+        deadline = settings.FEDERATED_SEARCH_DEADLINE
+
+    calls = _source_calls(search_query)
+    started = time.perf_counter()
+    tasks = {
+        source: asyncio.ensure_future(_run_source(source, calls[source], timeouts.get(source)))
+        for source in sources
+    }
+    _, pending = await asyncio.wait(tasks.values(), timeout=deadline)
+    for task in pending:
+        task.cancel()
+
+    payloads: Dict[str, Any] = {}
+    statuses: List[SearchSourceStatus] = []
+    for source, task in tasks.items():
+        if task in pending:
+            statuses.append(SearchSourceStatus(
+                source=source,
+                status=SearchSourceState.TIMEOUT,
+                elapsed_ms=round((time.perf_counter() - started) * 1000, 1),
+            ))
+            continue
+        status, payload = task.result()
+        statuses.append(status)
+        if status.status == SearchSourceState.OK:
+            payloads[source] = payload
+    return FederatedSearchResult(payloads=payloads, statuses=statuses)
@@ -0,0 +1,217 @@
+from typing import BinaryIO, Dict, List, Optional, Tuple
+from concurrent.futures import Future, ProcessPoolExecutor
+from pathlib import Path
+import importlib.util
+import logging
+import multiprocessing
+import os
+import threading
+
+from app.core.blob_store import StoredBlob, document_store
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Leading bytes of the accepted image types
+_SIGNATURES = (
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+)
+
+# Pillow's name of each accepted type
+_PIL_FORMATS = {
+    "image/png": "PNG",
+    "image/jpeg": "JPEG",
+    "image/gif": "GIF",
+    "image/webp": "WEBP",
+}
+
+
+class InvalidImageError(ValueError):
+    """The upload is not an accepted image"""
+
+
+class ImageTooLargeError(InvalidImageError):
+    """The upload exceeds the size or dimension limits"""
+
+
+def detect_image_type(head: bytes) -> Optional[str]:
+    """MIME type of an image from its first bytes, None if not accepted"""
+    for signature, media_type in _SIGNATURES:
+        if head.startswith(signature):
+            return media_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return "image/webp"
+    return None
+
+
+def pillow_available() -> bool:
+    return importlib.util.find_spec("PIL") is not None
+
+
+def _check_dimensions(path: str, media_type: str) -> None:
+    # Reads the header only; the pixels are decoded by the thumbnail workers
+    from PIL import Image
+
+    try:
+        with Image.open(path) as image:
+            image_format, (width, height) = image.format, image.size
+    except Exception:
+        raise InvalidImageError("The file is not a readable image")
+    if image_format != _PIL_FORMATS[media_type]:
+        raise InvalidImageError("The image content does not match its type")
+    if width * height > settings.TRADEMARK_IMAGE_MAX_PIXELS:
+        raise ImageTooLargeError(
+            f"Images are limited to {settings.TRADEMARK_IMAGE_MAX_PIXELS} pixels"
+        )
+
+
+def spool_image(source: BinaryIO) -> Tuple[StoredBlob, str]:
+    """
+    Stream an uploaded image into the document store in chunks, hashing it
+    on the way, and return the stored blob and its MIME type. The type is
+    checked on the first chunk and the size on every chunk, so a rejected
+    upload is never read to its end. Blocking; run it off the event loop.
+    """
+    with document_store.writer() as writer:
+        media_type = None
+        while True:
+            chunk = source.read(document_store.chunk_size)
+            if not chunk:
+                break
+            if media_type is None:
+                media_type = detect_image_type(chunk)
+                if media_type is None:
+                    raise InvalidImageError("Only PNG, JPEG, GIF and WebP images are accepted")
+            if writer.size + len(chunk) > settings.TRADEMARK_IMAGE_MAX_BYTES:
+                raise ImageTooLargeError(
+                    f"Images are limited to {settings.TRADEMARK_IMAGE_MAX_BYTES} bytes"
+                )
+            writer.write(chunk)
+        if media_type is None:
+            raise InvalidImageError("The file is empty")
+        if pillow_available():
+            _check_dimensions(writer.staged_path(), media_type)
+        return writer.commit(), media_type
+
+
+def thumbnail_path(content_hash: str, size: int) -> Path:
+    """Thumbnail of an image, bounded to `size` pixels, next to the blobs"""
+    document_store.relative_path(content_hash)  # Validates the hash
+    return document_store.root / "thumbnails" / content_hash[:2] / content_hash / f"{size}.png"
+
+
+def _render_thumbnails(source: str, targets: Dict[int, str], max_pixels: int) -> List[int]:
+    """
+    Runs in a worker process: decode the image once and write a PNG of each
+    size, upright (EXIF orientation applied) and in RGBA whatever the source
+    mode.
+    """
+    from PIL import Image, ImageOps
+
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    with Image.open(source) as image:
+        image = ImageOps.exif_transpose(image).convert("RGBA")
+    for size, target in sorted(targets.items(), reverse=True):
+        thumbnail = image.copy()
+        thumbnail.thumbnail((size, size), Image.Resampling.LANCZOS)
+        os.makedirs(os.path.dirname(target), exist_ok=True)
+        partial = f"{target}.{os.getpid()}.tmp"
+        thumbnail.save(partial, "PNG", optimize=True)
+        os.replace(partial, target)
+    return sorted(targets)
+
+
+class Thumbnailer:
+    """
+    Renders image thumbnails on a pool of `max_workers` processes, so
+    decoding and resizing never run on the API workers or hold the GIL.
+
+    Thumbnails are keyed by the image's content hash, so an image uploaded
+    again is not rendered again. Rendering happens after the upload has
+    been answered; at most `max_queue` images wait for a worker, and beyond
+    that (or without Pillow) thumbnails are skipped.
+    """
+
+    def __init__(self, sizes: List[int], max_workers: int, max_queue: int) -> None:
+        self.sizes = sizes
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+            if future.cancelled() or future.exception() is not None:
+                self.failed += 1
+            else:
+                self.completed += 1
+        if not future.cancelled() and future.exception() is not None:
+            logger.warning("Rendering thumbnails failed: %s", future.exception())
+
+    def start(self) -> ProcessPoolExecutor:
+        """Create the process pool; its workers are spawned on first use"""
+        with self._lock:
+            if self._executor is None:
+                # Spawned, not forked: the API process runs threads and an event loop
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._executor
+
+    def schedule(self, content_hash: str) -> Optional[Future]:
+        """
+        Render the missing thumbnails of a stored image on the pool. Checks
+        the disk, so call it off the event loop (e.g. as a background task).
+        """
+        targets = {
+            size: str(thumbnail_path(content_hash, size))
+            for size in self.sizes
+            if not thumbnail_path(content_hash, size).exists()
+        }
+        if not targets or not pillow_available():
+            return None
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.skipped += 1
+                logger.warning("Thumbnail queue full, skipping image %s", content_hash)
+                return None
+            self._pending += 1
+        future = self.start().submit(
+            _render_thumbnails,
+            str(document_store.path(content_hash)),
+            targets,
+            settings.TRADEMARK_IMAGE_MAX_PIXELS,
+        )
+        future.add_done_callback(self._done)
+        return future
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "pending": self._pending,
+                "max_queue": self.max_queue,
+                "completed": self.completed,
+                "failed": self.failed,
+                "skipped": self.skipped,
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+thumbnailer = Thumbnailer(
+    sizes=settings.THUMBNAIL_SIZES,
+    max_workers=settings.THUMBNAIL_WORKERS,
+    max_queue=settings.THUMBNAIL_MAX_QUEUE,
+)
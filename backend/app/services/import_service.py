@@ -0,0 +1,164 @@
+from typing import Any, BinaryIO, Dict, Iterable, Iterator, List, Optional, Tuple
+import csv
+import json
+
+from pydantic import ValidationError
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app import crud
+from app.schemas.trademark import (
+    TrademarkImport, TrademarkImportError, TrademarkImportResult
+)
+
+IMPORT_BATCH_SIZE = 500
+IMPORT_MAX_ERRORS = 1000
+
+
+class _NotUTF8Error(Exception):
+    def __init__(self, row: int) -> None:
+        super().__init__(row)
+        self.row = row
+
+
+def _lines(file: BinaryIO) -> Iterator[str]:
+    # Decoded one line at a time, so an encoding error is reported on its own line
+    for line_number, line in enumerate(file, start=1):
+        try:
+            yield line.decode("utf-8-sig" if line_number == 1 else "utf-8")
+        except UnicodeDecodeError:
+            raise _NotUTF8Error(line_number)
+
+
+def _csv_records(text: Iterable[str]) -> Iterator[Tuple[int, Dict[str, Any]]]:
+    reader = csv.DictReader(text)
+    for record in reader:
+        # Empty cells are missing values; Nice classes are separated by ";"
+        # as in the CSV export
+        record = {name: value for name, value in record.items() if name and value not in ("", None)}
+        if "nice_classes" in record:
+            record["nice_classes"] = [
+                nice_class.strip() for nice_class in record["nice_classes"].split(";")
+                if nice_class.strip()
+            ]
+        yield reader.line_num, record
+
+
+def _ndjson_records(text: Iterable[str]) -> Iterator[Tuple[int, Any]]:
+    for line_number, line in enumerate(text, start=1):
+        if not line.strip():
+            continue
+        try:
+            yield line_number, json.loads(line)
+        except ValueError as e:
+            yield line_number, e
+
+
+def _validated(
+    records: Iterator[Tuple[int, Any]]
+) -> Iterator[Tuple[int, Optional[TrademarkImport], List[str]]]:
+    for row, record in records:
+        if isinstance(record, Exception):
+            yield row, None, [f"Invalid JSON: {record}"]
+        elif not isinstance(record, dict):
+            yield row, None, ["Expected a JSON object"]
+        else:
+            try:
+                yield row, TrademarkImport(**record), []
+            except ValidationError as e:
+                yield row, None, [
+                    f"{'.'.join(str(part) for part in error['loc'])}: {error['msg']}"
+                    for error in e.errors()
+                ]
+
+
+class _Importer:
+    def __init__(self, db: Session, owner_id: str) -> None:
+        self.db = db
+        self.owner_id = owner_id
+        self.result = TrademarkImportResult()
+        self.batch: List[Tuple[int, TrademarkImport]] = []
+        self.application_numbers = set()
+
+    def fail(self, row: int, errors: List[str]) -> None:
+        self.result.failed += 1
+        if len(self.result.errors) < IMPORT_MAX_ERRORS:
+            self.result.errors.append(TrademarkImportError(row=row, errors=errors))
+
+    def add(self, row: int, obj_in: TrademarkImport) -> None:
+        # One statement cannot update the same trademark twice
+        if obj_in.application_number in self.application_numbers:
+            self.flush()
+        self.batch.append((row, obj_in))
+        if obj_in.application_number is not None:
+            self.application_numbers.add(obj_in.application_number)
+        if len(self.batch) >= IMPORT_BATCH_SIZE:
+            self.flush()
+
+    def _import(self, batch: List[Tuple[int, TrademarkImport]]) -> None:
+        outcome = crud.trademark.import_batch(
+            self.db, objs_in=[obj_in for _, obj_in in batch], owner_id=self.owner_id
+        )
+        for (row, _), created in zip(batch, outcome):
+            if created is None:
+                self.fail(row, ["application_number: belongs to another owner's trademark"])
+            elif created:
+                self.result.created += 1
+            else:
+                self.result.updated += 1
+
+    def flush(self) -> None:
+        batch, self.batch = self.batch, []
+        self.application_numbers = set()
+        if not batch:
+            return
+        try:
+            self._import(batch)
+        except SQLAlchemyError:
+            # Find the offending rows by importing one at a time
+            self.db.rollback()
+            for row, obj_in in batch:
+                try:
+                    self._import([(row, obj_in)])
+                except SQLAlchemyError as e:
+                    self.db.rollback()
+                    self.fail(row, [str(e.orig) if getattr(e, "orig", None) else str(e)])
+
+
+def import_trademarks(
+    db: Session, file: BinaryIO, import_format: str, owner_id: str
+) -> TrademarkImportResult:
+    """
+    Create or update trademarks from an uploaded NDJSON or CSV file.
+
+    The file is read and validated row by row and valid rows are written
+    IMPORT_BATCH_SIZE at a time, each batch in one INSERT ... ON CONFLICT
+    statement, so memory use does not grow with the file. A trademark with
+    the application number of an existing one of the same owner updates it,
+    which makes re-running an import safe.
+
+    Args:
+        db: Database session
+        file: The uploaded file, UTF-8 encoded
+        import_format: "ndjson" or "csv"
+        owner_id: Owner of the imported trademarks
+
+    Returns:
+        Counts of created, updated and failed rows, and the errors of each
+        failed row
+    """
+    text = _lines(file)
+    records = _csv_records(text) if import_format == "csv" else _ndjson_records(text)
+    importer = _Importer(db, owner_id)
+    try:
+        for row, obj_in, errors in _validated(records):
+            if obj_in is None:
+                importer.fail(row, errors)
+            else:
+                importer.add(row, obj_in)
+    except _NotUTF8Error as e:
+        # The rows before it are imported, the rest of the file is not read
+        importer.fail(e.row, ["Not UTF-8 encoded; this and the following rows were not imported"])
+    importer.flush()
+    importer.result.errors.sort(key=lambda error: error.row)
+    return importer.result
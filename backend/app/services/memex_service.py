@@ -1,8 +1,12 @@
 from typing import Dict, List, Optional, Any
-import httpx
 from datetime import datetime
 
 from app.core.config import settings
+from app.core.http_client import request_json
+
+
+def _auth_headers() -> Dict[str, str]:
+    return {"Authorization": f"Bearer {settings.MEMEX_MCP_API_KEY}"}
 
 
 async def get_template(
@@ -11,23 +15,16 @@ async def get_template(
     """
     Retrieve a legal template from the Memex MCP server.
     
-    This is a placeholder implementation that will be replaced with actual
-    Memex MCP integration when available.
+    Returns mock data when MEMEX_MCP_URL is not configured.
     """
-    # Placeholder for actual Memex MCP API call
-    # In a real implementation, this would make an HTTP request to the Memex MCP API
-    
     # Construct the API URL
     url = f"{settings.MEMEX_MCP_URL}/templates/{template_id}"
     
-    # Make the API request
-    # In a real implementation, this would be:
-    # async with httpx.AsyncClient() as client:
-    #     response = await client.get(url)
-    #     response.raise_for_status()
-    #     return response.json()
+    # Make the API request through the shared connection pool
+    if settings.MEMEX_MCP_URL:
+        return await request_json("memex", "GET", url, headers=_auth_headers())
     
-    # For now, return mock data
+    # Return mock data when no API URL is configured
     templates = {
         "tm-application-gr": {
             "template_id": "tm-application-gr",
@@ -126,12 +123,8 @@ async def list_templates(
     """
     List available legal templates from the Memex MCP server.
     
-    This is a placeholder implementation that will be replaced with actual
-    Memex MCP integration when available.
+    Returns mock data when MEMEX_MCP_URL is not configured.
     """
-    # Placeholder for actual Memex MCP API call
-    # In a real implementation, this would make an HTTP request to the Memex MCP API
-    
     # Construct the API URL
     url = f"{settings.MEMEX_MCP_URL}/templates"
     
@@ -140,14 +133,11 @@ async def list_templates(
     if template_type:
         params["type"] = template_type
     
-    # Make the API request
-    # In a real implementation, this would be:
-    # async with httpx.AsyncClient() as client:
-    #     response = await client.get(url, params=params)
-    #     response.raise_for_status()
-    #     return response.json()
+    # Make the API request through the shared connection pool
+    if settings.MEMEX_MCP_URL:
+        return await request_json("memex", "GET", url, params=params, headers=_auth_headers())
     
-    # For now, return mock data
+    # Return mock data when no API URL is configured
     templates = [
         {
             "template_id": "tm-application-gr",
@@ -207,23 +197,16 @@ async def generate_document(
     """
     Generate a document using a template from the Memex MCP server.
     
-    This is a placeholder implementation that will be replaced with actual
-    Memex MCP integration when available.
+    Returns mock data when MEMEX_MCP_URL is not configured.
     """
-    # Placeholder for actual Memex MCP API call
-    # In a real implementation, this would make an HTTP request to the Memex MCP API
-    
     # Construct the API URL
     url = f"{settings.MEMEX_MCP_URL}/templates/{template_id}/generate"
     
-    # Make the API request
-    # In a real implementation, this would be:
-    # async with httpx.AsyncClient() as client:
-    #     response = await client.post(url, json=data)
-    #     response.raise_for_status()
-    #     return response.json()
+    # Make the API request through the shared connection pool
+    if settings.MEMEX_MCP_URL:
+        return await request_json("memex", "POST", url, json=data, headers=_auth_headers())
     
-    # For now, return mock data
+    # Return mock data when no API URL is configured
     return {
         "document_id": f"doc-{datetime.now().strftime('%Y%m%d%H%M%S')}",
         "template_id": template_id,
@@ -0,0 +1,53 @@
+from typing import Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Classes 1-34 are goods, 35-45 services; class n is bit n - 1 of a mask
+NICE_CLASS_COUNT = 45
+
+_BYTE_POPCOUNT = np.array([bin(byte).count("1") for byte in range(256)], dtype=np.int64)
+
+
+def nice_class_mask(nice_classes: Optional[Iterable[int]]) -> int:
+    """Bitmask of a list of Nice classes; classes outside 1-45 are ignored"""
+    mask = 0
+    for nice_class in nice_classes or ():
+        try:
+            nice_class = int(nice_class)
+        except (TypeError, ValueError):
+            continue
+        if 1 <= nice_class <= NICE_CLASS_COUNT:
+            mask |= 1 << (nice_class - 1)
+    return mask
+
+
+def nice_classes_from_mask(mask: int) -> List[int]:
+    return [bit + 1 for bit in range(NICE_CLASS_COUNT) if mask >> bit & 1]
+
+
+def overlaps(mask: int, query_mask: int) -> bool:
+    """Shares at least one class with the query"""
+    return mask & query_mask != 0
+
+
+def contains(mask: int, query_mask: int) -> bool:
+    """Covers every class of the query"""
+    return mask & query_mask == query_mask
+
+
+def _popcount(values: np.ndarray) -> np.ndarray:
+    if hasattr(np, "bitwise_count"):
+        return np.bitwise_count(values).astype(np.int64)
+    as_bytes = values.astype(np.uint64).view(np.uint8).reshape(len(values), 8)
+    return _BYTE_POPCOUNT[as_bytes].sum(axis=1)
+
+
+def class_coverage(masks: Sequence[int], query_mask: int) -> np.ndarray:
+    """
+    Share of the query's classes covered by each of N masks, in one
+    vectorized pass; 1.0 for every mask when the query has no classes.
+    """
+    if not query_mask:
+        return np.ones(len(masks))
+    shared = np.asarray(masks, dtype=np.uint64) & np.uint64(query_mask)
+    return _popcount(shared) / bin(query_mask).count("1")
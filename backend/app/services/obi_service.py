@@ -1,10 +1,12 @@
 from typing import Dict, List, Optional, Any
-import httpx
 from datetime import datetime
 
+from app.core.cache import search_cache
 from app.core.config import settings
+from app.core.http_client import request_json
 
 
+@search_cache.cached("obi")
 async def search_obi(
     query: str,
     nice_classes: Optional[List[int]] = None
@@ -12,12 +14,8 @@ async def search_obi(
     """
     Search for trademarks in the Greek National Office (OBI) database.
     
-    This is a placeholder implementation that will be replaced with actual
-    OBI API integration when available.
+    Returns mock data when OBI_API_URL is not configured.
     """
-    # Placeholder for actual OBI API call
-    # In a real implementation, this would make an HTTP request to the OBI API
-    
     # Construct the API URL
     url = f"{settings.OBI_API_URL}/search"
     
@@ -29,14 +27,11 @@ async def search_obi(
     if nice_classes:
         params["classes"] = ",".join(map(str, nice_classes))
     
-    # Make the API request
-    # In a real implementation, this would be:
-    # async with httpx.AsyncClient() as client:
-    #     response = await client.get(url, params=params)
-    #     response.raise_for_status()
-    #     return response.json()
+    # Make the API request through the shared connection pool
+    if settings.OBI_API_URL:
+        return await request_json("obi", "GET", url, params=params)
     
-    # For now, return mock data
+    # Return mock data when no API URL is configured
     return {
         "total_results": 2,
         "results": [
@@ -114,23 +109,16 @@ async def submit_application(
     """
     Submit a trademark application to the Greek National Office (OBI).
     
-    This is a placeholder implementation that will be replaced with actual
-    OBI API integration when available.
+    Returns mock data when OBI_API_URL is not configured.
     """
-    # Placeholder for actual OBI API call
-    # In a real implementation, this would make an HTTP request to the OBI API
-    
     # Construct the API URL
     url = f"{settings.OBI_API_URL}/applications"
     
-    # Make the API request
-    # In a real implementation, this would be:
-    # async with httpx.AsyncClient() as client:
-    #     response = await client.post(url, json=application_data)
-    #     response.raise_for_status()
-    #     return response.json()
+    # Make the API request through the shared connection pool
+    if settings.OBI_API_URL:
+        return await request_json("obi", "POST", url, json=application_data)
     
-    # For now, return mock data
+    # Return mock data when no API URL is configured
     return {
         "application_id": "GR-APP-2023-12345",
         "submission_date": datetime.now().isoformat(),
@@ -153,23 +141,16 @@ async def check_application_status(
     """
     Check the status of a trademark application with the Greek National Office (OBI).
     
-    This is a placeholder implementation that will be replaced with actual
-    OBI API integration when available.
+    Returns mock data when OBI_API_URL is not configured.
     """
-    # Placeholder for actual OBI API call
-    # In a real implementation, this would make an HTTP request to the OBI API
-    
     # Construct the API URL
     url = f"{settings.OBI_API_URL}/applications/{application_id}/status"
     
-    # Make the API request
-    # In a real implementation, this would be:
-    # async with httpx.AsyncClient() as client:
-    #     response = await client.get(url)
-    #     response.raise_for_status()
-    #     return response.json()
+    # Make the API request through the shared connection pool
+    if settings.OBI_API_URL:
+        return await request_json("obi", "GET", url)
     
-    # For now, return mock data
+    # Return mock data when no API URL is configured
     return {
         "application_id": application_id,
         "status": "EXAMINATION",
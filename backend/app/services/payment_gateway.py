@@ -0,0 +1,183 @@
+from typing import Any, Callable, Dict, List, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+import asyncio
+import threading
+import time
+
+import stripe
+
+from app.core.config import settings
+from app.services import stripe_service
+
+
+class PaymentGatewayBusyError(Exception):
+    """Too many Stripe calls are already waiting for a worker"""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("Too many payment requests at once, please retry")
+        self.retry_after = retry_after
+
+
+class PaymentGatewayTimeoutError(Exception):
+    """A Stripe call did not finish within the deadline"""
+
+
+class OperationMetrics:
+    """Calls, failures and latency of one kind of Stripe call"""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.errors = 0
+        self.timeouts = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+
+    def record(self, elapsed: float, error: bool, timed_out: bool) -> None:
+        self.calls += 1
+        self.errors += error
+        self.timeouts += timed_out
+        self.latency_total += elapsed
+        self.latency_max = max(self.latency_max, elapsed)
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "timeouts": self.timeouts,
+            "latency_ms_avg": round(1000 * self.latency_total / self.calls, 2) if self.calls else 0.0,
+            "latency_ms_max": round(1000 * self.latency_max, 2),
+        }
+
+
+class PaymentGateway:
+    """
+    Async front of the blocking Stripe SDK.
+
+    Calls run on a dedicated pool of `max_workers` threads, so a slow Stripe
+    round-trip holds neither the event loop nor the threadpool serving
+    database work. Each worker thread keeps its own pooled HTTP session. At
+    most `max_queue` more calls wait for a worker; beyond that calls fail
+    fast with PaymentGatewayBusyError, and a call still unfinished after
+    `deadline` seconds raises PaymentGatewayTimeoutError.
+
+    Pass an SDK HTTP client (e.g. one answering from fixtures) to route every
+    call through it in tests, or set STRIPE_API_BASE to a local stripe-mock.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        max_queue: int,
+        deadline: float,
+        http_client: Optional[stripe.HTTPClient] = None,
+    ) -> None:
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.deadline = deadline
+        self._http_client = http_client
+        self._client: Optional[stripe.StripeClient] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._pending = 0  # Submitted and not finished: running plus queued
+        self.rejected = 0
+        self.max_queue_depth = 0
+        self._operations: Dict[str, OperationMetrics] = {}
+
+    @property
+    def client(self) -> stripe.StripeClient:
+        if self._client is None:
+            self._client = stripe_service.create_stripe_client(self._http_client)
+        return self._client
+
+    def _done(self, future: Future) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    def _submit(self, func: Callable[..., Any], *args: Any) -> Future:
+        with self._lock:
+            if self._pending >= self.max_workers + self.max_queue:
+                self.rejected += 1
+                raise PaymentGatewayBusyError(retry_after=1.0)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="payment-gateway"
+                )
+            self._pending += 1
+            self.max_queue_depth = max(self.max_queue_depth, self.queue_depth())
+        future = self._executor.submit(func, *args)
+        future.add_done_callback(self._done)
+        return future
+
+    def _record(self, operation: str, elapsed: float, error: bool = False, timed_out: bool = False) -> None:
+        with self._lock:
+            metrics = self._operations.setdefault(operation, OperationMetrics())
+            metrics.record(elapsed, error, timed_out)
+
+    async def _call(self, operation: str, func: Callable[..., Any], *args: Any) -> Any:
+        future = self._submit(func, self.client, *args)
+        started = time.perf_counter()
+        try:
+            # Cancelling the wait also drops the call if it is still queued
+            result = await asyncio.wait_for(asyncio.wrap_future(future), self.deadline)
+        except asyncio.TimeoutError:
+            self._record(operation, time.perf_counter() - started, error=True, timed_out=True)
+            raise PaymentGatewayTimeoutError(f"Stripe did not answer within {self.deadline:g}s")
+        except Exception:
+            self._record(operation, time.perf_counter() - started, error=True)
+            raise
+        self._record(operation, time.perf_counter() - started)
+        return result
+
+    async def create_payment_intent(
+        self,
+        amount: float,
+        currency: str = "usd",
+        payment_method_types: Optional[List[str]] = None,
+        metadata: Optional[Dict[str, str]] = None,
+        idempotency_key: Optional[str] = None
+    ) -> Any:
+        return await self._call(
+            "create_payment_intent",
+            stripe_service.create_payment_intent,
+            amount,
+            currency,
+            payment_method_types,
+            metadata,
+            idempotency_key,
+        )
+
+    async def confirm_payment_intent(self, payment_intent_id: str, payment_method_id: str) -> Any:
+        return await self._call(
+            "confirm_payment_intent",
+            stripe_service.confirm_payment_intent,
+            payment_intent_id,
+            payment_method_id,
+        )
+
+    def queue_depth(self) -> int:
+        """Calls waiting for a free worker"""
+        return max(self._pending - self.max_workers, 0)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "workers": self.max_workers,
+                "running": min(self._pending, self.max_workers),
+                "queue_depth": self.queue_depth(),
+                "max_queue": self.max_queue,
+                "max_queue_depth": self.max_queue_depth,
+                "rejected": self.rejected,
+                "operations": {name: metrics.stats() for name, metrics in self._operations.items()},
+            }
+
+    def shutdown(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+payment_gateway = PaymentGateway(
+    max_workers=settings.STRIPE_WORKERS,
+    max_queue=settings.STRIPE_MAX_QUEUE,
+    deadline=settings.STRIPE_DEADLINE,
+)
@@ -0,0 +1,155 @@
+from typing import List
+import re
+import unicodedata
+
+# Greek digraphs first, so "ΜΠ" is read as one sound before "Μ" and "Π"
+_GREEK_DIGRAPHS = [
+    ("ου", "u"),
+    ("αι", "e"),
+    ("ει", "i"),
+    ("οι", "i"),
+    ("υι", "i"),
+    ("αυ", "av"),
+    ("ευ", "ev"),
+    ("μπ", "b"),
+    ("ντ", "d"),
+    ("γκ", "g"),
+    ("γγ", "ng"),
+    ("τσ", "ts"),
+    ("τζ", "tz"),
+]
+
+# Modern Greek pronunciation, e.g. "η", "ι" and "υ" all sound like "i"
+_GREEK_LETTERS = {
+    "α": "a", "β": "v", "γ": "g", "δ": "d", "ε": "e", "ζ": "z",
+    "η": "i", "θ": "th", "ι": "i", "κ": "k", "λ": "l", "μ": "m",
+    "ν": "n", "ξ": "x", "ο": "o", "π": "p", "ρ": "r", "σ": "s",
+    "ς": "s", "τ": "t", "υ": "i", "φ": "f", "χ": "h", "ψ": "ps",
+    "ω": "o",
+}
+
+_VOWELS = set("AEIOU")
+_FRONT_VOWELS = set("EIY")
+_WORD_RE = re.compile(r"[A-Z0-9]+")
+
+
+def _strip_accents(text: str) -> str:
+    decomposed = unicodedata.normalize("NFD", text)
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def transliterate_greek(text: str) -> str:
+    """
+    Transliterate Greek script to Latin by sound, e.g. "ΝΙΚΗ" -> "niki".
+
+    Latin characters pass through; the result is lowercase without accents.
+    """
+    text = _strip_accents(text).lower()
+    for greek, latin in _GREEK_DIGRAPHS:
+        text = text.replace(greek, latin)
+    return "".join(_GREEK_LETTERS.get(char, char) for char in text)
+
+
+def metaphone(word: str) -> str:
+    """
+    Encode one uppercase A-Z word with the Metaphone rules; digits are kept.
+
+    Two additions help match marks across spellings: "QU" is read as "KW",
+    and every leading vowel is encoded as "A".
+    """
+    word = word.replace("QU", "KW")
+    if word[:2] in ("AE", "GN", "KN", "PN", "WR"):
+        word = word[1:]
+    if word[:1] == "X":
+        word = "S" + word[1:]
+    if word[:2] == "WH":
+        word = "W" + word[2:]
+
+    # Drop repeated letters, except "CC" which can be read as "KS"
+    letters: List[str] = []
+    for char in word:
+        if not letters or char != letters[-1] or char == "C":
+            letters.append(char)
+    word = "".join(letters)
+
+    code: List[str] = []
+    for i, char in enumerate(word):
+        prev = word[i - 1] if i > 0 else ""
+        nxt = word[i + 1] if i + 1 < len(word) else ""
+        after = word[i + 2] if i + 2 < len(word) else ""
+
+        if char in _VOWELS:
+            if i == 0:
+                code.append("A")
+        elif char == "B":
+            if not (prev == "M" and not nxt):
+                code.append("B")
+        elif char == "C":
+            if nxt == "I" and after == "A":
+                code.append("X")
+            elif nxt == "H":
+                code.append("K" if prev == "S" else "X")
+            elif nxt in _FRONT_VOWELS:
+                if prev != "S":
+                    code.append("S")
+            else:
+                code.append("K")
+        elif char == "D":
+            code.append("J" if nxt == "G" and after in _FRONT_VOWELS else "T")
+        elif char == "G":
+            if nxt == "H" and after and after not in _VOWELS:
+                continue
+            if nxt == "N" and (not after or word[i + 2:] == "ED"):
+                continue
+            if prev == "D" and nxt in _FRONT_VOWELS:
+                continue
+            code.append("J" if nxt in _FRONT_VOWELS else "K")
+        elif char == "H":
+            if prev and prev in "CGPST":
+                continue
+            if prev in _VOWELS and nxt not in _VOWELS:
+                continue
+            code.append("H")
+        elif char == "K":
+            if prev != "C":
+                code.append("K")
+        elif char == "P":
+            code.append("F" if nxt == "H" else "P")
+        elif char == "Q":
+            code.append("K")
+        elif char == "S":
+            if nxt == "H" or (nxt == "I" and after in ("O", "A")):
+                code.append("X")
+            else:
+                code.append("S")
+        elif char == "T":
+            if nxt == "I" and after in ("O", "A"):
+                code.append("X")
+            elif nxt == "H":
+                code.append("0")
+            elif not (nxt == "C" and after == "H"):
+                code.append("T")
+        elif char == "V":
+            code.append("F")
+        elif char in "WY":
+            if nxt in _VOWELS:
+                code.append(char)
+        elif char == "X":
+            code.append("KS")
+        elif char == "Z":
+            code.append("S")
+        else:
+            code.append(char)
+    return "".join(code)
+
+
+def phonetic_key(name: str) -> str:
+    """
+    Script-independent phonetic key of a trademark name.
+
+    Marks that sound alike share a key, e.g. "ΝΙΚΗ" and "NIKI" -> "NK",
+    "Kwik" and "Quick" -> "KWK". Words are encoded separately and joined,
+    so "KWIK FIT" and "KWIKFIT" also match.
+    """
+    latin = transliterate_greek(name).upper()
+    return "".join(metaphone(word) for word in _WORD_RE.findall(latin))
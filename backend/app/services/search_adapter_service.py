@@ -0,0 +1,231 @@
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+import re
+import unicodedata
+
+from app.models.trademark import Trademark, TrademarkStatus, TrademarkType
+from app.schemas.trademark import NiceClassMatch, TrademarkSearchResponse, TrademarkSearchResult
+from app.services.nice_class_service import contains, nice_class_mask, overlaps
+from app.services.similarity_service import rank_results
+
+# Office status vocabularies mapped onto our own statuses
+_STATUS_MAP = {
+    "FILED": TrademarkStatus.SUBMITTED,
+    "SUBMITTED": TrademarkStatus.SUBMITTED,
+    "PENDING": TrademarkStatus.SUBMITTED,
+    "EXAMINATION": TrademarkStatus.UNDER_EXAMINATION,
+    "UNDER_EXAMINATION": TrademarkStatus.UNDER_EXAMINATION,
+    "PROCESSING": TrademarkStatus.UNDER_EXAMINATION,
+    "PUBLISHED": TrademarkStatus.PUBLISHED,
+    "OPPOSED": TrademarkStatus.PUBLISHED,
+    "REGISTERED": TrademarkStatus.REGISTERED,
+    "REJECTED": TrademarkStatus.REJECTED,
+    "REFUSED": TrademarkStatus.REJECTED,
+    "WITHDRAWN": TrademarkStatus.ABANDONED,
+    "ABANDONED": TrademarkStatus.ABANDONED,
+    "EXPIRED": TrademarkStatus.EXPIRED,
+}
+
+_NON_ALNUM_RE = re.compile(r"[\W_]+", re.UNICODE)
+
+
+def _status(value: Optional[str]) -> TrademarkStatus:
+    return _STATUS_MAP.get((value or "").strip().upper(), TrademarkStatus.SUBMITTED)
+
+
+def _type(value: Optional[str]) -> TrademarkType:
+    try:
+        return TrademarkType((value or "").strip().lower())
+    except ValueError:
+        return TrademarkType.OTHER
+
+
+def _date(value: Optional[str]) -> Optional[datetime]:
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def adapt_local(trademarks: List[Trademark]) -> List[TrademarkSearchResult]:
+    """Convert database results to search response format"""
+    return [
+        TrademarkSearchResult(
+            id=tm.id,
+            name=tm.name,
+            description=tm.description,
+            type=tm.type,
+            status=tm.status,
+            jurisdiction=tm.jurisdiction,
+            nice_classes=tm.nice_classes,
+            goods_services=tm.goods_services,
+            application_number=tm.application_number,
+            registration_number=tm.registration_number,
+            filing_date=tm.filing_date,
+            registration_date=tm.registration_date,
+            source="Local",
+            nice_class_mask=tm.nice_class_mask,
+        )
+        for tm in trademarks
+    ]
+
+
+def _adapt_office(payload: Dict[str, Any], source: str, jurisdiction: str) -> List[TrademarkSearchResult]:
+    """EUIPO and OBI share one response shape"""
+    return [
+        TrademarkSearchResult(
+            id=item.get("id"),
+            name=item["trademark"],
+            type=_type(item.get("type")),
+            status=_status(item.get("status")),
+            jurisdiction=jurisdiction,
+            nice_classes=item.get("nice_classes"),
+            goods_services=item.get("goods_services"),
+            application_number=item.get("application_number"),
+            registration_number=item.get("registration_number"),
+            filing_date=_date(item.get("application_date")),
+            registration_date=_date(item.get("registration_date")),
+            source=source,
+            nice_class_mask=nice_class_mask(item.get("nice_classes")),
+        )
+        for item in payload.get("results", [])
+    ]
+
+
+def adapt_euipo(payload: Dict[str, Any]) -> List[TrademarkSearchResult]:
+    return _adapt_office(payload, source="EUIPO", jurisdiction="EU")
+
+
+def adapt_obi(payload: Dict[str, Any]) -> List[TrademarkSearchResult]:
+    return _adapt_office(payload, source="OBI", jurisdiction="GR")
+
+
+def adapt_wipo(payload: Dict[str, Any]) -> List[TrademarkSearchResult]:
+    """
+    International registrations carry the number of their basic application,
+    which lets them be matched with the national record of the same mark.
+    """
+    results = []
+    for item in payload.get("results", []):
+        basic_application = item.get("basic_application") or {}
+        results.append(TrademarkSearchResult(
+            id=item.get("id"),
+            name=item["trademark"],
+            type=_type(item.get("type")),
+            status=_status(item.get("status")),
+            jurisdiction="WO",
+            nice_classes=item.get("nice_classes"),
+            goods_services=item.get("goods_services"),
+            application_number=basic_application.get("application_number"),
+            registration_number=item.get("international_registration_number"),
+            filing_date=_date(basic_application.get("application_date")),
+            registration_date=_date(item.get("international_registration_date")),
+            source="WIPO",
+            nice_class_mask=nice_class_mask(item.get("nice_classes")),
+        ))
+    return results
+
+
+def adapt_tmview(payload: TrademarkSearchResponse) -> List[TrademarkSearchResult]:
+    return [
+        result.model_copy(update={"nice_class_mask": nice_class_mask(result.nice_classes)})
+        for result in payload.results
+    ]
+
+
+ADAPTERS: Dict[str, Callable[[Any], List[TrademarkSearchResult]]] = {
+    "local": adapt_local,
+    "tmview": adapt_tmview,
+    "euipo": adapt_euipo,
+    "wipo": adapt_wipo,
+    "obi": adapt_obi,
+}
+
+
+def normalize_name(name: str) -> str:
+    """Casefolded name without accents, spaces or punctuation"""
+    decomposed = unicodedata.normalize("NFD", name.casefold())
+    stripped = "".join(char for char in decomposed if not unicodedata.combining(char))
+    return _NON_ALNUM_RE.sub("", stripped)
+
+
+def _normalize_number(number: Optional[str]) -> str:
+    return _NON_ALNUM_RE.sub("", number or "").upper()
+
+
+def _merge(kept: TrademarkSearchResult, duplicate: TrademarkSearchResult) -> TrademarkSearchResult:
+    """Fill the gaps of the kept record and remember who else reported it"""
+    missing = {
+        field: value
+        for field, value in duplicate.model_dump(exclude={"source", "also_reported_by"}).items()
+        if value is not None and getattr(kept, field) is None
+    }
+    reported_by = [*(kept.also_reported_by or []), duplicate.source, *(duplicate.also_reported_by or [])]
+    missing["also_reported_by"] = sorted(set(reported_by) - {kept.source})
+    if "nice_classes" in missing:
+        missing["nice_class_mask"] = duplicate.nice_class_mask
+    return kept.model_copy(update=missing)
+
+
+def deduplicate(results: List[TrademarkSearchResult]) -> List[TrademarkSearchResult]:
+    """
+    Collapse the same mark reported by several offices into one result.
+
+    Two results are the same mark when their normalized names are equal and
+    they share an application or registration number. Results without any
+    number are never merged. The first occurrence is kept in place.
+    """
+    merged: List[TrademarkSearchResult] = []
+    seen: Dict[Tuple[str, str], int] = {}
+    for result in results:
+        name = normalize_name(result.name)
+        numbers = {
+            _normalize_number(result.application_number),
+            _normalize_number(result.registration_number),
+        } - {""}
+        keys = [(name, number) for number in numbers]
+        match = next((seen[key] for key in keys if key in seen), None)
+        if match is None:
+            match = len(merged)
+            merged.append(result)
+        else:
+            merged[match] = _merge(merged[match], result)
+        for key in keys:
+            seen.setdefault(key, match)
+    return merged
+
+
+def filter_by_classes(
+    results: List[TrademarkSearchResult],
+    nice_classes: Optional[List[int]],
+    match: NiceClassMatch = NiceClassMatch.ANY
+) -> List[TrademarkSearchResult]:
+    """
+    Drop the results outside the requested Nice classes, one AND of the
+    class masks per result. Results whose classes are unknown are kept.
+    """
+    query_mask = nice_class_mask(nice_classes)
+    if not query_mask:
+        return results
+    test = contains if match == NiceClassMatch.ALL else overlaps
+    return [result for result in results if not result.nice_class_mask or test(result.nice_class_mask, query_mask)]
+
+
+def merge_results(
+    query: str,
+    results_by_source: Dict[str, List[TrademarkSearchResult]],
+    nice_classes: Optional[List[int]] = None,
+    nice_class_match: NiceClassMatch = NiceClassMatch.ANY
+) -> List[TrademarkSearchResult]:
+    """
+    Deduplicate the results of all sources, drop those outside the requested
+    Nice classes that an office did not filter out itself, and rank them in
+    one list by similarity to the query. Local results come first, so a mark
+    we already hold is reported as our own record.
+    """
+    ordered_sources = sorted(results_by_source, key=lambda source: source != "local")
+    combined = [result for source in ordered_sources for result in results_by_source[source]]
+    results = filter_by_classes(deduplicate(combined), nice_classes, nice_class_match)
+    return rank_results(query, results, nice_classes=nice_classes)
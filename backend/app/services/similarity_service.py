@@ -0,0 +1,238 @@
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+from app.schemas.trademark import TrademarkSearchResult
+from app.services.nice_class_service import class_coverage, nice_class_mask
+
+# Relative weight of each component in the combined similarity score
+DEFAULT_WEIGHTS: Dict[str, float] = {
+    "edit": 0.5,  # Normalized Levenshtein similarity
+    "ngram": 0.3,  # Character trigram cosine similarity
+    "phonetic": 0.2,  # Levenshtein similarity of sound-class skeletons
+}
+
+# Weight of Nice class coverage when a search names classes: a mark in
+# the same classes is a closer conflict than one in unrelated goods
+CLASS_COVERAGE_WEIGHT = 0.2
+
+_PAD = ord(" ")
+
+# Sound classes in the spirit of Soundex: letters that sound alike share a
+# class, vowels and h/w/y map to 0 and are dropped from the skeleton.
+# Greek consonants share the class of their Latin sound, so "ΝΙΚΗ" and
+# "NIKI" get the same skeleton.
+_SOUND_CLASSES = {
+    "bfpvβπφψ": 1,
+    "cgjkqsxzγκξσςζχ": 2,
+    "dtδτθ": 3,
+    "lλ": 4,
+    "mnμν": 5,
+    "rρ": 6,
+}
+_SOUND_TABLE = np.zeros(0x400, dtype=np.int64)
+for _letters, _sound_class in _SOUND_CLASSES.items():
+    for _letter in _letters:
+        _SOUND_TABLE[ord(_letter)] = _sound_class
+for _digit in "0123456789":
+    # Digits are significant ("3M" is not "M"), each gets its own class
+    _SOUND_TABLE[ord(_digit)] = 10 + int(_digit)
+
+
+def _encode(names: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Encode names as a zero-padded (N, L) matrix of lowercase code points.
+
+    Returns the matrix and the length of each name.
+    """
+    text = np.char.strip(np.char.lower(np.asarray(list(names), dtype=str)))
+    lengths = np.char.str_len(text).astype(np.int64)
+    width = max(text.dtype.itemsize // 4, 1)
+    codes = np.ascontiguousarray(text).view(np.uint32).reshape(len(text), width)
+    return codes.astype(np.int64), lengths
+
+
+def _levenshtein(query: np.ndarray, candidates: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Levenshtein distance from one query to every row of a padded matrix.
+
+    The dynamic programming table is advanced one query character at a time
+    for all candidates at once. Within a row, insertions are resolved with a
+    running minimum: D[i, j] = min_k(T[k] + j - k) = cummin(T - j) + j.
+    """
+    count, width = candidates.shape
+    columns = np.arange(width + 1)
+    previous = np.broadcast_to(columns, (count, width + 1)).astype(np.int64)
+    for i, char in enumerate(query, start=1):
+        cost = (candidates != char).astype(np.int64)
+        current = np.empty_like(previous)
+        current[:, 0] = i
+        current[:, 1:] = np.minimum(previous[:, 1:] + 1, previous[:, :-1] + cost)
+        previous = np.minimum.accumulate(current - columns, axis=1) + columns
+    return previous[np.arange(count), lengths]
+
+
+def _edit_similarity(
+    query: np.ndarray, candidates: np.ndarray, lengths: np.ndarray
+) -> np.ndarray:
+    distance = _levenshtein(query, candidates, lengths)
+    longest = np.maximum(lengths, len(query))
+    return np.where(longest > 0, 1.0 - distance / np.maximum(longest, 1), 1.0)
+
+
+def _trigram_keys(codes: np.ndarray, lengths: np.ndarray) -> np.ndarray:
+    """
+    Pack the padded trigrams of each row into int64 keys, -1 where unused.
+
+    Rows are padded with two leading blanks and one trailing blank; code
+    points fit in 21 bits so three of them fit in one key.
+    """
+    count, width = codes.shape
+    padded = np.zeros((count, width + 3), dtype=np.int64)
+    padded[:, :2] = _PAD
+    padded[:, 2:width + 2] = codes
+    padded[np.arange(count), lengths + 2] = _PAD
+    keys = (padded[:, :-2] << 42) | (padded[:, 1:-1] << 21) | padded[:, 2:]
+    position = np.arange(width + 1)
+    valid = (position <= lengths[:, None]) & (lengths[:, None] > 0)
+    return np.where(valid, keys, -1)
+
+
+def _ngram_cosine(
+    query_codes: np.ndarray, query_length: int, codes: np.ndarray, lengths: np.ndarray
+) -> np.ndarray:
+    query_keys = _trigram_keys(query_codes[None, :], np.array([query_length]))[0]
+    query_grams, query_counts = np.unique(query_keys[query_keys >= 0], return_counts=True)
+    if query_grams.size == 0:
+        return np.zeros(len(lengths))
+
+    keys = _trigram_keys(codes, lengths)
+    valid = keys >= 0
+
+    # Dot product: every candidate trigram contributes its count in the query
+    slot = np.clip(np.searchsorted(query_grams, keys), 0, query_grams.size - 1)
+    hits = valid & (query_grams[slot] == keys)
+    dot = np.where(hits, query_counts[slot], 0).sum(axis=1)
+
+    # Squared norm: sum of count^2 equals sum of (2 * rank + 1) over each run
+    # of equal keys in the sorted row
+    ordered = np.sort(keys, axis=1)
+    position = np.arange(ordered.shape[1])
+    run_start = np.ones(ordered.shape, dtype=bool)
+    run_start[:, 1:] = ordered[:, 1:] != ordered[:, :-1]
+    first = np.maximum.accumulate(np.where(run_start, position, 0), axis=1)
+    norm = np.where(ordered >= 0, 2 * (position - first) + 1, 0).sum(axis=1)
+
+    denominator = np.sqrt(norm * float((query_counts ** 2).sum()))
+    return np.where(denominator > 0, dot / np.maximum(denominator, 1e-12), 0.0)
+
+
+def _compact(values: np.ndarray) -> np.ndarray:
+    """Shift the non-zero entries of each row to the left, keeping order."""
+    order = np.argsort(values == 0, axis=1, kind="stable")
+    return np.take_along_axis(values, order, axis=1)
+
+
+def _sound_skeleton(codes: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Map code points to sound classes, drop silent letters and collapse
+    repeated classes, so "Kwik" and "Quick" share the skeleton [2].
+    """
+    in_table = codes < _SOUND_TABLE.size
+    classes = np.where(in_table, _SOUND_TABLE[np.where(in_table, codes, 0)], 0)
+    classes = _compact(classes)
+    repeated = np.zeros(classes.shape, dtype=bool)
+    repeated[:, 1:] = classes[:, 1:] == classes[:, :-1]
+    classes = _compact(np.where(repeated, 0, classes))
+    return classes, (classes != 0).sum(axis=1)
+
+
+def score_components(query: str, candidates: Sequence[str]) -> Dict[str, np.ndarray]:
+    """
+    Score one query against N candidate names in a single vectorized pass.
+
+    Returns an array of N scores in [0, 1] for each component.
+    """
+    if len(candidates) == 0:
+        return {name: np.zeros(0) for name in DEFAULT_WEIGHTS}
+
+    query_codes, query_length = _encode([query])
+    query_codes = query_codes[0, :query_length[0]]
+    codes, lengths = _encode(candidates)
+
+    query_sounds, query_sound_length = _sound_skeleton(query_codes[None, :])
+    sounds, sound_lengths = _sound_skeleton(codes)
+
+    return {
+        "edit": _edit_similarity(query_codes, codes, lengths),
+        "ngram": _ngram_cosine(query_codes, int(query_length[0]), codes, lengths),
+        "phonetic": _edit_similarity(
+            query_sounds[0, :query_sound_length[0]], sounds, sound_lengths
+        ),
+    }
+
+
+def score_candidates(
+    query: str,
+    candidates: Sequence[str],
+    weights: Optional[Mapping[str, float]] = None
+) -> np.ndarray:
+    """
+    Combined similarity of one query to N candidate names, as an array of N
+    scores in [0, 1].
+    """
+    weights = weights or DEFAULT_WEIGHTS
+    components = score_components(query, candidates)
+    total = sum(weights.values())
+    combined = np.zeros(len(candidates))
+    for name, weight in weights.items():
+        combined += weight * components[name]
+    return combined / total if total else combined
+
+
+def _result_scores(
+    query: str,
+    results: List[TrademarkSearchResult],
+    weights: Optional[Mapping[str, float]],
+    nice_classes: Optional[Sequence[int]]
+) -> np.ndarray:
+    scores = score_candidates(query, [result.name for result in results], weights)
+    query_mask = nice_class_mask(nice_classes)
+    if query_mask:
+        masks = [result.nice_class_mask or 0 for result in results]
+        coverage = np.where(np.asarray(masks) != 0, class_coverage(masks, query_mask), 1.0)
+        scores = (1 - CLASS_COVERAGE_WEIGHT) * scores + CLASS_COVERAGE_WEIGHT * coverage
+    return np.round(scores, 4)
+
+
+def score_results(
+    query: str,
+    results: List[TrademarkSearchResult],
+    weights: Optional[Mapping[str, float]] = None,
+    nice_classes: Optional[Sequence[int]] = None
+) -> List[TrademarkSearchResult]:
+    """
+    Set the similarity score of every result, keeping their order.
+
+    With Nice classes, the score also counts the share of those classes each
+    result covers (CLASS_COVERAGE_WEIGHT); results whose classes are unknown
+    are not penalized.
+    """
+    if not results:
+        return []
+    scores = _result_scores(query, results, weights, nice_classes)
+    return [
+        result.model_copy(update={"similarity_score": float(score)})
+        for result, score in zip(results, scores)
+    ]
+
+
+def rank_results(
+    query: str,
+    results: List[TrademarkSearchResult],
+    weights: Optional[Mapping[str, float]] = None,
+    nice_classes: Optional[Sequence[int]] = None
+) -> List[TrademarkSearchResult]:
+    """Score every result as score_results() does and order them best first."""
+    scored = score_results(query, results, weights, nice_classes)
+    return sorted(scored, key=lambda result: -result.similarity_score)
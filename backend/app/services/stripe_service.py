@@ -1,26 +1,67 @@
 from typing import Dict, List, Optional, Any
+import hashlib
+import json
+
 import stripe
 
 from app.core.config import settings
 
-# Initialize Stripe with API key
-stripe.api_key = settings.STRIPE_API_KEY
+
+def create_stripe_client(http_client: Optional[stripe.HTTPClient] = None) -> stripe.StripeClient:
+    """
+    Create a Stripe client from Settings. STRIPE_API_BASE points it at
+    another API host, e.g. a local stripe-mock.
+
+    Args:
+        http_client: HTTP client the SDK sends requests through; defaults to
+            a requests client with STRIPE_TIMEOUT, keeping one pooled
+            session per thread
+
+    Returns:
+        StripeClient object
+    """
+    if http_client is None:
+        http_client = stripe.RequestsClient(timeout=settings.STRIPE_TIMEOUT)
+    base_addresses = {"api": settings.STRIPE_API_BASE} if settings.STRIPE_API_BASE else None
+
+    return stripe.StripeClient(
+        settings.STRIPE_API_KEY,
+        base_addresses=base_addresses,
+        max_network_retries=settings.STRIPE_MAX_NETWORK_RETRIES,
+        http_client=http_client,
+    )
+
+
+def payment_intent_idempotency_key(**fields: Any) -> str:
+    """
+    Idempotency key of a payment intent for the given fields (e.g. the
+    trademark, user, payment type and amount), so a retried request gets the
+    intent Stripe already created instead of a second one. Stripe keeps keys
+    for 24 hours.
+    """
+    payload = json.dumps(fields, sort_keys=True, default=str)
+    return f"payment-intent-{hashlib.sha256(payload.encode()).hexdigest()}"
 
 
 def create_payment_intent(
+    client: stripe.StripeClient,
     amount: float,
     currency: str = "usd",
     payment_method_types: Optional[List[str]] = None,
-    metadata: Optional[Dict[str, str]] = None
+    metadata: Optional[Dict[str, str]] = None,
+    idempotency_key: Optional[str] = None
 ) -> Any:
     """
     Create a payment intent with Stripe.
     
     Args:
+        client: Stripe client sending the request
         amount: Amount to charge (in the smallest currency unit, e.g., cents for USD)
         currency: Three-letter ISO currency code
         payment_method_types: List of payment method types to include
         metadata: Additional metadata to attach to the payment intent
+        idempotency_key: Stripe idempotency key; a request repeated with the
+            same key returns the intent of the first one
     
     Returns:
         Stripe PaymentIntent object
@@ -33,17 +74,21 @@ def create_payment_intent(
         payment_method_types = ["card"]
     
     # Create the payment intent
-    payment_intent = stripe.PaymentIntent.create(
-        amount=amount_in_cents,
-        currency=currency,
-        payment_method_types=payment_method_types,
-        metadata=metadata
-    )
+    params: Dict[str, Any] = {
+        "amount": amount_in_cents,
+        "currency": currency,
+        "payment_method_types": payment_method_types,
+    }
+    if metadata:
+        params["metadata"] = metadata
+    options: Dict[str, Any] = {"idempotency_key": idempotency_key} if idempotency_key else {}
+    payment_intent = client.v1.payment_intents.create(params=params, options=options)
     
     return payment_intent
 
 
 def confirm_payment_intent(
+    client: stripe.StripeClient,
     payment_intent_id: str,
     payment_method_id: str
 ) -> Any:
@@ -51,15 +96,16 @@ def confirm_payment_intent(
     Confirm a payment intent with a specific payment method.
     
     Args:
+        client: Stripe client sending the request
         payment_intent_id: The ID of the payment intent to confirm
         payment_method_id: The ID of the payment method to use
     
     Returns:
         Updated Stripe PaymentIntent object
     """
-    payment_intent = stripe.PaymentIntent.confirm(
+    payment_intent = client.v1.payment_intents.confirm(
         payment_intent_id,
-        payment_method=payment_method_id
+        params={"payment_method": payment_method_id}
     )
     
     return payment_intent
@@ -0,0 +1,169 @@
+from typing import Any, Dict, List, Optional
+import asyncio
+import logging
+
+from app import crud
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.schemas.payment import PaymentWebhookEvent
+from app.services.stripe_service import create_webhook_event
+
+logger = logging.getLogger(__name__)
+
+# Attempts at applying a batch before its events are given up on
+_APPLY_ATTEMPTS = 3
+
+
+class WebhookQueueFullError(Exception):
+    """The payment event queue is full; Stripe redelivers on a non-2xx answer"""
+
+    def __init__(self, retry_after: float) -> None:
+        super().__init__("Too many webhook events queued, please retry")
+        self.retry_after = retry_after
+
+
+def parse_webhook_event(payload: bytes, signature: Optional[str]) -> PaymentWebhookEvent:
+    """
+    Verify the signature of a webhook payload and keep what the payment
+    worker needs. Raises ValueError for a malformed payload and
+    stripe.SignatureVerificationError for a bad signature.
+    """
+    event = create_webhook_event(payload, signature)
+    obj = event.data.object
+    # payment_intent.* events carry the intent itself, charge.* events its id
+    if getattr(obj, "object", None) == "payment_intent":
+        payment_intent_id = obj.id
+    else:
+        payment_intent_id = getattr(obj, "payment_intent", None)
+    return PaymentWebhookEvent(
+        id=event.id,
+        type=event.type,
+        created=event.created,
+        payment_intent_id=payment_intent_id,
+    )
+
+
+def _apply_batch(events: List[PaymentWebhookEvent]) -> Dict[str, int]:
+    db = SessionLocal()
+    try:
+        return crud.payment.apply_webhook_events(db, events=events)
+    finally:
+        db.close()
+
+
+class PaymentEventProcessor:
+    """
+    Queue between the webhook endpoint and the database.
+
+    The endpoint only verifies and enqueues, so a burst of events costs one
+    queue insert per request. A single worker task takes up to `batch_size`
+    events, waiting at most `batch_wait` seconds for a batch to fill, and
+    applies each batch in one transaction off the event loop. Past
+    `max_queue` waiting events the endpoint answers 503 and Stripe retries
+    later.
+    """
+
+    def __init__(self, max_queue: int, batch_size: int, batch_wait: float) -> None:
+        self.max_queue = max_queue
+        self.batch_size = batch_size
+        self.batch_wait = batch_wait
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.received = 0
+        self.rejected = 0
+        self.batches = 0
+        self.new = 0
+        self.duplicates = 0
+        self.stale = 0
+        self.updated = 0
+        self.failed = 0
+
+    def start(self) -> None:
+        if self._worker is None or self._worker.done():
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._worker = asyncio.create_task(self._run())
+
+    def enqueue(self, event: PaymentWebhookEvent) -> None:
+        self.start()
+        try:
+            self._queue.put_nowait(event)
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise WebhookQueueFullError(retry_after=5.0)
+        self.received += 1
+
+    async def _next_batch(self) -> List[PaymentWebhookEvent]:
+        batch = [await self._queue.get()]
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + self.batch_wait
+        while len(batch) < self.batch_size:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+            except asyncio.TimeoutError:
+                break
+        return batch
+
+    async def _apply(self, batch: List[PaymentWebhookEvent]) -> None:
+        for attempt in range(1, _APPLY_ATTEMPTS + 1):
+            try:
+                counts = await asyncio.to_thread(_apply_batch, batch)
+            except Exception as e:
+                if attempt == _APPLY_ATTEMPTS:
+                    self.failed += len(batch)
+                    logger.error(
+                        "Giving up on Stripe events %s: %s", ", ".join(event.id for event in batch), e
+                    )
+                    return
+                logger.warning("Applying %s Stripe events failed, retrying: %s", len(batch), e)
+                await asyncio.sleep(attempt)
+            else:
+                self.batches += 1
+                self.new += counts["new"]
+                self.duplicates += counts["duplicates"]
+                self.stale += counts["stale"]
+                self.updated += counts["updated"]
+                return
+
+    async def _run(self) -> None:
+        while True:
+            batch = await self._next_batch()
+            try:
+                await self._apply(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    async def stop(self, timeout: float = 10.0) -> None:
+        """Apply the events still queued, for at most `timeout` seconds"""
+        if self._worker is None:
+            return
+        try:
+            await asyncio.wait_for(self._queue.join(), timeout)
+        except asyncio.TimeoutError:
+            logger.warning("Stopping with %s Stripe events unapplied", self._queue.qsize())
+        self._worker.cancel()
+        self._worker = None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_queue": self.max_queue,
+            "received": self.received,
+            "rejected": self.rejected,
+            "batches": self.batches,
+            "new": self.new,
+            "duplicates": self.duplicates,
+            "stale": self.stale,
+            "payments_updated": self.updated,
+            "failed": self.failed,
+        }
+
+
+payment_events = PaymentEventProcessor(
+    max_queue=settings.STRIPE_WEBHOOK_QUEUE_SIZE,
+    batch_size=settings.STRIPE_WEBHOOK_BATCH_SIZE,
+    batch_wait=settings.STRIPE_WEBHOOK_BATCH_WAIT,
+)
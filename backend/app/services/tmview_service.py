@@ -1,12 +1,15 @@
 from typing import Dict, List, Optional, Any
-import httpx
 from datetime import datetime
 
+from app.core.cache import search_cache
 from app.core.config import settings
+from app.core.http_client import request_json
 from app.schemas.trademark import TrademarkSearchResult, TrademarkSearchResponse
 from app.models.trademark import TrademarkType, TrademarkStatus
+from app.services.similarity_service import rank_results, score_candidates
 
 
+@search_cache.cached("tmview")
 async def search_tmview(
     query: str,
     jurisdiction: Optional[str] = None,
@@ -15,12 +18,8 @@ async def search_tmview(
     """
     Search for trademarks in TMview database.
     
-    This is a placeholder implementation that will be replaced with actual
-    TMview API integration when available.
+    Returns mock data when TMVIEW_API_URL is not configured.
     """
-    # Placeholder for actual TMview API call
-    # In a real implementation, this would make an HTTP request to the TMview API
-    
     # Construct the API URL
     url = f"{settings.TMVIEW_API_URL}/search"
     
@@ -35,100 +34,64 @@ async def search_tmview(
     if nice_classes:
         params["classes"] = ",".join(map(str, nice_classes))
     
-    # Make the API request
-    # In a real implementation, this would be:
-    # async with httpx.AsyncClient() as client:
-    #     response = await client.get(url, params=params)
-    #     response.raise_for_status()
-    #     return response.json()
-    
-    # For now, return mock data with proper schema validation
-    try:
-        # In a real implementation, this would make an actual API call
-        if not settings.TMVIEW_API_URL:
-            # Return mock data when no API URL is configured
-            mock_results = [
-                TrademarkSearchResult(
-                    id="tm-123456",
-                    name=query.upper(),
-                    type=TrademarkType.WORD,
-                    status=TrademarkStatus.REGISTERED,
-                    jurisdiction=jurisdiction or "US",
-                    nice_classes=nice_classes or [9, 42],
-                    goods_services="Computer software; SaaS services",
-                    application_number="TM123456",
-                    registration_number="REG987654",
-                    filing_date=datetime(2023, 1, 15),
-                    registration_date=datetime(2023, 6, 20),
-                    similarity_score=0.95,
-                    source="TMview"
-                ),
-                TrademarkSearchResult(
-                    id="tm-789012",
-                    name=f"{query.upper()} PLUS",
-                    type=TrademarkType.COMBINED,
-                    status=TrademarkStatus.UNDER_EXAMINATION,
-                    jurisdiction=jurisdiction or "EU",
-                    nice_classes=nice_classes or [9, 35, 42],
-                    goods_services="Mobile applications; Business consulting",
-                    application_number="TM789012",
-                    filing_date=datetime(2022, 11, 5),
-                    similarity_score=0.78,
-                    source="TMview"
-                )
-            ]
-            
-            return TrademarkSearchResponse(
-                results=mock_results,
-                total_results=len(mock_results),
-                query=query,
-                jurisdiction=jurisdiction,
-                nice_classes=nice_classes
+    if not settings.TMVIEW_API_URL:
+        # Return mock data when no API URL is configured
+        mock_results = [
+            TrademarkSearchResult(
+                id="tm-123456",
+                name=query.upper(),
+                type=TrademarkType.WORD,
+                status=TrademarkStatus.REGISTERED,
+                jurisdiction=jurisdiction or "US",
+                nice_classes=nice_classes or [9, 42],
+                goods_services="Computer software; SaaS services",
+                application_number="TM123456",
+                registration_number="REG987654",
+                filing_date=datetime(2023, 1, 15),
+                registration_date=datetime(2023, 6, 20),
+                source="TMview"
+            ),
+            TrademarkSearchResult(
+                id="tm-789012",
+                name=f"{query.upper()} PLUS",
+                type=TrademarkType.COMBINED,
+                status=TrademarkStatus.UNDER_EXAMINATION,
+                jurisdiction=jurisdiction or "EU",
+                nice_classes=nice_classes or [9, 35, 42],
+                goods_services="Mobile applications; Business consulting",
+                application_number="TM789012",
+                filing_date=datetime(2022, 11, 5),
+                source="TMview"
             )
+        ]
+        mock_results = rank_results(query, mock_results)
         
-        # Real API implementation would go here
-        # async with httpx.AsyncClient() as client:
-        #     response = await client.get(url, params=params)
-        #     response.raise_for_status()
-        #     data = response.json()
-        #     # Transform API response to our schema format
-        #     return TrademarkSearchResponse(...)
-        
-        return TrademarkSearchResponse(
-            results=[],
-            total_results=0,
-            query=query,
-            jurisdiction=jurisdiction,
-            nice_classes=nice_classes
-        )
-        
-    except Exception as e:
-        # Log the error in a real implementation
-        print(f"TMview search error: {e}")
         return TrademarkSearchResponse(
-            results=[],
-            total_results=0,
+            results=mock_results,
+            total_results=len(mock_results),
             query=query,
             jurisdiction=jurisdiction,
             nice_classes=nice_classes
         )
+    
+    data = await request_json("tmview", "GET", url, params=params)
+    results = rank_results(query, [
+        TrademarkSearchResult.model_validate({**item, "source": "TMview"})
+        for item in data.get("results", [])
+    ])
+    
+    return TrademarkSearchResponse(
+        results=results,
+        total_results=len(results),
+        query=query,
+        jurisdiction=jurisdiction,
+        nice_classes=nice_classes
+    )
 
 
 def calculate_similarity_score(query: str, trademark_name: str) -> float:
     """
     Calculate similarity score between search query and trademark name.
-    This is a simplified implementation - in practice, you'd use more sophisticated
-    string similarity algorithms.
+    To score many names at once, use similarity_service.score_candidates.
     """
-    query_lower = query.lower()
-    trademark_lower = trademark_name.lower()
-    
-    if query_lower == trademark_lower:
-        return 1.0
-    elif query_lower in trademark_lower or trademark_lower in query_lower:
-        return 0.8
-    else:
-        # Simple character-based similarity
-        common_chars = set(query_lower) & set(trademark_lower)
-        all_chars = set(query_lower) | set(trademark_lower)
-        return len(common_chars) / len(all_chars) if all_chars else 0.0
\ No newline at end of file
+    return float(score_candidates(query, [trademark_name])[0])
\ No newline at end of file
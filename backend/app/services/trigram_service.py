@@ -0,0 +1,100 @@
+from typing import Dict, FrozenSet, Hashable, List, Optional, Set, Tuple
+from collections import Counter
+import re
+
+# Same default as PostgreSQL's pg_trgm.similarity_threshold
+DEFAULT_SIMILARITY_THRESHOLD = 0.3
+
+# pg_trgm treats every non-alphanumeric character as a word separator
+_WORD_RE = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def trigrams(text: str) -> FrozenSet[str]:
+    """
+    Extract the trigram set of a string the way pg_trgm does.
+
+    Each word is lowercased and padded with two leading blanks and one
+    trailing blank, so "nike" yields "  n", " ni", "nik", "ike", "ke ".
+    """
+    grams: Set[str] = set()
+    for word in _WORD_RE.findall(text.lower()):
+        padded = f"  {word} "
+        for i in range(len(padded) - 2):
+            grams.add(padded[i:i + 3])
+    return frozenset(grams)
+
+
+def trigram_similarity(a: str, b: str) -> float:
+    """
+    Trigram similarity of two strings, equivalent to pg_trgm's similarity().
+    """
+    grams_a = trigrams(a)
+    grams_b = trigrams(b)
+    if not grams_a or not grams_b:
+        return 0.0
+    shared = len(grams_a & grams_b)
+    return shared / (len(grams_a) + len(grams_b) - shared)
+
+
+class TrigramIndex:
+    """
+    In-process inverted trigram index.
+
+    Stands in for the GIN pg_trgm index when the database is not PostgreSQL
+    (e.g. SQLite in tests): only entries sharing at least one trigram with
+    the query are scored, and results are ranked like `name % query` ordered
+    by similarity().
+    """
+
+    def __init__(self) -> None:
+        self._postings: Dict[str, Set[Hashable]] = {}
+        self._grams: Dict[Hashable, FrozenSet[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._grams)
+
+    def add(self, key: Hashable, text: str) -> None:
+        if key in self._grams:
+            self.remove(key)
+        grams = trigrams(text)
+        self._grams[key] = grams
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(key)
+
+    def remove(self, key: Hashable) -> None:
+        for gram in self._grams.pop(key, frozenset()):
+            keys = self._postings.get(gram)
+            if keys is None:
+                continue
+            keys.discard(key)
+            if not keys:
+                del self._postings[gram]
+
+    def search(
+        self,
+        query: str,
+        threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        limit: Optional[int] = None
+    ) -> List[Tuple[Hashable, float]]:
+        """
+        Return (key, similarity) pairs at or above the threshold, best first.
+        """
+        query_grams = trigrams(query)
+        if not query_grams:
+            return []
+
+        shared: Counter = Counter()
+        for gram in query_grams:
+            shared.update(self._postings.get(gram, ()))
+
+        matches = []
+        for key, common in shared.items():
+            union = len(query_grams) + len(self._grams[key]) - common
+            score = common / union
+            if score >= threshold:
+                matches.append((key, score))
+
+        matches.sort(key=lambda match: match[1], reverse=True)
+        if limit is not None:
+            matches = matches[:limit]
+        return matches
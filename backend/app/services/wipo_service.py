@@ -1,10 +1,12 @@
 from typing import Dict, List, Optional, Any
-import httpx
 from datetime import datetime
 
+from app.core.cache import search_cache
 from app.core.config import settings
+from app.core.http_client import request_json
 
 
+@search_cache.cached("wipo")
 async def search_wipo(
     query: str,
     nice_classes: Optional[List[int]] = None,
@@ -13,12 +15,8 @@ async def search_wipo(
     """
     Search for trademarks in the WIPO Madrid System database.
     
-    This is a placeholder implementation that will be replaced with actual
-    WIPO API integration when available.
+    Returns mock data when WIPO_API_URL is not configured.
     """
-    # Placeholder for actual WIPO API call
-    # In a real implementation, this would make an HTTP request to the WIPO API
-    
     # Construct the API URL
     url = f"{settings.WIPO_API_URL}/search"
     
@@ -33,14 +31,11 @@ async def search_wipo(
     if designated_countries:
         params["countries"] = ",".join(designated_countries)
     
-    # Make the API request
-    # In a real implementation, this would be:
-    # async with httpx.AsyncClient() as client:
-    #     response = await client.get(url, params=params)
-    #     response.raise_for_status()
-    #     return response.json()
+    # Make the API request through the shared connection pool
+    if settings.WIPO_API_URL:
+        return await request_json("wipo", "GET", url, params=params)
     
-    # For now, return mock data
+    # Return mock data when no API URL is configured
     return {
         "total_results": 3,
         "results": [
@@ -180,23 +175,16 @@ async def submit_madrid_application(
     """
     Submit an international trademark application via the Madrid System.
     
-    This is a placeholder implementation that will be replaced with actual
-    WIPO API integration when available.
+    Returns mock data when WIPO_API_URL is not configured.
     """
-    # Placeholder for actual WIPO API call
-    # In a real implementation, this would make an HTTP request to the WIPO API
-    
     # Construct the API URL
     url = f"{settings.WIPO_API_URL}/applications"
     
-    # Make the API request
-    # In a real implementation, this would be:
-    # async with httpx.AsyncClient() as client:
-    #     response = await client.post(url, json=application_data)
-    #     response.raise_for_status()
-    #     return response.json()
+    # Make the API request through the shared connection pool
+    if settings.WIPO_API_URL:
+        return await request_json("wipo", "POST", url, json=application_data)
     
-    # For now, return mock data
+    # Return mock data when no API URL is configured
     return {
         "application_id": "MM2-2023-12345",
         "submission_date": datetime.now().isoformat(),
@@ -221,23 +209,16 @@ async def check_madrid_application_status(
     """
     Check the status of an international trademark application via the Madrid System.
     
-    This is a placeholder implementation that will be replaced with actual
-    WIPO API integration when available.
+    Returns mock data when WIPO_API_URL is not configured.
     """
-    # Placeholder for actual WIPO API call
-    # In a real implementation, this would make an HTTP request to the WIPO API
-    
     # Construct the API URL
     url = f"{settings.WIPO_API_URL}/applications/{application_id}/status"
     
-    # Make the API request
-    # In a real implementation, this would be:
-    # async with httpx.AsyncClient() as client:
-    #     response = await client.get(url)
-    #     response.raise_for_status()
-    #     return response.json()
+    # Make the API request through the shared connection pool
+    if settings.WIPO_API_URL:
+        return await request_json("wipo", "GET", url)
     
-    # For now, return mock data
+    # Return mock data when no API URL is configured
     return {
         "application_id": application_id,
         "status": "PROCESSING",
@@ -0,0 +1,117 @@
+from typing import Callable, List
+import asyncio
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import NullPool
+import httpx
+import pytest
+
+from app import models
+from app.api import deps
+from app.core.cache import search_cache
+from app.core.config import settings
+from app.core.http_client import http_clients
+from app.core.principal import Principal
+from app.core.resilience import office_guards
+from app.db.base import Base
+from app.db.routing import RoutingSession
+from app.main import app
+
+OFFICE_URL_SETTINGS = ("TMVIEW_API_URL", "EUIPO_API_URL", "WIPO_API_URL", "OBI_API_URL")
+
+# The user every request of the `api` client is authenticated as
+OWNER = Principal(id="owner", email="owner@example.com", is_active=True, is_superuser=False)
+
+
+class MockOffice:
+    """
+    Stand-in for the external offices behind httpx.MockTransport: records
+    every request that reaches it and answers with `handler` after `delay`
+    seconds.
+    """
+
+    def __init__(self) -> None:
+        self.requests: List[httpx.Request] = []
+        self.delay = 0.0
+        self.handler: Callable[[httpx.Request], httpx.Response] = (
+            lambda request: httpx.Response(200, json={"total_results": 0, "results": []})
+        )
+
+    async def __call__(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(request)
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.handler(request)
+
+
+@pytest.fixture
+async def mock_office(monkeypatch):
+    """Point every office at https://<office>.test, answered by a MockOffice"""
+    office = MockOffice()
+    for name in OFFICE_URL_SETTINGS:
+        monkeypatch.setattr(settings, name, f"https://{name.split('_')[0].lower()}.test")
+    await http_clients.reset(httpx.MockTransport(office))
+    search_cache.clear()
+    office_guards.reset()
+    yield office
+    await http_clients.reset()
+    search_cache.clear()
+    office_guards.reset()
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """Sessions on a fresh SQLite database holding the OWNER user"""
+    engine = create_engine(f"sqlite:///{tmp_path / 'test.db'}")
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine, class_=RoutingSession)
+    with factory() as db:
+        db.add(models.User(id=OWNER.id, email=OWNER.email, hashed_password="x", is_active=True))
+        db.commit()
+    yield factory
+    engine.dispose()
+
+
+@pytest.fixture
+async def async_session_factory(session_factory):
+    """
+    AsyncSessions on the database of session_factory. Unpooled, since the
+    test and the app served by the `api` client run on different event loops.
+    """
+    url = session_factory.kw["bind"].url.set(drivername="sqlite+aiosqlite")
+    engine = create_async_engine(url, poolclass=NullPool)
+    yield async_sessionmaker(engine, sync_session_class=RoutingSession, expire_on_commit=False)
+    await engine.dispose()
+
+
+@pytest.fixture
+def db(session_factory):
+    with session_factory() as session:
+        yield session
+
+
+@pytest.fixture
+def api(session_factory, async_session_factory):
+    """
+    Client of the app on the SQLite database, authenticated as OWNER;
+    unhandled errors come back as 500 responses
+    """
+    def get_db():
+        with session_factory() as session:
+            yield session
+
+    async def get_async_db():
+        async with async_session_factory() as session:
+            yield session
+
+    app.dependency_overrides[deps.get_db] = get_db
+    app.dependency_overrides[deps.get_async_db] = get_async_db
+    app.dependency_overrides[deps.get_current_active_principal] = lambda: OWNER
+    try:
+        with TestClient(app, raise_server_exceptions=False) as client:
+            yield client
+    finally:
+        app.dependency_overrides.clear()
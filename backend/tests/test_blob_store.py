@@ -0,0 +1,108 @@
+import hashlib
+import io
+import os
+
+import pytest
+
+from app.core.blob_store import ContentAddressedStore
+from app.models.document import DocumentType
+from app.services import document_service
+
+from tests.conftest import OWNER
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ContentAddressedStore(root=str(tmp_path / "documents"), chunk_size=4)
+    monkeypatch.setattr(document_service, "document_store", store)
+    return store
+
+
+def stored_files(store):
+    return sorted(path for path in store.root.rglob("*") if path.is_file())
+
+
+def test_put_stores_content_under_its_hash(store):
+    content = b"trademark certificate"
+    blob = store.put(io.BytesIO(content))
+
+    content_hash = hashlib.sha256(content).hexdigest()
+    assert (blob.content_hash, blob.size, blob.created) == (content_hash, len(content), True)
+    assert blob.path == store.root / content_hash[:2] / content_hash[2:4] / content_hash
+    with store.open(content_hash) as f:
+        assert f.read() == content
+
+
+def test_identical_content_is_stored_once(store):
+    first = store.put(io.BytesIO(b"same bytes"))
+    second = store.put(io.BytesIO(b"same bytes"))
+    other = store.put(io.BytesIO(b"other bytes"))
+
+    assert (first.created, second.created, other.created) == (True, False, True)
+    assert first.path == second.path
+    assert stored_files(store) == sorted([first.path, other.path])
+
+
+def test_aborted_writer_leaves_nothing(store):
+    writer = store.writer()
+    writer.write(b"partial upload")
+    staged = writer.staged_path()
+    writer.abort()
+
+    assert not os.path.exists(staged)
+    assert stored_files(store) == []
+    assert not store.exists(hashlib.sha256(b"partial upload").hexdigest())
+    # A second abort is harmless
+    writer.abort()
+
+
+def test_failed_put_removes_its_temporary_file(store):
+    class BrokenUpload(io.BytesIO):
+        def read(self, size=-1):
+            if self.tell() >= 8:
+                raise OSError("connection reset")
+            return super().read(size)
+
+    with pytest.raises(OSError):
+        store.put(BrokenUpload(b"interrupted upload"))
+
+    assert stored_files(store) == []
+
+
+@pytest.mark.parametrize("content_hash", ["../../etc/passwd", "ABC", "0" * 63, "g" * 64])
+def test_invalid_hashes_are_rejected(store, content_hash):
+    with pytest.raises(ValueError):
+        store.path(content_hash)
+
+
+async def test_store_and_retrieve_document(store, async_session_factory):
+    async with async_session_factory() as db:
+        first = await document_service.store_document(
+            db, b"%PDF-1.7 certificate", "certificate.pdf", DocumentType.CERTIFICATE, OWNER.id
+        )
+        second = await document_service.store_document(
+            db, io.BytesIO(b"%PDF-1.7 certificate"), "copy.pdf", DocumentType.CERTIFICATE, OWNER.id
+        )
+
+        assert (first["deduplicated"], second["deduplicated"]) == (False, True)
+        assert first["document_id"] != second["document_id"]
+        assert first["content_hash"] == second["content_hash"]
+        assert len(stored_files(store)) == 1
+
+        document = await document_service.retrieve_document(db, second["document_id"])
+
+    assert document["content"] == b"%PDF-1.7 certificate"
+    assert (document["filename"], document["size_bytes"]) == ("copy.pdf", 20)
+    assert document["storage_path"] == first["storage_path"]
+
+
+async def test_retrieve_missing_document(store, async_session_factory):
+    async with async_session_factory() as db:
+        assert await document_service.retrieve_document(db, "no-such-document") is None
+
+        stored = await document_service.store_document(
+            db, b"lost on disk", "lost.txt", DocumentType.OTHER, OWNER.id
+        )
+        store.path(stored["content_hash"]).unlink()
+
+        assert await document_service.retrieve_document(db, stored["document_id"]) is None
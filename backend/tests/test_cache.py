@@ -0,0 +1,112 @@
+from typing import Any, Dict
+import json
+import time
+
+from app.core.cache import DiskCache, TieredCache
+from app.schemas.trademark import TrademarkSearchResponse, TrademarkSearchResult
+
+
+class MemoryCache:
+    """Shared tier in a dict, ignoring expiry"""
+
+    def __init__(self) -> None:
+        self.entries = {}
+
+    async def get(self, key):
+        return self.entries.get(key)
+
+    async def set(self, key, value, ttl):
+        self.entries[key] = value
+
+
+def make_cache(shared):
+    return TieredCache(max_entries=10, ttls={"default": 60.0}, stale_ttl=0.0, shared=shared)
+
+
+async def test_shared_entries_are_reused_across_workers():
+    shared = MemoryCache()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        return {"results": ["nike"]}
+
+    assert await make_cache(shared).get_or_load("euipo", "k", load) == {"results": ["nike"]}
+    other_worker = make_cache(shared)
+    assert await other_worker.get_or_load("euipo", "k", load) == {"results": ["nike"]}
+
+    assert len(calls) == 1
+    assert other_worker.stats()["sources"]["euipo"]["shared_hits"] == 1
+
+
+async def test_unreadable_shared_entry_is_a_miss():
+    shared = MemoryCache()
+    shared.entries["corrupt"] = b"not json"
+    shared.entries["incompatible"] = json.dumps(["value without a timestamp"]).encode()
+    cache = make_cache(shared)
+
+    async def load():
+        return "fresh"
+
+    assert await cache.get_or_load("euipo", "corrupt", load) == "fresh"
+    assert await cache.get_or_load("euipo", "incompatible", load) == "fresh"
+    assert cache.stats()["sources"]["euipo"]["misses"] == 2
+    # The miss replaced the bad entry
+    assert json.loads(shared.entries["corrupt"])[1] == "fresh"
+
+
+async def test_shared_entries_are_read_back_as_the_return_type():
+    shared = MemoryCache()
+    response = TrademarkSearchResponse(
+        query="nike", total_results=1,
+        results=[TrademarkSearchResult(name="Nike", type="word", status="registered", jurisdiction="EU", source="TMview")],
+    )
+
+    def cached_search(cache):
+        @cache.cached("tmview")
+        async def search(query: str) -> TrademarkSearchResponse:
+            return response
+
+        @cache.cached("euipo")
+        async def search_euipo(query: str) -> Dict[str, Any]:
+            return {"results": [{"name": "Nike"}]}
+
+        return search, search_euipo
+
+    await cached_search(make_cache(shared))[0]("nike")
+    await cached_search(make_cache(shared))[1]("nike")
+    search, search_euipo = cached_search(make_cache(shared))
+
+    assert await search("nike") == response
+    assert await search_euipo("nike") == {"results": [{"name": "Nike"}]}
+    assert all(value.startswith(b"[") for value in shared.entries.values())
+
+
+async def test_pickles_in_the_shared_tier_are_not_loaded():
+    import pickle
+
+    class Exploit:
+        def __reduce__(self):
+            return (exec, ("raise SystemExit('unpickled')",))
+
+    shared = MemoryCache()
+    shared.entries["k"] = pickle.dumps((Exploit(), time.time()))
+
+    async def load():
+        return "fresh"
+
+    assert await make_cache(shared).get_or_load("euipo", "k", load) == "fresh"
+
+
+async def test_disk_cache_expires_entries(tmp_path):
+    cache = DiskCache(str(tmp_path))
+
+    await cache.set("live", b'[1.0, "x"]', ttl=60)
+    await cache.set("expired", b'[1.0, "x"]', ttl=-1)
+    with open(cache._path("truncated"), "wb") as f:
+        f.write(b"\x00")
+
+    assert await cache.get("live") == b'[1.0, "x"]'
+    assert await cache.get("expired") is None
+    assert await cache.get("missing") is None
+    assert await cache.get("truncated") is None
@@ -0,0 +1,219 @@
+import hashlib
+import io
+import os
+import threading
+import time
+import uuid
+
+import httpx
+import pytest
+import uvicorn
+
+from app import crud, models
+from app.api import deps
+from app.core.blob_store import document_store
+from app.main import app
+from app.models.document import DocumentType
+
+from tests.conftest import OWNER
+
+CONTENT = b"0123456789abcdefghij"
+LARGE_SIZE = 300 * 1024 * 1024
+
+
+@pytest.fixture
+def store_document(session_factory, monkeypatch, tmp_path):
+    """Store content in a temporary document store and return its Document"""
+    monkeypatch.setattr(document_store, "root", tmp_path / "documents")
+    monkeypatch.setattr(document_store, "tmp_dir", tmp_path / "documents" / "tmp")
+
+    # The endpoint reads Documents through the async CRUD; serve it from SQLite
+    async def get(db, id):
+        with session_factory() as session:
+            return session.get(models.Document, id)
+
+    monkeypatch.setattr(crud.async_document, "get", get)
+    app.dependency_overrides[deps.get_async_db] = lambda: None
+
+    def store(source, file_name="evidence.pdf", user_id=OWNER.id):
+        blob = document_store.put(io.BytesIO(source) if isinstance(source, bytes) else source)
+        with session_factory() as session:
+            document = models.Document(
+                id=str(uuid.uuid4()),
+                user_id=user_id,
+                type=DocumentType.OTHER,
+                title=file_name,
+                file_path=document_store.relative_path(blob.content_hash),
+                file_name=file_name,
+                file_size=str(blob.size),
+                file_type="application/pdf",
+                content_hash=blob.content_hash,
+            )
+            session.add(document)
+            session.commit()
+            session.refresh(document)
+            return document
+
+    return store
+
+
+def url(document):
+    return f"/api/v1/documents/{document.id}/download"
+
+
+def test_download(api, store_document):
+    document = store_document(CONTENT)
+
+    response = api.get(url(document))
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+    assert response.headers["etag"] == f'"{hashlib.sha256(CONTENT).hexdigest()}"'
+    assert response.headers["content-type"] == "application/pdf"
+    assert response.headers["accept-ranges"] == "bytes"
+    assert 'filename="evidence.pdf"' in response.headers["content-disposition"]
+
+
+def test_head_sends_headers_only(api, store_document):
+    document = store_document(CONTENT)
+
+    response = api.head(url(document))
+
+    assert response.status_code == 200
+    assert response.headers["content-length"] == str(len(CONTENT))
+    assert response.content == b""
+
+
+def test_partial_range(api, store_document):
+    document = store_document(CONTENT)
+
+    response = api.get(url(document), headers={"Range": "bytes=2-5"})
+
+    assert response.status_code == 206
+    assert response.content == b"2345"
+    assert response.headers["content-range"] == f"bytes 2-5/{len(CONTENT)}"
+
+
+def test_suffix_range(api, store_document):
+    document = store_document(CONTENT)
+
+    response = api.get(url(document), headers={"Range": "bytes=-3"})
+
+    assert response.status_code == 206
+    assert response.content == b"hij"
+
+
+def test_multiple_ranges(api, store_document):
+    document = store_document(CONTENT)
+
+    response = api.get(url(document), headers={"Range": "bytes=0-1, 10-12"})
+
+    assert response.status_code == 206
+    assert response.headers["content-type"].startswith("multipart/byteranges; boundary=")
+    assert f"Content-Range: bytes 0-1/{len(CONTENT)}\r\n\r\n01\r\n".encode() in response.content
+    assert f"Content-Range: bytes 10-12/{len(CONTENT)}\r\n\r\nabc\r\n".encode() in response.content
+
+
+def test_unsatisfiable_range(api, store_document):
+    document = store_document(CONTENT)
+
+    response = api.get(url(document), headers={"Range": f"bytes={len(CONTENT)}-"})
+
+    assert response.status_code == 416
+    assert response.headers["content-range"] == f"bytes */{len(CONTENT)}"
+
+
+def test_if_range_with_another_etag_sends_everything(api, store_document):
+    document = store_document(CONTENT)
+
+    response = api.get(url(document), headers={"Range": "bytes=2-5", "If-Range": '"stale"'})
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+@pytest.mark.parametrize("if_none_match", [
+    '"{etag}"',
+    'W/"{etag}"',
+    '"other", W/"{etag}"',
+    "*",
+])
+def test_if_none_match_is_not_modified(api, store_document, if_none_match):
+    document = store_document(CONTENT)
+    etag = document.content_hash
+
+    response = api.get(url(document), headers={"If-None-Match": if_none_match.format(etag=etag)})
+
+    assert response.status_code == 304
+    assert response.headers["etag"] == f'"{etag}"'
+    assert response.content == b""
+
+
+def test_if_none_match_with_another_etag_sends_the_content(api, store_document):
+    document = store_document(CONTENT)
+
+    response = api.get(url(document), headers={"If-None-Match": 'W/"other"'})
+
+    assert response.status_code == 200
+    assert response.content == CONTENT
+
+
+def test_documents_of_other_users_are_refused(api, store_document, db):
+    db.add(models.User(id="other", email="other@example.com", hashed_password="x", is_active=True))
+    db.commit()
+    document = store_document(CONTENT, user_id="other")
+
+    assert api.get(url(document)).status_code == 400
+    assert api.get("/api/v1/documents/missing/download").status_code == 404
+
+
+class Zeros:
+    """File object reading `size` zero bytes"""
+
+    def __init__(self, size):
+        self.left = size
+
+    def read(self, n):
+        n = min(n, self.left)
+        self.left -= n
+        return bytes(n)
+
+
+def rss_bytes():
+    with open("/proc/self/statm") as f:
+        return int(f.read().split()[1]) * 4096
+
+
+@pytest.fixture
+def server(api):
+    """The app served by uvicorn on a free port, with the `api` overrides"""
+    config = uvicorn.Config(app, host="127.0.0.1", port=0, log_level="warning", lifespan="off")
+    server = uvicorn.Server(config)
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        time.sleep(0.01)
+    port = server.servers[0].sockets[0].getsockname()[1]
+    yield f"http://127.0.0.1:{port}"
+    server.should_exit = True
+    thread.join()
+
+
+@pytest.mark.skipif(not os.path.exists("/proc/self/statm"), reason="Reads the RSS from /proc")
+def test_large_download_streams_in_constant_memory(server, store_document):
+    document = store_document(Zeros(LARGE_SIZE), file_name="large.bin")
+    digest = hashlib.sha256()
+    received = 0
+    baseline = peak = rss_bytes()
+
+    with httpx.stream("GET", server + url(document), timeout=60) as response:
+        assert response.status_code == 200
+        for chunk in response.iter_raw(1024 * 1024):
+            digest.update(chunk)
+            received += len(chunk)
+            peak = max(peak, rss_bytes())
+
+    assert received == LARGE_SIZE
+    assert digest.hexdigest() == document.content_hash
+    # Server and client share this process; neither may hold the file
+    assert peak - baseline < 64 * 1024 * 1024
@@ -0,0 +1,104 @@
+import csv
+import io
+import json
+
+import pytest
+
+from app import crud, models, schemas
+from app.services import export_service
+from app.services.export_service import EXPORT_COLUMNS, export_trademarks
+from app.services.import_service import import_trademarks
+
+from tests.conftest import OWNER
+
+
+@pytest.fixture
+def sessions(session_factory, monkeypatch):
+    """Route the export's own sessions to the test database and track them"""
+    opened = []
+
+    def session(**kwargs):
+        db = session_factory(**kwargs)
+        opened.append(db)
+        return db
+
+    monkeypatch.setattr(export_service, "SessionLocal", session)
+    return opened
+
+
+@pytest.fixture
+def trademarks(db):
+    db.add(models.User(id="other", email="other@example.com", hashed_password="x", is_active=True))
+    db.commit()
+    marks = [
+        ("Nike", [9, 25], OWNER.id),
+        ("Adidas, Inc", None, OWNER.id),
+        ("Νίκη", [42], OWNER.id),
+        ("Puma", [25], "other"),
+    ]
+    return [
+        crud.trademark.create_with_owner(
+            db,
+            obj_in=schemas.TrademarkCreate(name=name, type="word", jurisdiction="GR", nice_classes=classes),
+            owner_id=owner_id,
+        ).id
+        for name, classes, owner_id in marks
+    ]
+
+
+def test_ndjson_export_of_one_owner(sessions, trademarks):
+    rows = [json.loads(line) for line in "".join(export_trademarks(OWNER.id, "ndjson")).splitlines()]
+
+    assert sorted(row["id"] for row in rows) == sorted(trademarks[:3])
+    assert list(rows[0]) == EXPORT_COLUMNS
+    assert {row["name"]: row["nice_classes"] for row in rows} == {"Nike": [9, 25], "Adidas, Inc": None, "Νίκη": [42]}
+    assert {row["type"] for row in rows} == {"word"}
+
+
+def test_csv_export_has_a_header_and_joins_classes(sessions, trademarks):
+    rows = list(csv.DictReader(io.StringIO("".join(export_trademarks(None, "csv")))))
+
+    assert len(rows) == 4
+    assert {row["name"]: row["nice_classes"] for row in rows}["Nike"] == "9;25"
+    assert {row["name"] for row in rows} >= {"Adidas, Inc", "Puma"}
+
+
+def test_export_streams_one_chunk_per_batch(sessions, trademarks, monkeypatch):
+    monkeypatch.setattr(export_service, "EXPORT_BATCH_SIZE", 2)
+
+    chunks = export_trademarks(None, "ndjson")
+    assert sessions == []  # Nothing is read before the body is iterated
+
+    assert [chunk.count("\n") for chunk in chunks] == [2, 2]
+    assert len(sessions) == 1
+
+
+def test_abandoned_export_closes_its_session(sessions, trademarks, monkeypatch):
+    monkeypatch.setattr(export_service, "EXPORT_BATCH_SIZE", 1)
+    chunks = export_trademarks(None, "csv")
+    next(chunks)
+    next(chunks)
+    assert sessions[0].get_transaction() is not None
+
+    chunks.close()
+
+    assert sessions[0].get_transaction() is None
+
+
+def test_export_can_be_imported_again(sessions, trademarks, db):
+    db.query(models.Trademark).update({"application_number": models.Trademark.id})
+    db.commit()
+    exported = "".join(export_trademarks(OWNER.id, "csv")).encode()
+
+    result = import_trademarks(db, io.BytesIO(exported), "csv", owner_id=OWNER.id)
+
+    assert (result.created, result.updated, result.failed) == (0, 3, 0)
+
+
+def test_export_endpoint(api, sessions, trademarks):
+    response = api.get("/api/v1/trademarks/export", params={"format": "csv"})
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("text/csv")
+    assert response.text.splitlines()[0].split(",") == EXPORT_COLUMNS
+    assert len(response.text.splitlines()) == 4
@@ -0,0 +1,135 @@
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from app.core.resilience import CircuitOpenError
+from app.schemas.trademark import SearchSourceState, TrademarkSearchQuery
+from app.services import federated_search_service
+from app.services.federated_search_service import SOURCES, federated_search
+
+QUERY = TrademarkSearchQuery(query="nike")
+
+
+@pytest.fixture
+def sources(monkeypatch):
+    """
+    Replace every source with a coroutine answering `answers[source]` after
+    `delays[source]` seconds; an exception as answer is raised instead.
+    """
+    delays = {source: 0.0 for source in SOURCES}
+    answers = {source: {"results": [{"name": "Nike"}]} for source in SOURCES}
+    cancelled = []
+
+    def make_call(source):
+        async def call():
+            try:
+                await asyncio.sleep(delays[source])
+            except asyncio.CancelledError:
+                cancelled.append(source)
+                raise
+            if isinstance(answers[source], Exception):
+                raise answers[source]
+            return answers[source]
+        return call
+
+    monkeypatch.setattr(
+        federated_search_service, "_source_calls", lambda search_query: {source: make_call(source) for source in SOURCES}
+    )
+    return delays, answers, cancelled
+
+
+def states(result):
+    return {status.source: status.status for status in result.statuses}
+
+
+async def test_all_sources_answer(sources):
+    result = await federated_search(QUERY, deadline=1.0)
+
+    assert set(result.payloads) == set(SOURCES)
+    assert set(states(result).values()) == {SearchSourceState.OK}
+    assert all(status.total_results == 1 for status in result.statuses)
+    assert not result.partial
+
+
+async def test_source_past_its_timeout_is_left_out(sources):
+    delays, _, cancelled = sources
+    delays["wipo"] = 1.0
+
+    result = await federated_search(QUERY, timeouts={"wipo": 0.05}, deadline=1.0)
+
+    assert states(result)["wipo"] == SearchSourceState.TIMEOUT
+    assert "wipo" not in result.payloads
+    assert set(result.payloads) == set(SOURCES) - {"wipo"}
+    assert cancelled == ["wipo"]
+    assert result.partial
+
+
+async def test_deadline_bounds_the_search(sources):
+    delays, _, cancelled = sources
+    delays["tmview"] = delays["obi"] = 5.0
+
+    started = time.perf_counter()
+    result = await federated_search(QUERY, timeouts={"tmview": 10.0, "obi": 10.0}, deadline=0.1)
+    elapsed = time.perf_counter() - started
+
+    assert elapsed < 1.0
+    assert states(result)["tmview"] == states(result)["obi"] == SearchSourceState.TIMEOUT
+    assert set(result.payloads) == {"local", "euipo", "wipo"}
+    # The cancelled calls unwind on the next turns of the loop
+    for _ in range(10):
+        await asyncio.sleep(0)
+    assert sorted(cancelled) == ["obi", "tmview"]
+
+
+async def test_failures_are_reported_per_source(sources):
+    _, answers, _ = sources
+    answers["euipo"] = CircuitOpenError("euipo", 30.0)
+    answers["obi"] = ValueError("bad payload")
+
+    result = await federated_search(QUERY, deadline=1.0)
+    statuses = {status.source: status for status in result.statuses}
+
+    assert statuses["euipo"].status == SearchSourceState.UNAVAILABLE
+    assert statuses["obi"].status == SearchSourceState.ERROR
+    assert statuses["obi"].error == "bad payload"
+    assert set(result.payloads) == {"local", "tmview", "wipo"}
+    assert result.partial
+
+
+async def test_only_requested_sources_are_called(sources):
+    result = await federated_search(QUERY, sources=["local", "euipo"], deadline=1.0)
+
+    assert [status.source for status in result.statuses] == ["local", "euipo"]
+
+
+async def test_slow_offices_miss_the_deadline(mock_office, monkeypatch):
+    async def no_local_results(search_query):
+        return []
+
+    monkeypatch.setattr(federated_search_service, "_search_local", no_local_results)
+    mock_office.delay = 1.0
+
+    result = await federated_search(QUERY, deadline=0.1)
+
+    assert states(result) == {
+        "local": SearchSourceState.OK,
+        **{source: SearchSourceState.TIMEOUT for source in SOURCES if source != "local"},
+    }
+    assert result.payloads == {"local": []}
+
+
+async def test_failing_office_is_an_error(mock_office, monkeypatch):
+    async def no_local_results(search_query):
+        return []
+
+    monkeypatch.setattr(federated_search_service, "_search_local", no_local_results)
+    mock_office.handler = lambda request: httpx.Response(
+        503 if request.url.host == "euipo.test" else 200, json={"total_results": 0, "results": []}
+    )
+
+    result = await federated_search(QUERY, deadline=1.0)
+
+    assert states(result)["euipo"] == SearchSourceState.ERROR
+    assert states(result)["wipo"] == SearchSourceState.OK
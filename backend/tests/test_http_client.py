@@ -0,0 +1,141 @@
+from fastapi.testclient import TestClient
+import httpx
+import pytest
+
+from app.core.config import settings
+from app.core.http_client import http_clients, request_json
+from app.core.resilience import CircuitOpenError, RateLimitedError, office_guards
+from app.main import app
+from app.services.euipo_service import search_euipo
+from app.services.wipo_service import search_wipo
+
+
+@pytest.fixture
+def created_clients(monkeypatch):
+    """Every httpx client the registry creates"""
+    clients = []
+    new_client = http_clients._new_client
+
+    def counting_new_client():
+        client = new_client()
+        clients.append(client)
+        return client
+
+    monkeypatch.setattr(http_clients, "_new_client", counting_new_client)
+    return clients
+
+
+async def test_services_on_one_origin_share_a_client(mock_office, monkeypatch, created_clients):
+    monkeypatch.setattr(settings, "EUIPO_API_URL", "https://offices.test/euipo")
+    monkeypatch.setattr(settings, "WIPO_API_URL", "https://offices.test/wipo")
+
+    await search_euipo("nike")
+    await search_wipo("nike")
+    await search_euipo("adidas")
+
+    assert [request.url.path for request in mock_office.requests] == [
+        "/euipo/search", "/wipo/search", "/euipo/search"
+    ]
+    assert len(created_clients) == 1
+    assert http_clients.get("https://offices.test/anything") is created_clients[0]
+    assert not created_clients[0].is_closed
+
+
+async def test_each_origin_gets_its_own_client(mock_office, created_clients):
+    await search_euipo("nike")
+    await search_wipo("nike")
+    await search_wipo("adidas")
+
+    assert len(mock_office.requests) == 3
+    assert len(created_clients) == 2
+
+
+async def test_reset_closes_the_clients(mock_office, created_clients):
+    await search_euipo("nike")
+    await http_clients.reset(httpx.MockTransport(mock_office))
+
+    assert created_clients[0].is_closed
+    await search_euipo("adidas")
+    assert len(created_clients) == 2
+
+
+async def test_request_json_returns_the_body(mock_office):
+    mock_office.handler = lambda request: httpx.Response(200, json={"q": request.url.params["q"]})
+
+    assert await request_json("euipo", "GET", "https://euipo.test/search", params={"q": "nike"}) == {
+        "q": "nike"
+    }
+
+
+async def test_circuit_opens_after_consecutive_failures(mock_office, monkeypatch):
+    monkeypatch.setattr(settings, "CIRCUIT_FAILURE_THRESHOLD", 3)
+    mock_office.handler = lambda request: httpx.Response(503)
+
+    for _ in range(3):
+        with pytest.raises(httpx.HTTPStatusError):
+            await request_json("euipo", "GET", "https://euipo.test/search")
+    with pytest.raises(CircuitOpenError):
+        await request_json("euipo", "GET", "https://euipo.test/search")
+
+    assert len(mock_office.requests) == 3
+
+
+async def test_client_errors_do_not_open_the_circuit(mock_office, monkeypatch):
+    monkeypatch.setattr(settings, "CIRCUIT_FAILURE_THRESHOLD", 2)
+    mock_office.handler = lambda request: httpx.Response(404)
+
+    for _ in range(3):
+        with pytest.raises(httpx.HTTPStatusError):
+            await request_json("euipo", "GET", "https://euipo.test/search")
+
+    assert len(mock_office.requests) == 3
+
+
+async def test_rate_limit_fails_fast_beyond_the_burst(mock_office, monkeypatch):
+    monkeypatch.setattr(settings, "OFFICE_RATE_LIMITS", {"euipo": 0.1})
+    monkeypatch.setattr(settings, "OFFICE_RATE_BURST", 2)
+    monkeypatch.setattr(settings, "OFFICE_RATE_LIMIT_MAX_WAIT", 1.0)
+
+    await request_json("euipo", "GET", "https://euipo.test/search")
+    await request_json("euipo", "GET", "https://euipo.test/search")
+    with pytest.raises(RateLimitedError):
+        await request_json("euipo", "GET", "https://euipo.test/search")
+
+    assert len(mock_office.requests) == 2
+
+
+async def test_open_search_circuit_does_not_block_submissions(mock_office, monkeypatch):
+    monkeypatch.setattr(settings, "CIRCUIT_FAILURE_THRESHOLD", 1)
+    mock_office.handler = lambda request: httpx.Response(503 if request.method == "GET" else 201, json={})
+
+    with pytest.raises(httpx.HTTPStatusError):
+        await request_json("obi", "GET", "https://obi.test/search")
+    with pytest.raises(CircuitOpenError):
+        await request_json("obi", "GET", "https://obi.test/search")
+
+    assert await request_json("obi", "POST", "https://obi.test/applications", json={}) == {}
+    assert office_guards.status()["obi"]["state"] == "open"
+    assert office_guards.status()["obi:submit"]["state"] == "closed"
+
+
+async def test_start_opens_the_clients_of_configured_offices(mock_office, created_clients, monkeypatch):
+    monkeypatch.setattr(settings, "MEMEX_MCP_URL", "")
+
+    http_clients.start()
+    http_clients.start()
+
+    assert len(created_clients) == 4
+    assert http_clients.get("https://obi.test/search") in created_clients
+
+
+def test_lifespan_starts_and_closes_the_clients(created_clients, monkeypatch):
+    for name in ("TMVIEW_API_URL", "EUIPO_API_URL", "WIPO_API_URL", "OBI_API_URL", "MEMEX_MCP_URL"):
+        monkeypatch.setattr(settings, name, "")
+    monkeypatch.setattr(settings, "TMVIEW_API_URL", "https://tmview.test")
+
+    with TestClient(app):
+        assert app.state.http_clients is http_clients
+        assert len(created_clients) == 1
+        assert not created_clients[0].is_closed
+
+    assert created_clients[0].is_closed
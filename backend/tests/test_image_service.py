@@ -0,0 +1,158 @@
+from concurrent.futures import Future
+import io
+
+import pytest
+
+from app.core.blob_store import ContentAddressedStore
+from app.core.config import settings
+from app.services import image_service
+from app.services.image_service import (
+    ImageTooLargeError,
+    InvalidImageError,
+    Thumbnailer,
+    spool_image,
+)
+
+# Pillow is optional; without it images are checked by signature only
+Image = pytest.importorskip("PIL.Image")
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    store = ContentAddressedStore(root=str(tmp_path / "documents"), chunk_size=64)
+    monkeypatch.setattr(image_service, "document_store", store)
+    return store
+
+
+def stored_files(store):
+    return [path for path in store.root.rglob("*") if path.is_file()]
+
+
+def image_bytes(image_format, size=(8, 8)):
+    buffer = io.BytesIO()
+    Image.new("RGB", size, "red").save(buffer, image_format)
+    return buffer.getvalue()
+
+
+class CountingUpload(io.BytesIO):
+    """Records how much of the upload was read"""
+
+    def __init__(self, content):
+        super().__init__(content)
+        self.bytes_read = 0
+
+    def read(self, size=-1):
+        chunk = super().read(size)
+        self.bytes_read += len(chunk)
+        return chunk
+
+
+@pytest.mark.parametrize(
+    "image_format, media_type",
+    [("PNG", "image/png"), ("JPEG", "image/jpeg"), ("GIF", "image/gif"), ("WEBP", "image/webp")],
+)
+def test_accepted_images_are_stored(store, image_format, media_type):
+    content = image_bytes(image_format)
+    blob, detected = spool_image(io.BytesIO(content))
+
+    assert detected == media_type
+    with store.open(blob.content_hash) as f:
+        assert f.read() == content
+
+
+@pytest.mark.parametrize("content", [b"%PDF-1.7" + b"\0" * 200, b"<svg xmlns='http://www.w3.org/2000/svg'/>", b""])
+def test_other_types_are_rejected_on_the_first_chunk(store, content):
+    upload = CountingUpload(content)
+
+    with pytest.raises(InvalidImageError):
+        spool_image(upload)
+
+    assert upload.bytes_read <= store.chunk_size
+    assert stored_files(store) == []
+
+
+def test_content_not_matching_its_signature_is_rejected(store):
+    with pytest.raises(InvalidImageError):
+        spool_image(io.BytesIO(b"\x89PNG\r\n\x1a\n" + b"not really a png" * 10))
+
+    assert stored_files(store) == []
+
+
+def test_oversized_upload_is_rejected_before_its_end(store, monkeypatch):
+    monkeypatch.setattr(settings, "TRADEMARK_IMAGE_MAX_BYTES", 256)
+    upload = CountingUpload(image_bytes("PNG") + b"\0" * 4096)
+
+    with pytest.raises(ImageTooLargeError):
+        spool_image(upload)
+
+    assert upload.bytes_read <= 256 + store.chunk_size
+    assert stored_files(store) == []
+
+
+def test_too_many_pixels_are_rejected(store, monkeypatch):
+    monkeypatch.setattr(settings, "TRADEMARK_IMAGE_MAX_PIXELS", 100)
+
+    with pytest.raises(ImageTooLargeError):
+        spool_image(io.BytesIO(image_bytes("PNG", size=(20, 20))))
+
+    assert stored_files(store) == []
+
+
+class FakeExecutor:
+    """Holds submitted renders until the test resolves them"""
+
+    def __init__(self):
+        self.futures = []
+
+    def submit(self, func, *args):
+        future = Future()
+        self.futures.append(future)
+        return future
+
+
+@pytest.fixture
+def thumbnailer(store, monkeypatch):
+    thumbnailer = Thumbnailer(sizes=[64], max_workers=2, max_queue=1)
+    executor = FakeExecutor()
+    monkeypatch.setattr(thumbnailer, "start", lambda: executor)
+    thumbnailer.executor = executor
+    return thumbnailer
+
+
+def test_thumbnails_beyond_the_queue_are_skipped(store, thumbnailer):
+    hashes = [store.put(io.BytesIO(image_bytes("PNG", size=(8, n)))).content_hash for n in range(1, 6)]
+
+    futures = [thumbnailer.schedule(content_hash) for content_hash in hashes]
+
+    # Two running and one waiting; the rest are skipped
+    assert [future is not None for future in futures] == [True, True, True, False, False]
+    assert thumbnailer.stats()["pending"] == 3
+    assert thumbnailer.stats()["skipped"] == 2
+
+    thumbnailer.executor.futures[0].set_result([64])
+    thumbnailer.executor.futures[1].set_exception(OSError("disk full"))
+
+    stats = thumbnailer.stats()
+    assert (stats["pending"], stats["completed"], stats["failed"]) == (1, 1, 1)
+    assert thumbnailer.schedule(hashes[3]) is not None
+
+
+def test_existing_thumbnails_are_not_rendered_again(store, thumbnailer):
+    content_hash = store.put(io.BytesIO(image_bytes("PNG"))).content_hash
+    target = image_service.thumbnail_path(content_hash, 64)
+    target.parent.mkdir(parents=True)
+    target.write_bytes(b"rendered before")
+
+    assert thumbnailer.schedule(content_hash) is None
+    assert thumbnailer.executor.futures == []
+
+
+def test_render_thumbnails(store, tmp_path):
+    content_hash = store.put(io.BytesIO(image_bytes("JPEG", size=(300, 150)))).content_hash
+    targets = {64: str(tmp_path / "64.png"), 128: str(tmp_path / "128.png")}
+
+    assert image_service._render_thumbnails(str(store.path(content_hash)), targets, 10_000_000) == [64, 128]
+
+    for size, target in targets.items():
+        with Image.open(target) as thumbnail:
+            assert (thumbnail.format, thumbnail.mode, thumbnail.size) == ("PNG", "RGBA", (size, size // 2))
@@ -0,0 +1,123 @@
+import io
+import json
+
+import pytest
+
+from app import crud, models
+from app.services import import_service
+from app.services.import_service import import_trademarks
+
+from tests.conftest import OWNER
+
+
+def ndjson(*rows):
+    return io.BytesIO("".join(json.dumps(row) + "\n" for row in rows).encode())
+
+
+def mark(application_number, name="Nike", **fields):
+    return {"name": name, "type": "word", "jurisdiction": "GR", "application_number": application_number, **fields}
+
+
+def trademarks(db):
+    db.expire_all()
+    return {
+        trademark.application_number: trademark
+        for trademark in db.query(models.Trademark).all()
+    }
+
+
+def test_valid_rows_are_imported_and_invalid_ones_reported_by_line(db):
+    file = ndjson(mark("1"), {"name": "No jurisdiction", "type": "word"}, mark("2", nice_classes=[9, 25]))
+
+    result = import_trademarks(
+        db, io.BytesIO(file.getvalue() + b"\n{not json\n[1, 2]\n"), "ndjson", owner_id=OWNER.id
+    )
+
+    assert (result.created, result.updated, result.failed) == (2, 0, 3)
+    assert [error.row for error in result.errors] == [2, 5, 6]
+    assert result.errors[0].errors == ["jurisdiction: Field required"]
+    assert result.errors[1].errors[0].startswith("Invalid JSON")
+    assert result.errors[2].errors == ["Expected a JSON object"]
+    assert trademarks(db)["2"].nice_classes == [9, 25]
+
+
+def test_csv_rows_are_imported(db):
+    file = io.BytesIO(
+        "﻿name,type,jurisdiction,application_number,nice_classes\r\n"
+        "Nike,word,GR,1,9;25\r\n"
+        "Adidas,word,,2,\r\n"
+        "\"Puma, Inc\",word,EU,3,\r\n".encode()
+    )
+
+    result = import_trademarks(db, file, "csv", owner_id=OWNER.id)
+
+    assert (result.created, result.failed) == (2, 1)
+    assert [error.row for error in result.errors] == [3]
+    assert trademarks(db)["1"].nice_classes == [9, 25]
+    assert trademarks(db)["3"].name == "Puma, Inc"
+
+
+def test_reimport_updates_by_application_number(db):
+    import_trademarks(db, ndjson(mark("1"), mark("2")), "ndjson", owner_id=OWNER.id)
+
+    result = import_trademarks(db, ndjson(mark("1", name="Nike Air"), mark("3")), "ndjson", owner_id=OWNER.id)
+
+    assert (result.created, result.updated, result.failed) == (1, 1, 0)
+    assert {number: trademark.name for number, trademark in trademarks(db).items()} == {
+        "1": "Nike Air", "2": "Nike", "3": "Nike",
+    }
+
+
+def test_application_number_repeated_in_one_file_updates_in_order(db, monkeypatch):
+    monkeypatch.setattr(import_service, "IMPORT_BATCH_SIZE", 2)
+
+    result = import_trademarks(
+        db, ndjson(mark("1"), mark("1", name="Nike Air"), mark("2"), mark("1", name="Nike Air Max")),
+        "ndjson", owner_id=OWNER.id,
+    )
+
+    assert (result.created, result.updated, result.failed) == (2, 2, 0)
+    assert trademarks(db)["1"].name == "Nike Air Max"
+
+
+def test_application_number_of_another_owner_is_not_taken_over(db):
+    db.add(models.User(id="other", email="other@example.com", hashed_password="x", is_active=True))
+    db.commit()
+    import_trademarks(db, ndjson(mark("1")), "ndjson", owner_id="other")
+
+    result = import_trademarks(db, ndjson(mark("1", name="Nike Air"), mark("2")), "ndjson", owner_id=OWNER.id)
+
+    assert (result.created, result.updated, result.failed) == (1, 0, 1)
+    assert [error.row for error in result.errors] == [1]
+    assert trademarks(db)["1"].name == "Nike"
+    assert trademarks(db)["1"].owner_id == "other"
+
+
+@pytest.mark.parametrize("import_format", ["ndjson", "csv"])
+def test_rows_before_an_undecodable_line_are_imported(db, import_format):
+    if import_format == "csv":
+        lines = [b"name,type,jurisdiction,application_number\n", b"Nike,word,GR,1\n", b"Adidas,word,GR,2\n"]
+    else:
+        lines = [json.dumps(mark(number)).encode() + b"\n" for number in ("0", "1", "2")]
+    file = io.BytesIO(b"".join(lines) + "Νίκη".encode("iso-8859-7") + b",word,GR,3\n" + lines[-1])
+
+    result = import_trademarks(db, file, import_format, owner_id=OWNER.id)
+
+    assert (result.created, result.failed) == (len(lines) - (import_format == "csv"), 1)
+    assert [error.row for error in result.errors] == [4]
+    assert sorted(trademarks(db)) == sorted(["0", "1", "2"] if import_format == "ndjson" else ["1", "2"])
+
+
+def test_rows_are_written_in_batches(db, monkeypatch):
+    monkeypatch.setattr(import_service, "IMPORT_BATCH_SIZE", 3)
+    batches = []
+    import_batch = crud.trademark.import_batch
+    monkeypatch.setattr(
+        crud.trademark, "import_batch",
+        lambda db, *, objs_in, owner_id: batches.append(len(objs_in)) or import_batch(db, objs_in=objs_in, owner_id=owner_id),
+    )
+
+    result = import_trademarks(db, ndjson(*(mark(str(number)) for number in range(7))), "ndjson", owner_id=OWNER.id)
+
+    assert result.created == 7
+    assert batches == [3, 3, 1]
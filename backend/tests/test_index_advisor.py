@@ -0,0 +1,87 @@
+import pytest
+
+from app.db import index_advisor
+from app.models.trademark import Trademark
+
+PLAN = {
+    "Node Type": "Limit",
+    "Total Cost": 12.5,
+    "Plans": [{
+        "Node Type": "Nested Loop",
+        "Plans": [
+            {"Node Type": "Index Scan", "Relation Name": "trademark"},
+            {"Node Type": "Seq Scan", "Relation Name": "trademark_search_projection"},
+            {"Node Type": "Bitmap Heap Scan", "Relation Name": "user", "Plans": [
+                {"Node Type": "Seq Scan", "Relation Name": "user"},
+            ]},
+        ],
+    }],
+}
+
+
+def test_seq_scans_are_found_anywhere_in_the_plan():
+    assert index_advisor._seq_scans(PLAN) == ["trademark_search_projection", "user"]
+    assert index_advisor._seq_scans({"Node Type": "Index Only Scan", "Relation Name": "trademark"}) == []
+    assert index_advisor._seq_scans({"Node Type": "Seq Scan"}) == ["?"]
+
+
+def test_advisor_needs_postgresql(db):
+    with pytest.raises(RuntimeError):
+        index_advisor.advise(db)
+
+
+@pytest.fixture
+def postgres_session(db, monkeypatch):
+    """The SQLite session, passed off as PostgreSQL with a canned EXPLAIN"""
+    monkeypatch.setattr(db.get_bind().dialect, "name", "postgresql")
+    explained = []
+    monkeypatch.setattr(
+        index_advisor, "explain", lambda db, statement, parameters: explained.append(statement) or PLAN
+    )
+    return db, explained
+
+
+def test_report_lists_scans_and_queries_without_sql(postgres_session, monkeypatch):
+    db, explained = postgres_session
+    monkeypatch.setattr(index_advisor, "QUERIES", {
+        "executed": lambda db: db.query(Trademark).filter(Trademark.name == "x").all(),
+        # A Query that is returned but never run sends no SQL
+        "not executed": lambda db: db.query(Trademark).filter(Trademark.name == "x"),
+    })
+
+    report = index_advisor.advise(db, allow_seqscan=True)
+
+    assert report == [
+        {
+            "query": "executed",
+            "seq_scans": ["trademark_search_projection", "user"],
+            "total_cost": 12.5,
+            "statement": " ".join(explained[0].split()),
+        },
+        {"query": "not executed", "seq_scans": [], "total_cost": None, "statement": None},
+    ]
+    assert explained[0].lstrip().upper().startswith("SELECT")
+
+
+class UnusedSession:
+    def close(self):
+        pass
+
+
+def test_main_fails_on_seq_scans_and_missing_sql(monkeypatch, capsys):
+    monkeypatch.setattr(index_advisor, "SessionLocal", lambda replicas: UnusedSession())
+    monkeypatch.setattr(index_advisor, "advise", lambda db, allow_seqscan: [
+        {"query": "indexed", "seq_scans": [], "total_cost": 1.0, "statement": "SELECT 1"},
+        {"query": "scanned", "seq_scans": ["trademark"], "total_cost": 9.0, "statement": "SELECT 2"},
+        {"query": "lazy", "seq_scans": [], "total_cost": None, "statement": None},
+    ])
+    monkeypatch.setattr("sys.argv", ["index_advisor"])
+
+    with pytest.raises(SystemExit) as exited:
+        index_advisor.main()
+
+    indexed, scanned, lazy = [line.split() for line in capsys.readouterr().out.splitlines()]
+    assert exited.value.code == 1
+    assert indexed == ["indexed", "indexed", "cost=1.0"]
+    assert scanned == ["scanned", "SEQ", "SCAN", "on", "trademark", "cost=9.0"]
+    assert lazy[1:3] == ["NO", "SQL"]
@@ -0,0 +1,58 @@
+from sqlalchemy import event
+
+from app import models
+from app.api import deps
+from app.db.session import LazySession
+
+from tests.conftest import OWNER
+
+
+def counted(session_factory):
+    """The factory, counting the sessions it makes and the connections they check out"""
+    counts = {"sessions": 0, "checkouts": 0, "checkins": 0}
+    engine = session_factory.kw["bind"]
+    event.listen(engine, "checkout", lambda *args: counts.update(checkouts=counts["checkouts"] + 1))
+    event.listen(engine, "checkin", lambda *args: counts.update(checkins=counts["checkins"] + 1))
+
+    def factory():
+        counts["sessions"] += 1
+        return session_factory()
+
+    return factory, counts
+
+
+def test_unused_session_is_never_created(session_factory):
+    factory, counts = counted(session_factory)
+    db = LazySession(factory)
+
+    db.close()
+
+    assert not db.started
+    assert counts == {"sessions": 0, "checkouts": 0, "checkins": 0}
+
+
+def test_session_is_created_on_first_use_and_connects_on_first_query(session_factory):
+    factory, counts = counted(session_factory)
+    db = LazySession(factory)
+
+    db.info["request"] = "x"
+    assert db.started
+    assert counts["checkouts"] == 0
+
+    assert db.get(models.User, OWNER.id).email == OWNER.email
+    db.query(models.User).count()
+    assert (counts["sessions"], counts["checkouts"]) == (1, 1)
+
+    db.close()
+    assert not db.started
+    assert counts["checkins"] == 1
+
+
+def test_get_db_without_queries_opens_nothing():
+    # No database is reachable here: a session would fail on its first query
+    dependency = deps.get_db()
+    db = next(dependency)
+    dependency.close()
+
+    assert isinstance(db, LazySession)
+    assert not db.started
@@ -0,0 +1,116 @@
+from app.schemas.trademark import NiceClassMatch, TrademarkSearchResult
+from app.services.nice_class_service import nice_class_mask
+from app.services.search_adapter_service import (
+    adapt_euipo, adapt_wipo, deduplicate, merge_results, normalize_name
+)
+
+
+def result(name, source, nice_classes=None, **fields):
+    return TrademarkSearchResult(
+        name=name, type="word", status="registered", jurisdiction="EU", source=source,
+        nice_classes=nice_classes, nice_class_mask=nice_class_mask(nice_classes), **fields,
+    )
+
+
+def test_normalized_names_ignore_case_accents_and_punctuation():
+    assert normalize_name("Nike-Air") == normalize_name("NIKE AIR") == normalize_name("níke_air")
+    assert normalize_name("ΝΊΚΗ") == normalize_name("νικη")
+
+
+def test_same_mark_from_several_offices_is_returned_once():
+    merged = merge_results("nike", {
+        "euipo": [result("NIKE", "EUIPO", application_number="018-000-123")],
+        "local": [result("Nike", "Local", id="local-1", application_number="018000123")],
+        "wipo": [result("nike", "WIPO", registration_number="1 234 567", application_number="018000123")],
+    })
+
+    assert len(merged) == 1
+    [mark] = merged
+    # The local record is kept and the offices are listed
+    assert (mark.source, mark.id) == ("Local", "local-1")
+    assert mark.also_reported_by == ["EUIPO", "WIPO"]
+    # Gaps are filled from the duplicates
+    assert mark.registration_number == "1 234 567"
+
+
+def test_a_shared_number_alone_does_not_merge():
+    merged = deduplicate([
+        result("Nike", "EUIPO", application_number="1"),
+        result("Adidas", "OBI", application_number="1"),
+    ])
+
+    assert [mark.name for mark in merged] == ["Nike", "Adidas"]
+
+
+def test_marks_without_numbers_are_never_merged():
+    merged = deduplicate([result("Nike", "EUIPO"), result("Nike", "OBI")])
+
+    assert len(merged) == 2
+
+
+def test_duplicates_chain_through_either_number():
+    merged = deduplicate([
+        result("Nike", "EUIPO", application_number="A1"),
+        result("Nike", "WIPO", application_number="A1", registration_number="R1"),
+        result("Nike", "OBI", registration_number="R1"),
+    ])
+
+    assert len(merged) == 1
+    assert merged[0].also_reported_by == ["OBI", "WIPO"]
+
+
+def test_missing_classes_are_taken_with_their_mask():
+    merged = deduplicate([
+        result("Nike", "EUIPO", application_number="1"),
+        result("Nike", "OBI", nice_classes=[9, 25], application_number="1"),
+    ])
+
+    assert merged[0].nice_classes == [9, 25]
+    assert merged[0].nice_class_mask == nice_class_mask([9, 25])
+
+
+def test_results_outside_the_classes_are_dropped_after_merging():
+    results = {
+        "euipo": [
+            result("Nike", "EUIPO", nice_classes=[9], application_number="1"),
+            result("Nikon", "EUIPO", nice_classes=[25], application_number="2"),
+            result("Nikh", "EUIPO", application_number="3"),
+        ],
+        "obi": [result("Nike", "OBI", nice_classes=[9, 25], application_number="1")],
+    }
+
+    any_of = merge_results("nike", results, nice_classes=[9, 42])
+    all_of = merge_results("nike", results, nice_classes=[9, 25], nice_class_match=NiceClassMatch.ALL)
+
+    # Unknown classes are kept
+    assert sorted(mark.name for mark in any_of) == ["Nike", "Nikh"]
+    # The kept EUIPO record has classes [9] only, so it does not cover [9, 25]
+    assert sorted(mark.name for mark in all_of) == ["Nikh"]
+
+
+def test_merged_results_are_ranked_by_similarity():
+    merged = merge_results("nike", {
+        "euipo": [result("Adidas", "EUIPO"), result("Nikh", "EUIPO")],
+        "local": [result("Nike", "Local")],
+    })
+
+    assert [mark.name for mark in merged] == ["Nike", "Nikh", "Adidas"]
+    assert merged[0].similarity_score == 1.0
+    assert merged[0].similarity_score >= merged[1].similarity_score >= merged[2].similarity_score
+
+
+def test_adapters_map_office_payloads():
+    [euipo] = adapt_euipo({"results": [{
+        "trademark": "Nike", "type": "Figurative", "status": "refused", "nice_classes": [9],
+        "application_number": "1", "application_date": "2020-01-02",
+    }]})
+    [wipo] = adapt_wipo({"results": [{
+        "trademark": "Nike", "status": "unknown", "international_registration_number": "R1",
+        "basic_application": {"application_number": "1"},
+    }]})
+
+    assert (euipo.type, euipo.status, euipo.jurisdiction) == ("figurative", "rejected", "EU")
+    assert euipo.filing_date.year == 2020
+    assert euipo.nice_class_mask == nice_class_mask([9])
+    assert (wipo.status, wipo.application_number, wipo.registration_number) == ("submitted", "1", "R1")
+    assert len(deduplicate([euipo, wipo])) == 1
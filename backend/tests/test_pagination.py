@@ -0,0 +1,48 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import crud, schemas
+from app.crud.pagination import MAX_PAGE_SIZE
+
+from tests.conftest import OWNER
+
+
+@pytest.fixture
+def trademarks(db):
+    created = [
+        crud.trademark.create_with_owner(
+            db, obj_in=schemas.TrademarkCreate(name=f"Mark {i}", type="word", jurisdiction="GR"), owner_id=OWNER.id
+        )
+        for i in range(5)
+    ]
+    # SQLite's CURRENT_TIMESTAMP has whole seconds, unlike the cursor; two
+    # marks share one to cover ties on created_at
+    for i, trademark in enumerate(created):
+        trademark.created_at = datetime(2024, 1, 1) + timedelta(seconds=i // 2 * 2)
+    db.commit()
+    return [trademark.id for trademark in sorted(created, key=lambda trademark: (trademark.created_at, trademark.id))]
+
+
+def test_pages_follow_the_next_cursor_header(api, trademarks):
+    seen, cursor = [], None
+    for _ in range(len(trademarks) + 1):
+        response = api.get("/api/v1/trademarks/", params={"limit": 2, **({"cursor": cursor} if cursor else {})})
+        assert response.status_code == 200
+        seen += [trademark["id"] for trademark in response.json()]
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+    assert cursor is None
+
+    assert seen == list(reversed(trademarks))
+
+
+@pytest.mark.parametrize("path", ["/api/v1/trademarks/", "/api/v1/payments/", "/api/v1/search/local?query=x"])
+@pytest.mark.parametrize("limit", [0, MAX_PAGE_SIZE + 1])
+def test_limit_out_of_bounds_is_a_422(api, path, limit):
+    assert api.get(path, params={"limit": limit}).status_code == 422
+
+
+def test_invalid_cursor_is_a_400(api):
+    assert api.get("/api/v1/trademarks/", params={"cursor": "not-a-cursor"}).status_code == 400
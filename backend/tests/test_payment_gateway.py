@@ -0,0 +1,181 @@
+from urllib.parse import parse_qs, urlsplit
+import json
+import threading
+import time
+
+import pytest
+import stripe
+from sqlalchemy.exc import OperationalError
+
+from app import crud, models, schemas
+from app.api.endpoints import payments
+from app.core.config import settings
+from app.services.payment_gateway import PaymentGateway
+
+from tests.conftest import OWNER
+
+
+class FakeStripe(stripe.HTTPClient):
+    """
+    Stand-in for the Stripe API: answers PaymentIntent calls from fixtures.
+    While `open` is cleared, calls hold their worker thread until it is set.
+    """
+
+    name = "fake"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.requests = []
+        self.idempotency_keys = []
+        self.open = threading.Event()
+        self.open.set()
+        self.error = None
+
+    def request(self, method, url, headers, post_data=None, *, _usage=None):
+        path = urlsplit(url).path
+        self.requests.append((method, path, parse_qs(post_data or "")))
+        self.idempotency_keys.append(headers.get("Idempotency-Key"))
+        self.open.wait(5)
+        if self.error is not None:
+            return json.dumps({"error": self.error}), 402, {}
+        intent_id = path.split("/")[3] if path.endswith("/confirm") else "pi_test"
+        body = {
+            "id": intent_id,
+            "object": "payment_intent",
+            "client_secret": f"{intent_id}_secret",
+            "status": "succeeded",
+        }
+        return json.dumps(body), 200, {"request-id": "req_test"}
+
+
+@pytest.fixture
+def fake_stripe(monkeypatch):
+    fake = FakeStripe()
+    monkeypatch.setattr(settings, "STRIPE_API_KEY", "sk_test_fake")
+    monkeypatch.setattr(settings, "STRIPE_MAX_NETWORK_RETRIES", 0)
+    yield fake
+    fake.open.set()
+
+
+@pytest.fixture
+def gateway(fake_stripe, monkeypatch):
+    """One worker and no queue, so a single held call makes the gateway busy"""
+    gateway = PaymentGateway(max_workers=1, max_queue=0, deadline=0.5, http_client=fake_stripe)
+    monkeypatch.setattr(payments, "payment_gateway", gateway)
+    yield gateway
+    gateway.shutdown()
+
+
+@pytest.fixture
+def trademark_id(db):
+    trademark = crud.trademark.create_with_owner(
+        db, obj_in=schemas.TrademarkCreate(name="Nike", type="word", jurisdiction="GR"), owner_id=OWNER.id
+    )
+    return trademark.id
+
+
+def create_intent(api, trademark_id, amount=12.5):
+    return api.post(
+        "/api/v1/payments/create-intent",
+        json={"trademark_id": trademark_id, "amount": amount, "currency": "eur", "type": "registration_fee"},
+    )
+
+
+def test_create_intent(api, gateway, fake_stripe, trademark_id, db):
+    response = create_intent(api, trademark_id)
+
+    assert response.status_code == 200
+    assert response.json()["client_secret"] == "pi_test_secret"
+    [(method, path, params)] = fake_stripe.requests
+    assert (method, path) == ("post", "/v1/payment_intents")
+    assert params["amount"] == ["1250"]
+    assert params["metadata[trademark_id]"] == [trademark_id]
+    payment = db.get(models.Payment, response.json()["payment_id"])
+    assert payment.stripe_payment_intent_id == "pi_test"
+    assert gateway.stats()["operations"]["create_payment_intent"]["calls"] == 1
+
+
+def test_confirm_payment(api, gateway, fake_stripe, trademark_id):
+    payment_id = create_intent(api, trademark_id).json()["payment_id"]
+
+    response = api.post(f"/api/v1/payments/confirm/{payment_id}", json={"payment_method_id": "pm_card"})
+
+    assert response.status_code == 200
+    assert response.json()["status"] == "completed"
+    assert fake_stripe.requests[-1][1] == "/v1/payment_intents/pi_test/confirm"
+    assert fake_stripe.requests[-1][2]["payment_method"] == ["pm_card"]
+
+
+def test_stripe_error_is_a_bad_request(api, gateway, fake_stripe, trademark_id):
+    fake_stripe.error = {"type": "card_error", "code": "card_declined", "message": "Your card was declined."}
+
+    response = create_intent(api, trademark_id)
+
+    assert response.status_code == 400
+    assert "declined" in response.json()["detail"]
+
+
+def test_deadline_is_a_gateway_timeout(api, gateway, fake_stripe, trademark_id):
+    fake_stripe.open.clear()
+
+    response = create_intent(api, trademark_id)
+
+    assert response.status_code == 504
+    assert gateway.stats()["operations"]["create_payment_intent"]["timeouts"] == 1
+
+
+def test_full_queue_is_service_unavailable(api, gateway, fake_stripe, trademark_id):
+    fake_stripe.open.clear()
+    first = {}
+    holder = threading.Thread(target=lambda: first.update(response=create_intent(api, trademark_id)))
+    holder.start()
+    while not fake_stripe.requests:
+        time.sleep(0.001)
+
+    response = create_intent(api, trademark_id)
+    fake_stripe.open.set()
+    holder.join()
+
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+    assert first["response"].status_code == 200
+    assert len(fake_stripe.requests) == 1
+    assert gateway.stats()["rejected"] == 1
+
+
+def test_database_error_after_stripe_is_a_server_error(api, gateway, fake_stripe, trademark_id, monkeypatch):
+    def fail(*args, **kwargs):
+        raise OperationalError("INSERT INTO payment", {}, Exception("database is gone"))
+
+    monkeypatch.setattr(crud.payment, "create", fail)
+
+    response = create_intent(api, trademark_id)
+
+    assert response.status_code == 500
+    assert len(fake_stripe.requests) == 1
+
+
+def test_retry_after_a_timeout_reuses_the_intent(api, gateway, fake_stripe, trademark_id, db):
+    fake_stripe.open.clear()
+    assert create_intent(api, trademark_id).status_code == 504
+    fake_stripe.open.set()
+    # Stripe finishes the timed-out call and creates the intent
+    while gateway.stats()["running"]:
+        time.sleep(0.001)
+
+    retried = create_intent(api, trademark_id)
+    again = create_intent(api, trademark_id)
+
+    assert retried.status_code == again.status_code == 200
+    assert len(set(fake_stripe.idempotency_keys)) == 1
+    assert fake_stripe.idempotency_keys[0].startswith("payment-intent-")
+    # Stripe returned the same intent every time: it is recorded once
+    assert retried.json()["payment_id"] == again.json()["payment_id"]
+    assert db.query(models.Payment).count() == 1
+
+
+def test_different_payments_get_different_keys(api, gateway, fake_stripe, trademark_id):
+    create_intent(api, trademark_id, amount=12.5)
+    create_intent(api, trademark_id, amount=20)
+
+    assert len(set(fake_stripe.idempotency_keys)) == 2
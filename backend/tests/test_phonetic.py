@@ -0,0 +1,74 @@
+import pytest
+
+from app import crud, schemas
+from app.schemas.trademark import TrademarkSearchMode, TrademarkSearchQuery
+from app.services.phonetic_service import metaphone, phonetic_key, transliterate_greek
+
+from tests.conftest import OWNER
+
+
+@pytest.mark.parametrize("greek, latin", [
+    ("ΝΙΚΗ", "NIKI"),
+    ("Νίκη", "Nike"),
+    ("ΜΠΑΝΑΝΑ", "Banana"),  # Digraph "ΜΠ" sounds like "B"
+    ("ΝΤΟΜΑΤΑ", "Domata"),  # "ΝΤ" sounds like "D"
+    ("ΓΚΟΛΦ", "Golf"),  # "ΓΚ" sounds like "G"
+    ("ΤΣΑΙ", "Tsai"),
+    ("ΟΥΖΟ", "Ouzo"),
+    ("ΕΥΑ", "Eva"),
+    ("ΦΙΛΙΠΣ", "Philips"),  # "Φ" and "PH" are both "F"
+    ("ΑΛΦΑ", "Alpha"),
+    ("ΘΕΑ", "Thea"),
+    ("ΑΘΗΝΑ", "Athina"),
+    ("ΞΕΝΙΑ", "Xenia"),
+    ("ΨΑΡΙ", "Psari"),
+    ("ΧΑΡΗΣ", "Haris"),
+    ("ΒΙΒΑ", "Viva"),
+    ("ΣΟΝΥ", "Sony"),
+    ("Κοκα Κολα", "Coca-Cola"),
+])
+def test_greek_and_latin_spellings_share_a_key(greek, latin):
+    assert phonetic_key(greek) == phonetic_key(latin)
+    assert phonetic_key(greek) != ""
+
+
+@pytest.mark.parametrize("first, second", [
+    ("Kwik", "Quick"),
+    ("KWIK FIT", "KWIKFIT"),
+    ("Coca", "Koka"),
+])
+def test_latin_sound_alikes_share_a_key(first, second):
+    assert phonetic_key(first) == phonetic_key(second)
+
+
+@pytest.mark.parametrize("first, second", [
+    ("Nike", "Mike"),
+    ("ΝΙΚΗ", "Adidas"),
+    ("3M", "M"),
+    ("Sony", "Sonic"),
+])
+def test_different_sounds_get_different_keys(first, second):
+    assert phonetic_key(first) != phonetic_key(second)
+
+
+def test_transliteration_drops_accents_and_reads_digraphs():
+    assert transliterate_greek("Νίκη") == "niki"
+    assert transliterate_greek("ΜΠΟΥΖΟΥΚΙ") == "buzuki"
+    assert transliterate_greek("Nike 3") == "nike 3"
+
+
+def test_metaphone_reads_leading_vowels_as_a():
+    assert metaphone("ELIA") == metaphone("ALIA") == "AL"
+
+
+def test_phonetic_search_finds_the_other_script(db):
+    for name in ("ΝΙΚΗ", "Nick", "Mike"):
+        crud.trademark.create_with_owner(
+            db, obj_in=schemas.TrademarkCreate(name=name, type="word", jurisdiction="GR"), owner_id=OWNER.id
+        )
+
+    trademarks, _ = crud.trademark.search_local(
+        db, search_query=TrademarkSearchQuery(query="Niki", mode=TrademarkSearchMode.PHONETIC)
+    )
+
+    assert sorted(trademark.name for trademark in trademarks) == ["Nick", "ΝΙΚΗ"]
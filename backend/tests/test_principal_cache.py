@@ -0,0 +1,107 @@
+import time
+
+from fastapi import HTTPException
+import pytest
+
+from app import crud, models
+from app.api import deps
+from app.core import security
+from app.core.principal import Principal, PrincipalCache, principal_cache
+
+from tests.conftest import OWNER
+
+
+@pytest.fixture(autouse=True)
+def clear_principal_cache():
+    principal_cache.clear()
+    yield
+    principal_cache.clear()
+
+
+@pytest.fixture
+def sessions(async_session_factory, monkeypatch):
+    """Count the sessions get_current_principal opens"""
+    opened = []
+
+    def counting_session():
+        opened.append(1)
+        return async_session_factory()
+
+    monkeypatch.setattr(deps, "AsyncSessionLocal", counting_session)
+    return opened
+
+
+def test_entries_expire_after_the_ttl():
+    cache = PrincipalCache(max_entries=10, ttl=0.05)
+    cache.set(OWNER)
+
+    assert cache.get(OWNER.id) == OWNER
+    time.sleep(0.06)
+    assert cache.get(OWNER.id) is None
+
+
+def test_inactive_principals_are_not_cached():
+    cache = PrincipalCache(max_entries=10, ttl=60)
+    cache.set(Principal(id="inactive", email="inactive@example.com", is_active=False, is_superuser=False))
+
+    assert cache.get("inactive") is None
+
+
+async def test_hit_opens_no_session(sessions):
+    token = security.create_access_token(OWNER.id)
+
+    assert await deps.get_current_principal(token) == OWNER
+    assert await deps.get_current_principal(token) == OWNER
+    assert len(sessions) == 1
+
+
+async def test_unknown_user_is_not_cached(sessions):
+    token = security.create_access_token("unknown")
+
+    for _ in range(2):
+        with pytest.raises(HTTPException) as raised:
+            await deps.get_current_principal(token)
+        assert raised.value.status_code == 404
+    assert len(sessions) == 2
+
+
+def test_sync_update_and_remove_invalidate(db):
+    principal_cache.set(OWNER)
+    crud.user.update(db, db_obj=crud.user.get(db, id=OWNER.id), obj_in={"full_name": "Owner"})
+    assert principal_cache.get(OWNER.id) is None
+
+    principal_cache.set(OWNER)
+    crud.user.remove(db, id=OWNER.id)
+    assert principal_cache.get(OWNER.id) is None
+
+
+async def test_async_update_and_remove_invalidate(async_session_factory):
+    async with async_session_factory() as db:
+        principal_cache.set(OWNER)
+        user = await crud.async_user.update(db, db_obj=await db.get(models.User, OWNER.id), obj_in={"is_active": False})
+        assert principal_cache.get(OWNER.id) is None
+        assert user.is_active is False
+
+        principal_cache.set(OWNER)
+        await crud.async_user.remove(db, id=OWNER.id)
+        assert principal_cache.get(OWNER.id) is None
+
+
+async def test_deactivated_user_is_loaded_again(sessions, async_session_factory):
+    token = security.create_access_token(OWNER.id)
+    await deps.get_current_principal(token)
+
+    async with async_session_factory() as db:
+        await crud.async_user.update(db, db_obj=await db.get(models.User, OWNER.id), obj_in={"is_active": False})
+
+    assert (await deps.get_current_principal(token)).is_active is False
+    assert len(sessions) == 2
+
+
+async def test_async_password_update_is_hashed(async_session_factory):
+    async with async_session_factory() as db:
+        user = await crud.async_user.update(
+            db, db_obj=await db.get(models.User, OWNER.id), obj_in={"password": "secret"}
+        )
+
+    assert security.verify_password("secret", user.hashed_password)
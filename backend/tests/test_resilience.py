@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+
+from app.core import resilience
+from app.core.resilience import (
+    CircuitBreaker, CircuitOpenError, CircuitState, RateLimitedError, SourceGuard, TokenBucket
+)
+
+
+class Clock:
+    """Stand-in for the time module, advanced by hand"""
+
+    def __init__(self) -> None:
+        self.now = 1000.0
+
+    def monotonic(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = Clock()
+    monkeypatch.setattr(resilience, "time", clock)
+    return clock
+
+
+def breaker(failure_threshold=2, recovery_timeout=30.0, latency_slo=None):
+    return CircuitBreaker(failure_threshold=failure_threshold, recovery_timeout=recovery_timeout, latency_slo=latency_slo)
+
+
+def test_token_bucket_allows_a_burst_then_the_rate(clock):
+    bucket = TokenBucket(rate=2.0, burst=3)
+
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+
+    clock.now += 10
+    # Refilled up to the burst only
+    assert [bucket.reserve() for _ in range(3)] == [0.0, 0.0, 0.0]
+    assert bucket.reserve() > 0
+
+
+def test_token_bucket_cancel_gives_the_token_back(clock):
+    bucket = TokenBucket(rate=1.0, burst=1)
+    bucket.reserve()
+
+    assert bucket.reserve() == pytest.approx(1.0)
+    bucket.cancel()
+    assert bucket.reserve() == pytest.approx(1.0)
+
+
+def test_circuit_opens_after_consecutive_failures(clock):
+    circuit = breaker()
+
+    circuit.record(success=False, elapsed=0.1)
+    circuit.record(success=True, elapsed=0.1)
+    circuit.record(success=False, elapsed=0.1)
+    assert circuit.state == CircuitState.CLOSED
+
+    circuit.record(success=False, elapsed=0.1)
+    assert circuit.state == CircuitState.OPEN
+    assert not circuit.allow()
+    assert circuit.retry_after() == 30.0
+
+
+def test_circuit_lets_one_trial_through_when_half_open(clock):
+    circuit = breaker()
+    for _ in range(2):
+        circuit.record(success=False, elapsed=0.1)
+
+    clock.now += 30
+    assert circuit.allow()
+    assert circuit.state == CircuitState.HALF_OPEN
+    assert not circuit.allow()
+
+    circuit.record(success=True, elapsed=0.1)
+    assert circuit.state == CircuitState.CLOSED
+    assert circuit.failures == 0
+    assert circuit.allow()
+
+
+def test_failed_trial_opens_the_circuit_again(clock):
+    circuit = breaker()
+    for _ in range(2):
+        circuit.record(success=False, elapsed=0.1)
+    clock.now += 30
+    assert circuit.allow()
+
+    circuit.record(success=False, elapsed=0.1)
+    assert circuit.state == CircuitState.OPEN
+    assert circuit.retry_after() == 30.0
+
+
+def test_released_trial_lets_another_one_through(clock):
+    circuit = breaker(failure_threshold=1)
+    circuit.record(success=False, elapsed=0.1)
+    clock.now += 30
+    assert circuit.allow()
+
+    circuit.release()
+    assert circuit.allow()
+
+
+def test_responses_slower_than_the_slo_are_failures(clock):
+    circuit = breaker(latency_slo=1.0)
+
+    circuit.record(success=True, elapsed=1.0)
+    assert circuit.failures == 0
+    circuit.record(success=True, elapsed=1.5)
+    circuit.record(success=True, elapsed=2.0)
+    assert circuit.state == CircuitState.OPEN
+
+
+def guard(**breaker_options):
+    return SourceGuard(
+        "euipo", limiter=TokenBucket(rate=1.0, burst=1), breaker=breaker(**breaker_options), max_wait=0.5
+    )
+
+
+async def test_guard_fails_fast_while_open(clock):
+    source_guard = guard(failure_threshold=1)
+    calls = []
+
+    async def failing():
+        calls.append(1)
+        raise ConnectionError()
+
+    with pytest.raises(ConnectionError):
+        await source_guard.call(failing)
+    with pytest.raises(CircuitOpenError) as raised:
+        await source_guard.call(failing)
+
+    assert len(calls) == 1
+    assert raised.value.retry_after == 30.0
+    assert source_guard.status() == {"state": "open", "failures": 1, "retry_after": 30.0}
+
+
+async def test_guard_rate_limit_does_not_hold_the_trial(clock):
+    source_guard = guard(failure_threshold=1)
+    source_guard.breaker.record(success=False, elapsed=0.1)
+    clock.now += 30
+    source_guard.limiter.reserve()
+
+    async def ok():
+        return "ok"
+
+    with pytest.raises(RateLimitedError):
+        await source_guard.call(ok)
+    clock.now += 1
+    assert await source_guard.call(ok) == "ok"
+    assert source_guard.breaker.state == CircuitState.CLOSED
+
+
+async def test_slow_call_cancelled_by_a_timeout_counts_against_the_slo():
+    source_guard = guard(failure_threshold=1, latency_slo=0.01)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(source_guard.call(lambda: asyncio.sleep(1)), 0.05)
+
+    assert source_guard.breaker.state == CircuitState.OPEN
+
+
+async def test_fast_call_cancelled_by_a_timeout_is_forgotten():
+    source_guard = guard(failure_threshold=1, latency_slo=5.0)
+
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(source_guard.call(lambda: asyncio.sleep(1)), 0.01)
+
+    assert source_guard.breaker.state == CircuitState.CLOSED
+    assert source_guard.breaker.failures == 0
@@ -0,0 +1,126 @@
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import sessionmaker
+import pytest
+
+from app import crud, models
+from app.db.base import Base
+from app.db.routing import ReplicaSet, RoutingSession, read_only
+
+
+def database(tmp_path, name):
+    """A SQLite file whose only user is named after it"""
+    engine = create_engine(f"sqlite:///{tmp_path / name}.db")
+    Base.metadata.create_all(engine)
+    with sessionmaker(bind=engine)() as db:
+        db.add(models.User(id=name, email=f"{name}@example.com", hashed_password="x", is_active=True))
+        db.commit()
+    return engine
+
+
+@pytest.fixture
+def primary(tmp_path):
+    engine = database(tmp_path, "primary")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def replica(tmp_path):
+    engine = database(tmp_path, "replica")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def replicas(replica):
+    return ReplicaSet([replica], max_lag=5.0, check_interval=60.0)
+
+
+@pytest.fixture
+def session(primary, replicas):
+    factory = sessionmaker(bind=primary, class_=RoutingSession, replicas=replicas)
+    with factory() as db:
+        yield db
+
+
+def read_from(db):
+    """The database a read of the session goes to"""
+    return db.query(models.User.id).filter(models.User.id.in_(["primary", "replica"])).scalar()
+
+
+def test_reads_in_read_only_go_to_the_replica(session):
+    assert read_from(session) == "primary"
+    with read_only(session):
+        assert read_from(session) == "replica"
+    assert read_from(session) == "primary"
+
+
+def test_replica_read_methods_read_from_the_replica(session):
+    assert [user.id for user in crud.user.get_multi(session)] == ["replica"]
+    assert crud.user.get(session, id="primary") is not None
+
+
+def test_writes_and_later_reads_stay_on_the_primary(session, primary, replica):
+    with read_only(session):
+        session.add(models.User(id="new", email="new@example.com", hashed_password="x", is_active=True))
+        session.commit()
+        # The session sees its own write
+        assert session.query(models.User).filter_by(id="new").one()
+        assert read_from(session) == "primary"
+
+    with read_only(session):
+        assert read_from(session) == "primary"
+    with sessionmaker(bind=replica)() as db:
+        assert db.query(models.User).filter_by(id="new").first() is None
+
+
+def test_bulk_statements_count_as_writes(session):
+    with read_only(session):
+        session.query(models.User).filter_by(id="primary").update({"full_name": "Primary"})
+        assert session.query(models.User.full_name).filter_by(id="primary").scalar() == "Primary"
+
+
+def test_lagging_replica_falls_back_to_the_primary(session, replicas, monkeypatch):
+    monkeypatch.setattr(replicas, "lag", lambda engine: 30.0)
+
+    with read_only(session):
+        assert read_from(session) == "primary"
+    assert replicas.status() == [{"replica": 0, "lag": 30.0, "usable": False}]
+
+
+def test_unreachable_replica_falls_back_to_the_primary(session, replicas, monkeypatch):
+    def unreachable(engine):
+        raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+
+    monkeypatch.setattr(replicas, "lag", unreachable)
+
+    with read_only(session):
+        assert read_from(session) == "primary"
+    assert replicas.status()[0]["usable"] is False
+
+
+def test_lag_is_checked_once_per_interval(replicas, monkeypatch):
+    checks = []
+    monkeypatch.setattr(replicas, "lag", lambda engine: checks.append(engine) or 30.0)
+
+    assert replicas.choose() is None
+    assert replicas.choose() is None
+    assert len(checks) == 1
+
+    replicas.check_interval = 0.0
+    monkeypatch.setattr(replicas, "lag", lambda engine: 0.0)
+    assert replicas.choose() is replicas.engines[0]
+
+
+def test_replicas_are_used_in_turn(tmp_path, replica):
+    other = database(tmp_path, "other")
+    replicas = ReplicaSet([replica, other], max_lag=5.0, check_interval=60.0)
+
+    assert [replicas.choose() for _ in range(3)] == [replica, other, replica]
+    other.dispose()
+
+
+def test_without_replicas_reads_go_to_the_primary(primary):
+    with sessionmaker(bind=primary, class_=RoutingSession)() as db, read_only(db):
+        assert read_from(db) == "primary"
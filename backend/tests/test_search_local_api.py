@@ -0,0 +1,84 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from app import crud, models, schemas
+
+from tests.conftest import OWNER
+
+MARKS = [
+    ("Nike", [9, 42], "GR"),
+    ("Nike Air", [25], "GR"),
+    ("Νίκη", [9], "GR"),
+    ("Adidas", [25], "GR"),
+    ("Nike", [9], "EU"),
+]
+
+
+@pytest.fixture(autouse=True)
+def marks(db):
+    return {
+        (name, jurisdiction): crud.trademark.create_with_owner(
+            db,
+            obj_in=schemas.TrademarkCreate(name=name, type="word", jurisdiction=jurisdiction, nice_classes=classes),
+            owner_id=OWNER.id,
+        ).id
+        for name, classes, jurisdiction in MARKS
+    }
+
+
+def search(api, **params):
+    response = api.get("/api/v1/search/local", params=params)
+    assert response.status_code == 200, response.text
+    return response
+
+
+def names(response):
+    return sorted((result["name"], result["jurisdiction"]) for result in response.json()["results"])
+
+
+def test_substring_search(api):
+    response = search(api, query="nike")
+
+    assert names(response) == [("Nike", "EU"), ("Nike", "GR"), ("Nike Air", "GR")]
+    assert response.json()["total_results"] == 3
+    assert all(result["source"] == "Local" for result in response.json()["results"])
+    assert all(0 <= result["similarity_score"] <= 1 for result in response.json()["results"])
+    assert "nice_class_mask" not in response.json()["results"][0]
+
+
+def test_phonetic_search_across_scripts(api):
+    assert names(search(api, query="NIKI", mode="phonetic", jurisdiction="GR")) == [("Nike", "GR"), ("Νίκη", "GR")]
+
+
+def test_trigram_search(api):
+    assert ("Adidas", "GR") not in names(search(api, query="nike", mode="trigram", similarity_threshold=0.2))
+
+
+def test_class_filters(api):
+    assert names(search(api, query="nike", nice_classes=[25], jurisdiction="GR")) == [("Nike Air", "GR")]
+    assert names(search(api, query="", nice_classes=[9, 42], nice_class_match="all", jurisdiction="GR")) == [
+        ("Nike", "GR")
+    ]
+
+
+def test_pages_follow_the_cursor_in_the_keyset_order(api, db, marks):
+    # Distinct creation times, written in the format of the cursor
+    for i, id in enumerate(marks.values()):
+        db.get(models.Trademark, id).created_at = datetime(2024, 1, 1) + timedelta(seconds=i)
+    db.commit()
+
+    pages, cursor = [], None
+    for _ in range(len(marks)):
+        response = search(api, query="", limit=2, **({"cursor": cursor} if cursor else {}))
+        pages.append([result["id"] for result in response.json()["results"]])
+        cursor = response.headers.get("X-Next-Cursor")
+        if cursor is None:
+            break
+
+    assert "next_cursor" not in response.json()
+    assert [id for page in pages for id in page] == list(reversed(list(marks.values())))
+
+
+def test_invalid_cursor_is_a_400(api):
+    assert api.get("/api/v1/search/local", params={"query": "nike", "cursor": "bad"}).status_code == 400
@@ -0,0 +1,138 @@
+import importlib
+
+from sqlalchemy import select
+import pydantic
+import pytest
+
+from app import crud, schemas
+from app.models.trademark import TrademarkSearchProjection
+from app.schemas.trademark import NiceClassMatch, TrademarkSearchMode, TrademarkSearchQuery
+from app.services.nice_class_service import nice_class_mask, nice_classes_from_mask
+
+from tests.conftest import OWNER
+
+# The module, which app.crud shadows with its CRUDTrademark instance
+trademark_crud = importlib.import_module("app.crud.trademark")
+
+MARKS = [
+    ("Nike", [9, 42], "GR"),
+    ("Nike-Air", [25], "GR"),
+    ("NIKE AIR MAX", [9, 25, 42], "GR"),
+    ("Nikh", [], "GR"),
+    ("Νίκη", [9], "GR"),
+    ("Nike", [9, 42], "EU"),
+]
+
+
+@pytest.fixture
+def marks(db):
+    return [
+        crud.trademark.create_with_owner(
+            db,
+            obj_in=schemas.TrademarkCreate(name=name, type="word", jurisdiction=jurisdiction, nice_classes=classes),
+            owner_id=OWNER.id,
+        )
+        for name, classes, jurisdiction in MARKS
+    ]
+
+
+def search(db, **query):
+    trademarks, _ = crud.trademark.search_local(db, search_query=TrademarkSearchQuery(**query))
+    return sorted(trademark.id for trademark in trademarks)
+
+
+def expected(marks, query, jurisdiction, nice_classes=None, match=NiceClassMatch.ANY):
+    """Reference: ILIKE on the name and set logic on the classes"""
+    ids = []
+    for trademark in marks:
+        if trademark.jurisdiction != jurisdiction or query.lower() not in trademark.name.lower():
+            continue
+        if nice_classes:
+            classes = set(trademark.nice_classes or [])
+            if match == NiceClassMatch.ALL and not set(nice_classes) <= classes:
+                continue
+            if match == NiceClassMatch.ANY and classes.isdisjoint(nice_classes):
+                continue
+        ids.append(trademark.id)
+    return sorted(ids)
+
+
+def test_nice_class_mask():
+    assert nice_class_mask([1, 45]) == 1 | 1 << 44
+    assert nice_class_mask([9, 9, "42"]) == 1 << 8 | 1 << 41
+    assert nice_class_mask(None) == 0
+    assert nice_classes_from_mask(nice_class_mask([42, 9, 1])) == [1, 9, 42]
+
+
+@pytest.mark.parametrize("query", ["nike", "nike air", "air", "NIKE-", "", "max"])
+@pytest.mark.parametrize("mode", [TrademarkSearchMode.SUBSTRING, TrademarkSearchMode.PHONETIC])
+def test_projection_matches_the_trademark_table(db, marks, monkeypatch, query, mode):
+    on_projection = search(db, query=query, jurisdiction="GR", mode=mode)
+    monkeypatch.setattr(trademark_crud, "_projection_applies", lambda search_query: False)
+    assert on_projection == search(db, query=query, jurisdiction="GR", mode=mode)
+
+
+def test_substring_keeps_punctuation_and_spacing(db, marks):
+    # "Nike-Air" is not a match for "nike air", with or without a jurisdiction
+    assert search(db, query="nike air", jurisdiction="GR") == [marks[2].id]
+
+
+@pytest.mark.parametrize("nice_classes", [[9], [25, 42], [9, 42], [1]])
+@pytest.mark.parametrize("match", [NiceClassMatch.ANY, NiceClassMatch.ALL])
+def test_projection_class_filter(db, marks, nice_classes, match):
+    assert search(db, query="", jurisdiction="GR", nice_classes=nice_classes, nice_class_match=match) == (
+        expected(marks, "", "GR", nice_classes, match)
+    )
+    assert search(db, query="nike", jurisdiction="GR", nice_classes=nice_classes, nice_class_match=match) == (
+        expected(marks, "nike", "GR", nice_classes, match)
+    )
+
+
+@pytest.mark.parametrize("nice_classes", [[0], [46], [9, 99], [-1]])
+def test_out_of_range_classes_are_rejected(nice_classes):
+    with pytest.raises(pydantic.ValidationError):
+        TrademarkSearchQuery(query="nike", jurisdiction="GR", nice_classes=nice_classes)
+
+
+def test_out_of_range_classes_are_a_422(api):
+    response = api.get("/api/v1/search/local", params={"query": "nike", "jurisdiction": "GR", "nice_classes": [9, 99]})
+
+    assert response.status_code == 422
+
+
+def projection_row(db, id):
+    db.expire_all()
+    return db.execute(select(TrademarkSearchProjection).filter_by(id=id)).scalar_one_or_none()
+
+
+def test_projection_follows_updates(db, marks):
+    assert projection_row(db, marks[0].id).nice_class_mask == nice_class_mask([9, 42])
+
+    # Loaded as the endpoints do: update() only copies the fields of a loaded row
+    trademark = crud.trademark.get(db, id=marks[0].id)
+
+    crud.trademark.update(db, db_obj=trademark, obj_in={"name": "Adidas", "nice_classes": [25], "jurisdiction": "EU"})
+
+    row = projection_row(db, trademark.id)
+    assert (row.nice_class_mask, row.jurisdiction) == (nice_class_mask([25]), "EU")
+    assert row.phonetic_key == trademark.phonetic_key
+    assert trademark.id not in search(db, query="", jurisdiction="GR")
+    assert trademark.id in search(db, query="adidas", jurisdiction="EU", nice_classes=[25])
+
+
+def test_projection_follows_deletes(db, marks):
+    crud.trademark.remove(db, id=marks[0].id)
+
+    assert projection_row(db, marks[0].id) is None
+    assert marks[0].id not in search(db, query="nike", jurisdiction="GR")
+
+
+def test_projection_follows_imports(db, marks):
+    crud.trademark.import_batch(
+        db,
+        objs_in=[schemas.TrademarkImport(name="Nike Pro", type="word", jurisdiction="GR", nice_classes=[35], application_number="A1")],
+        owner_id=OWNER.id,
+    )
+
+    [id] = search(db, query="nike pro", jurisdiction="GR", nice_classes=[35])
+    assert projection_row(db, id).nice_class_mask == nice_class_mask([35])
@@ -0,0 +1,101 @@
+from collections import Counter
+import math
+import random
+
+import pytest
+
+from app.schemas.trademark import TrademarkSearchResult
+from app.services.similarity_service import (
+    _SOUND_TABLE, rank_results, score_candidates, score_components, score_results
+)
+
+
+def levenshtein(a, b):
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (char_a != char_b)))
+        previous = current
+    return previous[-1]
+
+
+def edit_similarity(a, b):
+    longest = max(len(a), len(b))
+    return 1.0 - levenshtein(a, b) / longest if longest else 1.0
+
+
+def trigram_cosine(a, b):
+    def trigrams(name):
+        padded = f"  {name} "
+        return Counter(padded[i:i + 3] for i in range(len(padded) - 2)) if name else Counter()
+
+    grams_a, grams_b = trigrams(a), trigrams(b)
+    norm = math.sqrt(sum(n * n for n in grams_a.values()) * sum(n * n for n in grams_b.values()))
+    return sum(grams_a[gram] * grams_b[gram] for gram in grams_a) / norm if norm else 0.0
+
+
+def sound_skeleton(name):
+    classes = [int(_SOUND_TABLE[ord(char)]) if ord(char) < _SOUND_TABLE.size else 0 for char in name]
+    classes = [sound_class for sound_class in classes if sound_class]
+    return [sound_class for i, sound_class in enumerate(classes) if i == 0 or sound_class != classes[i - 1]]
+
+
+def reference(query, candidate):
+    query, candidate = query.lower().strip(), candidate.lower().strip()
+    return {
+        "edit": edit_similarity(query, candidate),
+        "ngram": trigram_cosine(query, candidate),
+        "phonetic": edit_similarity(sound_skeleton(query), sound_skeleton(candidate)),
+    }
+
+
+NAMES = ["Nike", "NIKE AIR", "Nikh", "Νίκη", "ΝΙΚΗ", "Kwik", "Quick", "3M", "M", "", "aaa", "Nike-Air Max 90", "  adidas  "]
+
+
+def random_names(count, seed=7):
+    alphabet = "nikeaqwmx3 -ΝΙΚΗκη"
+    generator = random.Random(seed)
+    return ["".join(generator.choice(alphabet) for _ in range(generator.randint(0, 12))) for _ in range(count)]
+
+
+@pytest.mark.parametrize("query", NAMES + random_names(5, seed=1))
+def test_components_match_the_scalar_reference(query):
+    candidates = NAMES + random_names(40)
+
+    components = score_components(query, candidates)
+
+    for i, candidate in enumerate(candidates):
+        expected = reference(query, candidate)
+        for name, value in expected.items():
+            assert components[name][i] == pytest.approx(value), (name, query, candidate)
+
+
+def test_sound_alike_names_share_a_skeleton():
+    assert sound_skeleton("kwik") == sound_skeleton("quick") == [2]
+    assert score_components("ΝΙΚΗ", ["NIKI"])["phonetic"][0] == 1.0
+    assert score_components("3M", ["M"])["phonetic"][0] < 1.0
+
+
+def test_combined_score_is_the_weighted_mean():
+    scores = score_candidates("nike", ["nikh", "adidas"], weights={"edit": 1.0, "ngram": 1.0, "phonetic": 0.0})
+
+    for score, candidate in zip(scores, ["nikh", "adidas"]):
+        expected = reference("nike", candidate)
+        assert score == pytest.approx((expected["edit"] + expected["ngram"]) / 2)
+
+
+def result(name):
+    return TrademarkSearchResult(name=name, type="word", status="registered", jurisdiction="EU", source="Local")
+
+
+def test_score_results_keeps_the_order_and_rank_results_sorts():
+    results = [result("adidas"), result("nike"), result("nikh")]
+
+    scored = score_results("nike", results)
+    ranked = rank_results("nike", results)
+
+    assert [item.name for item in scored] == ["adidas", "nike", "nikh"]
+    assert [item.name for item in ranked] == ["nike", "nikh", "adidas"]
+    assert {item.name: item.similarity_score for item in scored} == {item.name: item.similarity_score for item in ranked}
+    assert scored[1].similarity_score == 1.0
@@ -0,0 +1,98 @@
+import asyncio
+
+import httpx
+import pytest
+
+from app.core.cache import search_cache
+from app.core.singleflight import SingleFlight
+from app.services.euipo_service import search_euipo
+
+CALLERS = 20
+
+
+async def wait_for_requests(mock_office, count=1):
+    while len(mock_office.requests) < count:
+        await asyncio.sleep(0.001)
+
+
+async def test_concurrent_identical_searches_share_one_request(mock_office):
+    mock_office.delay = 0.05
+
+    results = await asyncio.gather(*(search_euipo("nike", [9, 42]) for _ in range(CALLERS)))
+
+    assert len(mock_office.requests) == 1
+    assert all(result == results[0] for result in results)
+    assert search_cache.stats()["sources"]["euipo"]["coalesced"] == CALLERS - 1
+
+
+async def test_equivalent_queries_are_coalesced(mock_office):
+    mock_office.delay = 0.05
+
+    await asyncio.gather(
+        search_euipo("Nike", [42, 9]), search_euipo(" nike ", [9, 42]), search_euipo("NIKE", [9, 42])
+    )
+
+    assert len(mock_office.requests) == 1
+
+
+async def test_different_searches_are_not_coalesced(mock_office):
+    mock_office.delay = 0.05
+
+    await asyncio.gather(search_euipo("nike"), search_euipo("adidas"), search_euipo("nike", [25]))
+
+    assert len(mock_office.requests) == 3
+
+
+async def test_leader_failure_reaches_every_caller_and_is_not_cached(mock_office):
+    mock_office.delay = 0.05
+    mock_office.handler = lambda request: httpx.Response(502)
+
+    results = await asyncio.gather(
+        *(search_euipo("nike") for _ in range(CALLERS)), return_exceptions=True
+    )
+
+    assert len(mock_office.requests) == 1
+    assert all(isinstance(result, httpx.HTTPStatusError) for result in results)
+
+    mock_office.handler = lambda request: httpx.Response(200, json={"total_results": 0, "results": []})
+    assert await search_euipo("nike") == {"total_results": 0, "results": []}
+    assert len(mock_office.requests) == 2
+
+
+async def test_cancelled_leader_does_not_cancel_the_others(mock_office):
+    mock_office.delay = 0.05
+
+    leader = asyncio.ensure_future(search_euipo("nike"))
+    await wait_for_requests(mock_office)
+    followers = [asyncio.ensure_future(search_euipo("nike")) for _ in range(CALLERS - 1)]
+    await asyncio.sleep(0)
+    leader.cancel()
+
+    results = await asyncio.gather(*followers)
+
+    assert leader.cancelled()
+    assert len(mock_office.requests) == 1
+    assert all(result == {"total_results": 0, "results": []} for result in results)
+
+
+async def test_cancelled_call_releases_the_key():
+    flights = SingleFlight()
+    release = asyncio.Event()
+
+    async def cancelled():
+        await release.wait()
+        raise asyncio.CancelledError
+
+    callers = [asyncio.ensure_future(flights.do("k", cancelled)) for _ in range(3)]
+    await asyncio.sleep(0)
+    assert flights.in_flight("k")
+    release.set()
+
+    results = await asyncio.gather(*callers, return_exceptions=True)
+    assert all(isinstance(result, asyncio.CancelledError) for result in results)
+    assert not flights.in_flight("k")
+
+    async def answer():
+        return 42
+
+    assert await flights.do("k", answer) == 42
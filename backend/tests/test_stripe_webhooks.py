@@ -0,0 +1,68 @@
+import pytest
+
+from app import crud, models, schemas
+from app.models.payment import PaymentStatus
+from app.schemas.payment import PaymentWebhookEvent
+
+from tests.conftest import OWNER
+
+
+@pytest.fixture
+def payment(db):
+    trademark = crud.trademark.create_with_owner(
+        db, obj_in=schemas.TrademarkCreate(name="Nike", type="word", jurisdiction="GR"), owner_id=OWNER.id
+    )
+    return crud.payment.create(
+        db,
+        obj_in=schemas.PaymentCreate(
+            user_id=OWNER.id,
+            trademark_id=trademark.id,
+            amount=10.0,
+            type="registration_fee",
+            stripe_payment_intent_id="pi_1",
+        ),
+    )
+
+
+def event(id, type, created):
+    return PaymentWebhookEvent(id=id, type=type, created=created, payment_intent_id="pi_1")
+
+
+def status(db, payment):
+    db.expire_all()
+    return db.get(models.Payment, payment.id).status
+
+
+def test_newest_event_of_a_batch_wins(db, payment):
+    counts = crud.payment.apply_webhook_events(db, events=[
+        event("evt_2", "charge.refunded", 200),
+        event("evt_1", "payment_intent.succeeded", 100),
+    ])
+
+    assert counts == {"new": 2, "duplicates": 0, "stale": 0, "updated": 1}
+    assert status(db, payment) == PaymentStatus.REFUNDED
+
+
+def test_older_event_in_a_later_batch_is_stale(db, payment):
+    crud.payment.apply_webhook_events(db, events=[event("evt_2", "payment_intent.succeeded", 200)])
+
+    counts = crud.payment.apply_webhook_events(db, events=[event("evt_1", "payment_intent.payment_failed", 100)])
+
+    assert counts == {"new": 1, "duplicates": 0, "stale": 1, "updated": 0}
+    assert status(db, payment) == PaymentStatus.COMPLETED
+
+
+def test_newer_event_in_a_later_batch_applies(db, payment):
+    crud.payment.apply_webhook_events(db, events=[event("evt_1", "payment_intent.succeeded", 100)])
+
+    crud.payment.apply_webhook_events(db, events=[event("evt_2", "charge.refunded", 200)])
+
+    assert status(db, payment) == PaymentStatus.REFUNDED
+
+
+def test_redelivered_event_is_a_duplicate(db, payment):
+    crud.payment.apply_webhook_events(db, events=[event("evt_1", "payment_intent.succeeded", 100)])
+
+    counts = crud.payment.apply_webhook_events(db, events=[event("evt_1", "payment_intent.succeeded", 100)])
+
+    assert counts == {"new": 0, "duplicates": 1, "stale": 0, "updated": 0}
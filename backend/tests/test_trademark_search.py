@@ -0,0 +1,37 @@
+import pytest
+
+from app import crud, schemas
+from app.schemas.trademark import NiceClassMatch, TrademarkSearchMode, TrademarkSearchQuery
+
+from tests.conftest import OWNER
+
+
+@pytest.fixture(autouse=True)
+def trademarks(db):
+    """On SQLite, trigram search falls back to the in-process index"""
+    for name, nice_classes in [("Nike", [9, 42]), ("Nikee", [9]), ("Nikes", [25]), ("Nikey", None)]:
+        crud.trademark.create_with_owner(
+            db,
+            obj_in=schemas.TrademarkCreate(name=name, type="word", jurisdiction="GR", nice_classes=nice_classes),
+            owner_id=OWNER.id,
+        )
+
+
+def trigram_search(db, **filters):
+    search_query = TrademarkSearchQuery(
+        query="nike", mode=TrademarkSearchMode.TRIGRAM, similarity_threshold=0.1, **filters
+    )
+    trademarks, _ = crud.trademark.search_local(db, search_query=search_query)
+    return sorted(trademark.name for trademark in trademarks)
+
+
+def test_trigram_fallback_without_classes(db):
+    assert trigram_search(db) == ["Nike", "Nikee", "Nikes", "Nikey"]
+
+
+def test_trigram_fallback_matches_any_class(db):
+    assert trigram_search(db, nice_classes=[42, 25]) == ["Nike", "Nikes"]
+
+
+def test_trigram_fallback_matches_all_classes(db):
+    assert trigram_search(db, nice_classes=[9, 42], nice_class_match=NiceClassMatch.ALL) == ["Nike"]
@@ -0,0 +1,38 @@
+"""Phonetic key on trademark
+
+Revision ID: 003
+Revises: 002
+Create Date: 2026-10-18 10:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '003'
+down_revision = '002'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from app.services.phonetic_service import phonetic_key
+
+    op.add_column('trademark', sa.Column('phonetic_key', sa.String(), nullable=True))
+    op.create_index(op.f('ix_trademark_phonetic_key'), 'trademark', ['phonetic_key'], unique=False)
+
+    # Backfill existing rows with the same encoder the application uses
+    trademark = sa.table('trademark', sa.column('id', sa.String), sa.column('name', sa.String), sa.column('phonetic_key', sa.String))
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(trademark.c.id, trademark.c.name)).fetchall()
+    if rows:
+        connection.execute(
+            trademark.update().where(trademark.c.id == sa.bindparam('_id')),
+            [{'_id': row.id, 'phonetic_key': phonetic_key(row.name)} for row in rows],
+        )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_trademark_phonetic_key'), table_name='trademark')
+    op.drop_column('trademark', 'phonetic_key')
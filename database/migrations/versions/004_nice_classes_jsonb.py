@@ -0,0 +1,46 @@
+"""Nice classes as JSONB with a GIN index
+
+Revision ID: 004
+Revises: 003
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '004'
+down_revision = '003'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.alter_column(
+        'trademark',
+        'nice_classes',
+        type_=postgresql.JSONB(),
+        existing_type=sa.JSON(),
+        postgresql_using='nice_classes::jsonb',
+    )
+    op.create_index(
+        'ix_trademark_nice_classes',
+        'trademark',
+        ['nice_classes'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'nice_classes': 'jsonb_path_ops'},
+    )
+
+
+def downgrade():
+    op.drop_index('ix_trademark_nice_classes', table_name='trademark')
+    op.alter_column(
+        'trademark',
+        'nice_classes',
+        type_=sa.JSON(),
+        existing_type=postgresql.JSONB(),
+        postgresql_using='nice_classes::json',
+    )
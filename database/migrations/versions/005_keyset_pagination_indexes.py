@@ -0,0 +1,35 @@
+"""Keyset pagination indexes
+
+Revision ID: 005
+Revises: 004
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '005'
+down_revision = '004'
+branch_labels = None
+depends_on = None
+
+INDEXES = [
+    ('ix_trademark_created_at_id', 'trademark', ['created_at', 'id']),
+    ('ix_trademark_owner_id_created_at_id', 'trademark', ['owner_id', 'created_at', 'id']),
+    ('ix_trademark_status_created_at_id', 'trademark', ['status', 'created_at', 'id']),
+    ('ix_trademark_jurisdiction_created_at_id', 'trademark', ['jurisdiction', 'created_at', 'id']),
+    ('ix_payment_created_at_id', 'payment', ['created_at', 'id']),
+    ('ix_payment_user_id_created_at_id', 'payment', ['user_id', 'created_at', 'id']),
+    ('ix_user_created_at_id', 'user', ['created_at', 'id']),
+]
+
+
+def upgrade():
+    for name, table, columns in INDEXES:
+        op.create_index(name, table, columns, unique=False)
+
+
+def downgrade():
+    for name, table, _ in reversed(INDEXES):
+        op.drop_index(name, table_name=table)
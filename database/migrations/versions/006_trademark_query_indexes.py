@@ -0,0 +1,34 @@
+"""Partial expiry index and payment trademark index
+
+Revision ID: 006
+Revises: 005
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '006'
+down_revision = '005'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # get_expiring_soon only looks at registered marks with an expiry date
+    op.create_index(
+        'ix_trademark_expiration_date_registered',
+        'trademark',
+        ['expiration_date'],
+        unique=False,
+        postgresql_where=sa.text("status = 'REGISTERED' AND expiration_date IS NOT NULL"),
+    )
+    # Loading the payments of a trademark
+    op.create_index(op.f('ix_payment_trademark_id'), 'payment', ['trademark_id'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_payment_trademark_id'), table_name='payment')
+    op.drop_index('ix_trademark_expiration_date_registered', table_name='trademark')
@@ -0,0 +1,31 @@
+"""Unique application number
+
+Revision ID: 007
+Revises: 006
+Create Date: 2026-10-18 15:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '007'
+down_revision = '006'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Bulk imports upsert on the application number (ON CONFLICT needs a
+    # unique index); fails if duplicate application numbers already exist
+    op.drop_index(op.f('ix_trademark_application_number'), table_name='trademark')
+    op.create_index(
+        op.f('ix_trademark_application_number'), 'trademark', ['application_number'], unique=True
+    )
+
+
+def downgrade():
+    op.drop_index(op.f('ix_trademark_application_number'), table_name='trademark')
+    op.create_index(
+        op.f('ix_trademark_application_number'), 'trademark', ['application_number'], unique=False
+    )
@@ -0,0 +1,113 @@
+"""Nice class mask and search projection
+
+Revision ID: 008
+Revises: 007
+Create Date: 2026-10-18 17:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = '008'
+down_revision = '007'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    from app.services.nice_class_service import nice_class_mask
+    from app.services.search_adapter_service import normalize_name
+
+    op.add_column(
+        'trademark',
+        sa.Column('nice_class_mask', sa.BigInteger(), server_default=sa.text('0'), nullable=False),
+    )
+    op.create_table(
+        'trademark_search_projection',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('normalized_name', sa.String(), nullable=False),
+        sa.Column('phonetic_key', sa.String(), nullable=True),
+        sa.Column('nice_class_mask', sa.BigInteger(), nullable=False),
+        sa.Column('jurisdiction', sa.String(), nullable=False),
+        sa.Column('status', postgresql.ENUM(name='trademarkstatus', create_type=False), nullable=True),
+        sa.Column('type', postgresql.ENUM(name='trademarktype', create_type=False), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['id'], ['trademark.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    op.create_index(
+        op.f('ix_trademark_search_projection_phonetic_key'),
+        'trademark_search_projection',
+        ['phonetic_key'],
+        unique=False,
+    )
+    op.create_index(
+        'ix_trademark_search_projection_jurisdiction_created_at_id',
+        'trademark_search_projection',
+        ['jurisdiction', 'created_at', 'id'],
+        unique=False,
+        postgresql_include=['nice_class_mask'],
+    )
+    op.create_index(
+        'ix_trademark_search_projection_normalized_name_trgm',
+        'trademark_search_projection',
+        ['normalized_name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'normalized_name': 'gin_trgm_ops'},
+    )
+
+    # Backfill the masks and the projection with the same functions the application uses
+    trademark = sa.table(
+        'trademark',
+        sa.column('id', sa.String),
+        sa.column('name', sa.String),
+        sa.column('phonetic_key', sa.String),
+        sa.column('nice_classes', postgresql.JSONB),
+        sa.column('nice_class_mask', sa.BigInteger),
+        sa.column('jurisdiction', sa.String),
+        sa.column('status', sa.String),
+        sa.column('type', sa.String),
+        sa.column('created_at', sa.DateTime(timezone=True)),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.select(trademark)).fetchall()
+    if rows:
+        masks = {row.id: nice_class_mask(row.nice_classes) for row in rows}
+        connection.execute(
+            trademark.update().where(trademark.c.id == sa.bindparam('_id')),
+            [{'_id': id, 'nice_class_mask': mask} for id, mask in masks.items()],
+        )
+        # The enum columns take the stored labels as they are
+        connection.execute(
+            sa.text(
+                'INSERT INTO trademark_search_projection '
+                '(id, normalized_name, phonetic_key, nice_class_mask, jurisdiction, status, type, created_at) '
+                'VALUES (:id, :normalized_name, :phonetic_key, :nice_class_mask, :jurisdiction, '
+                'CAST(:status AS trademarkstatus), CAST(:type AS trademarktype), :created_at)'
+            ),
+            [
+                {
+                    'id': row.id,
+                    'normalized_name': normalize_name(row.name),
+                    'phonetic_key': row.phonetic_key,
+                    'nice_class_mask': masks[row.id],
+                    'jurisdiction': row.jurisdiction,
+                    'status': row.status,
+                    'type': row.type,
+                    'created_at': row.created_at,
+                }
+                for row in rows
+            ],
+        )
+
+
+def downgrade():
+    op.drop_index('ix_trademark_search_projection_normalized_name_trgm', table_name='trademark_search_projection')
+    op.drop_index('ix_trademark_search_projection_jurisdiction_created_at_id', table_name='trademark_search_projection')
+    op.drop_index(op.f('ix_trademark_search_projection_phonetic_key'), table_name='trademark_search_projection')
+    op.drop_table('trademark_search_projection')
+    op.drop_column('trademark', 'nice_class_mask')
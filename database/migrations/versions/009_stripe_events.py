@@ -0,0 +1,33 @@
+"""Stripe webhook events
+
+Revision ID: 009
+Revises: 008
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '009'
+down_revision = '008'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Applied webhook events, so a redelivered event is ignored
+    op.create_table(
+        'stripe_event',
+        sa.Column('id', sa.String(), nullable=False),
+        sa.Column('type', sa.String(), nullable=False),
+        sa.Column('processed_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.PrimaryKeyConstraint('id'),
+    )
+    # Webhook events find their payment through ix_payment_stripe_payment_intent_id,
+    # created by the initial migration
+
+
+def downgrade():
+    op.drop_table('stripe_event')
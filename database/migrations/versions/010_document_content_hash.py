@@ -0,0 +1,84 @@
+"""Document content hash
+
+Revision ID: 010
+Revises: 009
+Create Date: 2026-10-18 19:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '010'
+down_revision = '009'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The initial migration created the document table with other columns
+    # than app.models.document; bring it in line before documents are stored
+    op.alter_column('document', 'original_filename', new_column_name='file_name')
+    op.alter_column('document', 'content_type', new_column_name='file_type', nullable=True)
+    op.alter_column(
+        'document', 'file_size',
+        type_=sa.String(), nullable=True, postgresql_using='file_size::varchar',
+    )
+    op.drop_column('document', 'filename')
+    op.add_column('document', sa.Column('title', sa.String(), nullable=True))
+    op.add_column('document', sa.Column('description', sa.Text(), nullable=True))
+    op.execute('UPDATE document SET title = file_name')
+    op.alter_column('document', 'title', nullable=False)
+
+    op.execute('ALTER TYPE documenttype RENAME TO documenttype_old')
+    op.execute(
+        "CREATE TYPE documenttype AS ENUM "
+        "('APPLICATION', 'CERTIFICATE', 'OFFICE_ACTION', 'RESPONSE', 'RENEWAL', 'ASSIGNMENT', 'OTHER')"
+    )
+    op.execute('ALTER TABLE document ADD COLUMN type documenttype')
+    op.execute(
+        "UPDATE document SET type = CASE WHEN document_type = 'CERTIFICATE' "
+        "THEN 'CERTIFICATE'::documenttype ELSE 'OTHER'::documenttype END"
+    )
+    op.alter_column('document', 'type', nullable=False)
+    op.drop_column('document', 'document_type')
+    op.execute('DROP TYPE documenttype_old')
+
+    # Address of the content in the document store; documents stored before
+    # it keep a NULL hash and are read from their file_path
+    op.add_column('document', sa.Column('content_hash', sa.String(length=64), nullable=True))
+    op.create_index(op.f('ix_document_content_hash'), 'document', ['content_hash'], unique=False)
+
+
+def downgrade():
+    op.drop_index(op.f('ix_document_content_hash'), table_name='document')
+    op.drop_column('document', 'content_hash')
+
+    op.execute('ALTER TYPE documenttype RENAME TO documenttype_new')
+    op.execute(
+        "CREATE TYPE documenttype AS ENUM "
+        "('LOGO', 'POWER_OF_ATTORNEY', 'PRIORITY_DOCUMENT', 'SPECIMEN', 'CERTIFICATE', 'OTHER')"
+    )
+    op.execute('ALTER TABLE document ADD COLUMN document_type documenttype')
+    op.execute(
+        "UPDATE document SET document_type = CASE WHEN type = 'CERTIFICATE' "
+        "THEN 'CERTIFICATE'::documenttype ELSE 'OTHER'::documenttype END"
+    )
+    op.alter_column('document', 'document_type', nullable=False)
+    op.drop_column('document', 'type')
+    op.execute('DROP TYPE documenttype_new')
+
+    op.drop_column('document', 'description')
+    op.drop_column('document', 'title')
+    op.add_column('document', sa.Column('filename', sa.String(), nullable=True))
+    op.execute('UPDATE document SET filename = file_name')
+    op.alter_column('document', 'filename', nullable=False)
+    op.execute("UPDATE document SET file_size = '0' WHERE file_size IS NULL")
+    op.alter_column(
+        'document', 'file_size',
+        type_=sa.Integer(), nullable=False, postgresql_using='file_size::integer',
+    )
+    op.execute("UPDATE document SET file_type = 'application/octet-stream' WHERE file_type IS NULL")
+    op.alter_column('document', 'file_type', new_column_name='content_type', nullable=False)
+    op.alter_column('document', 'file_name', new_column_name='original_filename')
@@ -0,0 +1,25 @@
+"""Image document type
+
+Revision ID: 011
+Revises: 010
+Create Date: 2026-10-18 20:00:00.000000
+
+"""
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = '011'
+down_revision = '010'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Uploaded trademark images are stored as documents of this type
+    op.execute("ALTER TYPE documenttype ADD VALUE IF NOT EXISTS 'IMAGE'")
+
+
+def downgrade():
+    # PostgreSQL cannot drop a value from an enum type; IMAGE stays defined
+    pass
@@ -0,0 +1,25 @@
+"""Creation time of the last applied Stripe event per payment
+
+Revision ID: 012
+Revises: 011
+Create Date: 2026-10-18 21:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '012'
+down_revision = '011'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Webhook events older than the one that set the status are skipped
+    op.add_column('payment', sa.Column('stripe_event_created', sa.Integer(), nullable=True))
+
+
+def downgrade():
+    op.drop_column('payment', 'stripe_event_created')
@@ -0,0 +1,50 @@
+"""Drop the normalized name from the search projection
+
+Revision ID: 013
+Revises: 012
+Create Date: 2026-10-19 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '013'
+down_revision = '012'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Substring search on the projection matches trademark.name with ILIKE,
+    # served by ix_trademark_name_trgm, like every other local search
+    op.drop_index('ix_trademark_search_projection_normalized_name_trgm', table_name='trademark_search_projection')
+    op.drop_column('trademark_search_projection', 'normalized_name')
+
+
+def downgrade():
+    from app.services.search_adapter_service import normalize_name
+
+    op.add_column(
+        'trademark_search_projection',
+        sa.Column('normalized_name', sa.String(), server_default='', nullable=False),
+    )
+    connection = op.get_bind()
+    rows = connection.execute(sa.text(
+        'SELECT p.id, t.name FROM trademark_search_projection p JOIN trademark t ON t.id = p.id'
+    )).fetchall()
+    if rows:
+        connection.execute(
+            sa.text('UPDATE trademark_search_projection SET normalized_name = :normalized_name WHERE id = :id'),
+            [{'id': row.id, 'normalized_name': normalize_name(row.name)} for row in rows],
+        )
+    op.alter_column('trademark_search_projection', 'normalized_name', server_default=None)
+    op.create_index(
+        'ix_trademark_search_projection_normalized_name_trgm',
+        'trademark_search_projection',
+        ['normalized_name'],
+        unique=False,
+        postgresql_using='gin',
+        postgresql_ops={'normalized_name': 'gin_trgm_ops'},
+    )
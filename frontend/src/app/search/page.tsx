@@ -4,11 +4,11 @@ import React, { useState } from 'react';
 import { ProtectedRoute } from '@/components/auth/ProtectedRoute';
 import { SearchForm } from '@/components/search/SearchForm';
 import { SearchResults } from '@/components/search/SearchResults';
-import { TrademarkSearchQuery } from '@/types/trademark';
+import { FederatedSearchResponse, TrademarkSearchQuery } from '@/types/trademark';
 import { trademarkService } from '@/services/trademark';
 
 export default function SearchPage() {
-  const [searchResults, setSearchResults] = useState<any>(null);
+  const [searchResults, setSearchResults] = useState<FederatedSearchResponse | null>(null);
   const [isLoading, setIsLoading] = useState(false);
   const [error, setError] = useState('');
 
@@ -41,38 +41,31 @@ export default function SearchPage() {
         
         {searchResults && (
           <div className="space-y-6">
-            {searchResults.summary && (
-              <div className="bg-blue-50 border border-blue-200 rounded-lg p-4">
-                <h2 className="text-lg font-semibold mb-2">Search Summary</h2>
-                <div className="grid grid-cols-1 md:grid-cols-3 gap-4 text-sm">
-                  <div>
-                    <strong>Local Database:</strong> {searchResults.summary.total_local} results
-                  </div>
-                  <div>
-                    <strong>TMview:</strong> {searchResults.summary.total_tmview} results
-                  </div>
-                  <div>
-                    <strong>Total:</strong> {searchResults.summary.total_combined} results
+            <div className="bg-blue-50 border border-blue-200 rounded-lg p-4">
+              <h2 className="text-lg font-semibold mb-2">Search Summary</h2>
+              <div className="grid grid-cols-1 md:grid-cols-3 gap-4 text-sm">
+                {searchResults.sources.map((source) => (
+                  <div key={source.source}>
+                    <strong>{source.source}:</strong>{' '}
+                    {source.status === 'ok' ? `${source.total_results} results` : source.status}
                   </div>
+                ))}
+                <div>
+                  <strong>Total:</strong> {searchResults.total_results} unique results
                 </div>
               </div>
-            )}
-            
-            {searchResults.local_results && (
-              <SearchResults
-                results={searchResults.local_results.results}
-                title="Local Database Results"
-                source="Local"
-              />
-            )}
+              {searchResults.partial && (
+                <p className="mt-2 text-sm text-yellow-800">
+                  Some databases did not respond in time; results may be incomplete.
+                </p>
+              )}
+            </div>
             
-            {searchResults.tmview_results && (
-              <SearchResults
-                results={searchResults.tmview_results.results}
-                title="TMview Results"
-                source="TMview"
-              />
-            )}
+            <SearchResults
+              results={searchResults.results}
+              title="Search Results"
+              source="Combined"
+            />
           </div>
         )}
       </div>
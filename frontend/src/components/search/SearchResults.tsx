@@ -59,7 +59,9 @@ export const SearchResults: React.FC<SearchResultsProps> = ({ results, title, so
                   <span>•</span>
                   <span>{result.type}</span>
                   <span>•</span>
-                  <span className="text-xs text-gray-500">{source}</span>
+                  <span className="text-xs text-gray-500">
+                    {[result.source || source, ...(result.also_reported_by || [])].join(', ')}
+                  </span>
                 </div>
               </div>
               
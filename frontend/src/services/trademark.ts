@@ -4,7 +4,8 @@ import {
   TrademarkCreate, 
   TrademarkUpdate, 
   TrademarkSearchQuery, 
-  TrademarkSearchResponse 
+  TrademarkSearchResponse,
+  FederatedSearchResponse
 } from '@/types/trademark';
 
 export const trademarkService = {
@@ -66,7 +67,7 @@ export const trademarkService = {
     return response.data;
   },
 
-  async searchCombined(query: TrademarkSearchQuery): Promise<any> {
+  async searchCombined(query: TrademarkSearchQuery): Promise<FederatedSearchResponse> {
     const params = new URLSearchParams({
       query: query.query,
     });
@@ -75,6 +75,7 @@ export interface TrademarkSearchResult {
   registration_date?: string;
   similarity_score?: number;
   source: string;
+  also_reported_by?: string[];
 }
 
 export interface TrademarkSearchResponse {
@@ -85,6 +86,19 @@ export interface TrademarkSearchResponse {
   nice_classes?: number[];
 }
 
+export interface SearchSourceStatus {
+  source: string;
+  status: 'ok' | 'timeout' | 'unavailable' | 'error';
+  elapsed_ms: number;
+  total_results: number;
+  error?: string;
+}
+
+export interface FederatedSearchResponse extends TrademarkSearchResponse {
+  sources: SearchSourceStatus[];
+  partial: boolean;
+}
+
 export interface TrademarkSearchQuery {
   query: string;
   jurisdiction?: string;